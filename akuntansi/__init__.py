@@ -0,0 +1,56 @@
+"""Inti aplikasi akuntansi tanpa Streamlit: penyimpanan, laporan, import dan export.
+
+Bisa dipakai dari batch job atau test tanpa menjalankan script Streamlit:
+
+    from akuntansi import buka_penyimpanan, export_excel_multi
+    buku = buka_penyimpanan("akuntansi.db")
+    ns = buku.agregat.neraca_saldo(2024)
+
+openpyxl baru dimuat saat export_excel_multi dipakai atau file Excel dibaca; pyarrow
+(opsional) saat export/baca Parquet atau Arrow.
+"""
+from importlib import import_module
+
+from .bagan_akun import BAGAN_BAWAAN, TIPE_AKUN, AkunTidakDikenal, BaganAkun, bagan_bawaan
+from .dasar import (KOLOM_TRANSAKSI, akun_kredit_normal, batas_periode, beban_akun, neraca_dari_total,
+                    normalisasi_transaksi, pendapatan_akun, saldo_normal, semua_akun)
+from .format import format_rupiah_angka, format_rupiah_kolom, format_tanggal, format_tanggal_kolom, tabel_tampilan
+from .impor import (UKURAN_POTONGAN_IMPORT, baca_import, bersihkan_import, jenis_file_import, parse_rupiah_kolom,
+                    sheet_valid_excel)
+from .duplikat import IndeksDuplikat
+from .indeks_teks import IndeksKeterangan, urai_kueri
+from .job import JobExport, ManajerExport
+from .jurnal import JurnalTidakSeimbang, TANPA_JURNAL, jurnal_tidak_seimbang, ringkas_jurnal, satukan_tanpa_nomor
+from .laporan import buku_besar, data_grafik, laporan_laba_rugi, neraca_saldo
+from .log_buku import LogBuku, buka_buku_log
+from .penyimpanan import PenyimpananTransaksi, SQLiteStore, TransaksiStore, buka_penyimpanan
+from .rentang import IndeksRentang
+
+# Nama yang modulnya baru diimpor saat pertama dipakai
+_MALAS = {
+    "export_excel_multi": ".export",
+    "UKURAN_POTONGAN_EXPORT": ".export",
+    "export_parquet": ".kolumnar",
+    "export_arrow": ".kolumnar",
+    "baca_kolumnar": ".kolumnar",
+}
+
+def __getattr__(nama):
+    if nama in _MALAS:
+        return getattr(import_module(_MALAS[nama], __name__), nama)
+    raise AttributeError(f"module {__name__!r} has no attribute {nama!r}")
+
+__all__ = [
+    "BAGAN_BAWAAN", "TIPE_AKUN", "AkunTidakDikenal", "BaganAkun", "bagan_bawaan",
+    "KOLOM_TRANSAKSI", "akun_kredit_normal", "batas_periode", "beban_akun", "neraca_dari_total",
+    "normalisasi_transaksi", "pendapatan_akun", "saldo_normal", "semua_akun",
+    "format_rupiah_angka", "format_rupiah_kolom", "format_tanggal", "format_tanggal_kolom", "tabel_tampilan",
+    "UKURAN_POTONGAN_IMPORT", "baca_import", "bersihkan_import", "jenis_file_import", "parse_rupiah_kolom",
+    "sheet_valid_excel",
+    "IndeksDuplikat", "IndeksKeterangan", "urai_kueri", "JobExport", "ManajerExport",
+    "JurnalTidakSeimbang", "TANPA_JURNAL", "jurnal_tidak_seimbang", "ringkas_jurnal", "satukan_tanpa_nomor",
+    "buku_besar", "data_grafik", "laporan_laba_rugi", "neraca_saldo",
+    "LogBuku", "buka_buku_log",
+    "PenyimpananTransaksi", "SQLiteStore", "TransaksiStore", "buka_penyimpanan", "IndeksRentang",
+    "export_excel_multi", "UKURAN_POTONGAN_EXPORT", "export_parquet", "export_arrow", "baca_kolumnar",
+]
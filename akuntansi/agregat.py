@@ -0,0 +1,127 @@
+"""Agregat neraca saldo & laba rugi (diperbarui saat tulis)."""
+import numpy as np
+import pandas as pd
+
+from .instrumentasi import diukur
+from .memo import dimemo
+
+class AgregatTransaksi:
+    """Total debit/kredit per akun dan per (tahun, bulan, akun).
+
+    Setiap tambah/hapus hanya menyentuh sel yang terkena, jadi laporan tidak
+    perlu groupby ulang seluruh buku. Sel disimpan sebagai array per ID akun
+    bagan, sehingga klasifikasi dan roll-up hierarki cukup indexing numpy.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._siap = False
+        self._total = np.zeros((0, 3), dtype=np.int64)   # per ID akun: debit, kredit, jumlah baris
+        self._bulanan = {}       # (tahun, bulan) -> array (ID akun, 3) seperti _total
+
+    def _lebar(self, sel):
+        # Bagan bisa bertambah akun setelah sel dibuat: tambah baris nol
+        kurang = len(self._store.bagan) - len(sel)
+        return np.vstack([sel, np.zeros((kurang, 3), dtype=np.int64)]) if kurang > 0 else sel
+
+    def _muat(self):
+        # Dimuat sekali dari penyimpanan; perubahan sebelum ini sudah ikut terbaca
+        if not self._siap:
+            ringkasan = self._store.ringkasan_bulanan()
+            self._catat(ringkasan["Tahun"].to_numpy(), ringkasan["Bulan"].to_numpy(),
+                        self._store.bagan.id_akun(ringkasan["Akun"]),
+                        np.stack([ringkasan[k].to_numpy(dtype=np.int64) for k in ("Debit", "Kredit", "Jumlah")], axis=1))
+            self._siap = True
+
+    def _catat(self, tahun, bulan, ids, nilai):
+        self._total = self._lebar(self._total)
+        np.add.at(self._total, ids, nilai)
+        periode = np.asarray(tahun, dtype=np.int64) * 12 + np.asarray(bulan, dtype=np.int64) - 1
+        for p in np.unique(periode):
+            kunci = (int(p) // 12, int(p) % 12 + 1)
+            sel = self._lebar(self._bulanan.get(kunci, np.zeros((0, 3), dtype=np.int64)))
+            pilih = periode == p
+            np.add.at(sel, ids[pilih], nilai[pilih])
+            if sel[:, 2].any():
+                self._bulanan[kunci] = sel
+            else:
+                self._bulanan.pop(kunci, None)
+
+    def _terapkan(self, rows, tanda):
+        if not self._siap:
+            return
+        tanggal = pd.DatetimeIndex(rows["Tanggal"])
+        nilai = np.stack([rows["Debit"].to_numpy(dtype=np.int64), rows["Kredit"].to_numpy(dtype=np.int64),
+                          np.ones(len(rows), dtype=np.int64)], axis=1) * tanda
+        self._catat(tanggal.year, tanggal.month, self._store.bagan.id_akun(rows["Akun"]), nilai)
+
+    def saat_tambah(self, baru):
+        self._terapkan(baru, 1)
+
+    def saat_hapus(self, lama):
+        self._terapkan(lama, -1)
+
+    def _sel(self, tahun=None, bulan=None, mulai=None, akhir=None):
+        # Semua periode dibaca dari total per akun; satu periode dari jumlah sel bulanan;
+        # rentang tanggal bebas dari kumulatif IndeksRentang
+        if mulai is not None or akhir is not None:
+            return self._lebar(self._store.rentang.total(mulai, akhir))
+        self._muat()
+        if tahun is None:
+            return self._lebar(self._total).copy()
+        hasil = self._lebar(np.zeros((0, 3), dtype=np.int64))
+        for (th, bl), sel in self._bulanan.items():
+            if th == tahun and (bulan is None or bl == bulan):
+                hasil[:len(sel)] += sel
+        return hasil
+
+    @dimemo
+    @diukur("agregat.neraca_saldo")
+    def neraca_saldo(self, tahun=None, bulan=None, gulung=False, mulai=None, akhir=None):
+        """Neraca saldo per akun; gulung=True ikut menampilkan akun induk (roll-up hierarki).
+
+        mulai/akhir: hanya transaksi mulai <= Tanggal < akhir; saldo per tanggal X cukup akhir=X+1 hari.
+        """
+        with self._store.kunci:
+            sel = self._sel(tahun, bulan, mulai, akhir)
+        return self._store.bagan.neraca(sel, gulung)
+
+    @dimemo
+    @diukur("agregat.laba_rugi")
+    def laporan_laba_rugi(self, tahun=None, bulan=None, mulai=None, akhir=None):
+        with self._store.kunci:
+            sel = self._sel(tahun, bulan, mulai, akhir)
+        bagan = self._store.bagan
+        # Sisi normal: pendapatan bertambah di Kredit, beban di Debit
+        bersih = sel[:, 1] - sel[:, 0]
+        total_pendapatan = int(bersih[bagan.tipe_akun("pendapatan")[:len(sel)]].sum())
+        total_beban = -int(bersih[bagan.tipe_akun("beban")[:len(sel)]].sum())
+        return {
+            "Total Pendapatan": total_pendapatan,
+            "Total Beban": total_beban,
+            "Laba/Rugi": total_pendapatan - total_beban
+        }
+
+    @dimemo
+    def total(self):
+        with self._store.kunci:
+            self._muat()
+            total = self._total[:, :2].sum(axis=0)
+        return int(total[0]), int(total[1])
+
+    @dimemo
+    def bulanan(self):
+        # Satu baris per (tahun, bulan, akun); ukurannya tidak bergantung jumlah transaksi.
+        # Sel diubah di tempat oleh penulis, jadi disalin di bawah kunci lalu diolah di luarnya
+        with self._store.kunci:
+            self._muat()
+            potret = [(th, bl, sel.copy()) for (th, bl), sel in self._bulanan.items()]
+        nama = self._store.bagan.nama
+        bagian = []
+        for th, bl, sel in potret:
+            ids = np.flatnonzero(sel[:, 2])
+            bagian.append(pd.DataFrame({"Tahun": th, "Bulan": bl, "Akun": nama[ids], "Debit": sel[ids, 0],
+                                        "Kredit": sel[ids, 1], "Jumlah": sel[ids, 2]}))
+        if not bagian:
+            return pd.DataFrame(columns=["Tahun", "Bulan", "Akun", "Debit", "Kredit", "Jumlah"])
+        return pd.concat(bagian, ignore_index=True).sort_values(["Tahun", "Bulan", "Akun"], ignore_index=True)
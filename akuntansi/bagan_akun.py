@@ -0,0 +1,275 @@
+"""Bagan akun: registri akun dengan kode angka, tipe dan hierarki induk/anak.
+
+Transaksi menyimpan ID akun (urutan daftar di bagan), bukan nama. Tipe, sisi
+normal dan induk tersedia sebagai array per ID, jadi klasifikasi laporan dan
+roll-up hierarki cukup indexing numpy tanpa membandingkan string.
+"""
+import numpy as np
+import pandas as pd
+
+TIPE_AKUN = ["aset", "kewajiban", "modal", "pendapatan", "beban"]
+TIPE_KREDIT_NORMAL = ["kewajiban", "modal", "pendapatan"]
+TANPA_INDUK = -1
+# Akun yang belum ada di bagan didaftarkan sebagai aset tanpa induk dengan kode 9001,
+# 9002, ... hanya bila diminta (daftarkan=True: bagan salinan laporan, database lama)
+KODE_TAK_TERDAFTAR = 9000
+
+# (kode, nama, tipe, kode induk); akun tanpa anak adalah akun posting
+BAGAN_BAWAAN = [
+    (1000, "Aset", "aset", None),
+    (1100, "Aset Lancar", "aset", 1000),
+    (1101, "Kas", "aset", 1100),
+    (1102, "Piutang", "aset", 1100),
+    (3000, "Ekuitas", "modal", None),
+    (3101, "Modal", "modal", 3000),
+    (4000, "Pendapatan", "pendapatan", None),
+    (4101, "Pendapatan Jasa", "pendapatan", 4000),
+    (4102, "Pendapatan Lainnya", "pendapatan", 4000),
+    (5000, "Beban", "beban", None),
+    (5100, "Beban Operasional", "beban", 5000),
+    (5101, "Beban Gaji", "beban", 5100),
+    (5102, "Beban Listrik", "beban", 5100),
+    (5103, "Beban Sewa", "beban", 5100),
+    (5104, "Beban Lainnya", "beban", 5100),
+]
+
+class AkunTidakDikenal(ValueError):
+    """Nama akun yang tidak ada di bagan; daftar nama di .akun."""
+
+    def __init__(self, akun):
+        self.akun = list(akun)
+        contoh = ", ".join(map(repr, self.akun[:5])) + (", ..." if len(self.akun) > 5 else "")
+        super().__init__(f"{len(self.akun)} akun tidak ada di bagan: {contoh}; daftarkan akunnya dulu")
+
+class BaganAkun:
+    """Daftar akun; ID akun = posisi di daftar dan tidak pernah berubah.
+
+    Induk selalu didaftarkan sebelum anaknya, jadi ID induk < ID anak. Array
+    turunan (kode, tipe, induk, level, tingkat roll-up) dihitung ulang hanya
+    setelah ada akun baru. Daftar hanya bertambah, jadi array turunan boleh
+    dibaca tanpa kunci sementara penulis menambah akun.
+    """
+
+    def __init__(self, baris=()):
+        self._kode = []
+        self._nama = []
+        self._tipe = []
+        self._induk = []
+        self._id_nama = {}
+        self._id_kode = {}
+        self._array = None
+        for kode, nama, tipe, induk in baris:
+            self.tambah(kode, nama, tipe, induk)
+
+    @classmethod
+    def dari_frame(cls, df):
+        """Bagan dari tabel berkolom Kode, Nama, Tipe dan (opsional) Induk = kode induk."""
+        induk = df["Induk"] if "Induk" in df.columns else pd.Series([None] * len(df), index=df.index)
+        sisa = [(int(k), str(n).strip(), str(t).strip().lower(), None if pd.isna(i) else int(i))
+                for k, n, t, i in zip(df["Kode"], df["Nama"], df["Tipe"], induk)]
+        bagan = cls()
+        # Baris boleh tidak urut: daftarkan yang induknya sudah ada sampai habis
+        while sisa:
+            tunda = [b for b in sisa if b[3] is not None and b[3] not in bagan._id_kode]
+            if len(tunda) == len(sisa):
+                raise ValueError(f"Kode induk tidak ditemukan atau melingkar: {sorted({b[3] for b in tunda})}")
+            for b in sisa:
+                if b[3] is None or b[3] in bagan._id_kode:
+                    bagan.tambah(*b)
+            sisa = tunda
+        return bagan
+
+    @classmethod
+    def dari_csv(cls, path):
+        return cls.dari_frame(pd.read_csv(path, dtype={"Nama": object, "Tipe": object}))
+
+    def __len__(self):
+        return len(self._induk)
+
+    def __contains__(self, nama):
+        return nama in self._id_nama
+
+    def salin(self):
+        return BaganAkun((kode, nama, tipe, induk) for _, kode, nama, tipe, induk in self.baris())
+
+    def kode_berikut(self):
+        """Kode bebas untuk akun yang belum terdaftar: 9001, 9002, ..."""
+        return max([KODE_TAK_TERDAFTAR, *self._kode]) + 1
+
+    def tidak_dikenal(self, akun):
+        """Nama akun unik (urut kemunculan) yang belum ada di bagan."""
+        return [a for a in pd.unique(np.asarray(akun, dtype=object)) if a not in self._id_nama]
+
+    def tambah(self, kode, nama, tipe, induk=None):
+        """Daftarkan akun baru; induk = kode akun induk (tipe harus sama). Hasil: ID akun."""
+        kode, nama = int(kode), str(nama)
+        if tipe not in TIPE_AKUN:
+            raise ValueError(f"Tipe akun {tipe!r} tidak dikenal; pilih salah satu dari {', '.join(TIPE_AKUN)}")
+        if nama in self._id_nama:
+            raise ValueError(f"Akun {nama!r} sudah ada di bagan")
+        if kode in self._id_kode:
+            raise ValueError(f"Kode akun {kode} sudah dipakai {self._nama[self._id_kode[kode]]!r}")
+        id_induk = TANPA_INDUK
+        if induk is not None:
+            id_induk = self._id_kode.get(int(induk))
+            if id_induk is None:
+                raise ValueError(f"Kode induk {induk} belum ada di bagan")
+            if self._tipe[id_induk] != tipe:
+                raise ValueError(f"Akun {nama!r} ({tipe}) tidak bisa di bawah {self._nama[id_induk]!r} "
+                                 f"({self._tipe[id_induk]})")
+        id_akun = len(self._nama)
+        self._kode.append(kode)
+        self._nama.append(nama)
+        self._tipe.append(tipe)
+        self._induk.append(id_induk)   # terakhir: panjang _induk = jumlah akun yang sudah lengkap
+        self._id_nama[nama] = id_akun
+        self._id_kode[kode] = id_akun
+        return id_akun
+
+    def id_dari_nama(self, nama, daftarkan=False):
+        """ID satu akun; -1 bila belum ada (daftarkan=True: didaftarkan sebagai aset)."""
+        id_akun = self._id_nama.get(nama)
+        if id_akun is None:
+            if not daftarkan:
+                return TANPA_INDUK
+            id_akun = self.tambah(self.kode_berikut(), nama, "aset")
+        return id_akun
+
+    def id_akun(self, akun, daftarkan=False):
+        """ID untuk array nama akun: satu lookup per nama unik, sisanya indexing.
+
+        Nama yang belum ada ditolak dengan AkunTidakDikenal, kecuali daftarkan=True.
+        """
+        akun = pd.Series(akun, copy=False) if not isinstance(akun, pd.Series) else akun
+        if isinstance(akun.dtype, pd.CategoricalDtype):
+            kode, unik = akun.cat.codes.to_numpy(), akun.cat.categories
+        else:
+            kode, unik = pd.factorize(akun.to_numpy(dtype=object))
+        peta = np.array([self.id_dari_nama(a, daftarkan) for a in unik], dtype=np.int32)
+        if (peta == TANPA_INDUK).any():
+            raise AkunTidakDikenal(np.asarray(unik, dtype=object)[peta == TANPA_INDUK])
+        return peta[kode] if len(peta) else np.zeros(len(akun), dtype=np.int32)
+
+    def _turunan(self):
+        # Cache berlaku untuk jumlah akun saat dihitung, bukan dibuang oleh tambah(): pembaca
+        # lain yang sedang menghitung tidak bisa menimpa cache dengan array yang kurang akun
+        n = len(self._induk)
+        array = self._array
+        if array is None or array["n"] != n:
+            induk = np.array(self._induk[:n], dtype=np.int64)
+            level = np.zeros(n, dtype=np.int64)
+            for i in range(n):
+                if induk[i] != TANPA_INDUK:
+                    level[i] = level[induk[i]] + 1
+            tipe = np.array([TIPE_AKUN.index(t) for t in self._tipe[:n]], dtype=np.int8)
+            punya_anak = np.zeros(n, dtype=bool)
+            punya_anak[induk[induk != TANPA_INDUK]] = True
+            # Roll-up per tingkat, dari yang terdalam: anak -> induk langsung
+            tingkat = [(np.flatnonzero(level == d), induk[level == d]) for d in range(int(level.max(initial=0)), 0, -1)]
+            array = {
+                "n": n,
+                "kode": np.array(self._kode[:n], dtype=np.int64),
+                "nama": np.array(self._nama[:n], dtype=object),
+                "tipe": tipe,
+                "induk": induk,
+                "level": level,
+                "posting": ~punya_anak,
+                "kredit_normal": np.isin(tipe, [TIPE_AKUN.index(t) for t in TIPE_KREDIT_NORMAL]),
+                "tingkat": tingkat,
+            }
+            self._array = array
+        return array
+
+    @property
+    def kode(self):
+        return self._turunan()["kode"]
+
+    @property
+    def nama(self):
+        return self._turunan()["nama"]
+
+    @property
+    def tipe(self):
+        """Kode tipe per ID (indeks ke TIPE_AKUN)."""
+        return self._turunan()["tipe"]
+
+    @property
+    def kredit_normal(self):
+        return self._turunan()["kredit_normal"]
+
+    def tipe_akun(self, tipe):
+        """Mask per ID: akun bertipe `tipe`."""
+        return self.tipe == TIPE_AKUN.index(tipe)
+
+    def akun_posting(self, tipe=None):
+        """Nama akun tanpa anak (yang dipakai transaksi), urut kode."""
+        pilih = self._turunan()["posting"] & (self.tipe_akun(tipe) if tipe else True)
+        ids = np.flatnonzero(pilih)
+        return self.nama[ids[np.argsort(self.kode[ids], kind="stable")]].tolist()
+
+    def total_per_akun(self, ids, *kolom):
+        """Jumlah tiap kolom per ID akun: array (len(bagan), len(kolom))."""
+        # Kolom None = hitung baris. np.add.at (bukan bincount) supaya int64 tetap eksak
+        ids = np.asarray(ids, dtype=np.int64)
+        hasil = np.zeros((len(self), len(kolom)), dtype=np.int64)
+        for j, k in enumerate(kolom):
+            np.add.at(hasil[:, j], ids, 1 if k is None else np.asarray(k, dtype=np.int64))
+        return hasil
+
+    def gulung(self, nilai):
+        """Nilai per ID ditambah nilai semua keturunannya (baris = ID akun)."""
+        hasil = np.array(nilai, dtype=np.int64)
+        for anak, induk in self._turunan()["tingkat"]:
+            np.add.at(hasil, induk, hasil[anak])
+        return hasil
+
+    def neraca(self, total, gulung=False):
+        """Neraca saldo dari total (debit, kredit, jumlah baris) per ID, urut kode.
+
+        Akun tanpa transaksi tidak ditampilkan. gulung=True ikut menampilkan akun
+        induk dengan total seluruh keturunannya, plus kolom Level.
+        """
+        total = np.asarray(total, dtype=np.int64)
+        if len(total) < len(self):
+            total = np.vstack([total, np.zeros((len(self) - len(total), total.shape[1]), dtype=np.int64)])
+        if gulung:
+            total = self.gulung(total)
+        ids = np.flatnonzero(total[:, 2] != 0)
+        ids = ids[np.argsort(self.kode[ids], kind="stable")]
+        debit, kredit = total[ids, 0], total[ids, 1]
+        kredit_normal = self.kredit_normal[ids]
+        hasil = pd.DataFrame({
+            "Kode": self.kode[ids],
+            "Debit": debit,
+            "Kredit": kredit,
+            "Saldo": np.where(kredit_normal, kredit - debit, debit - kredit),
+            "Normal": np.where(kredit_normal, "K", "D").astype(object),
+        }, index=pd.Index(self.nama[ids], name="Akun"))
+        if gulung:
+            hasil.insert(1, "Level", self._turunan()["level"][ids])
+        return hasil
+
+    def baris(self, sejak=0):
+        """(id, kode, nama, tipe, kode induk) mulai ID `sejak`, untuk disimpan."""
+        return [(i, self._kode[i], self._nama[i], self._tipe[i],
+                 None if self._induk[i] == TANPA_INDUK else self._kode[self._induk[i]])
+                for i in range(sejak, len(self))]
+
+    def frame(self):
+        """Tabel bagan urut kode: Kode, Akun, Tipe, Induk, Level, Posting."""
+        data = self._turunan()
+        induk = data["induk"]
+        urutan = np.argsort(data["kode"], kind="stable")
+        kode_induk = pd.Series(data["kode"][np.maximum(induk, 0)] if len(self) else [], dtype="Int64")
+        return pd.DataFrame({
+            "Kode": data["kode"],
+            "Akun": data["nama"],
+            "Tipe": np.array(TIPE_AKUN, dtype=object)[data["tipe"]],
+            "Induk": kode_induk.mask(induk == TANPA_INDUK),
+            "Level": data["level"],
+            "Posting": data["posting"],
+        }).iloc[urutan].reset_index(drop=True)
+
+def bagan_bawaan():
+    """Salinan baru bagan bawaan aplikasi (boleh ditambah akun tanpa mengubah yang lain)."""
+    return BaganAkun(BAGAN_BAWAAN)
@@ -0,0 +1,195 @@
+"""Laporan batch dari baris perintah: satu workbook per entitas/periode.
+
+Contoh:
+    python -m akuntansi kantor_a.db kantor_b.xlsx --periode 2024-01 --keluar laporan/
+    python -m akuntansi data/*.db --periode 2024 --periode 2024-12 --pekerja 4
+    python -m akuntansi kantor_a.db --periode semua --format parquet
+
+Entitas = nama file buku tanpa ekstensi. Buku bisa berupa database SQLite aplikasi
+(.db) atau file transaksi Excel/CSV/Parquet/Arrow. Tanpa --periode dibuat laporan bulan lalu.
+--format parquet/arrow menulis data transaksi per periode (kolom sheet "Data Import")
+sebagai pengganti workbook.
+File transaksi dari versi sebelum jurnal (tanpa kolom Jurnal) dibaca dengan --baris-lama.
+Akun di file transaksi harus ada di bagan (bagan bawaan atau --bagan); akun lain ditolak.
+Kode keluar 1 bila ada buku yang gagal dibaca, gagal validasi tutup buku, atau gagal export.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pytz
+
+from .bagan_akun import BaganAkun
+from .dasar import batas_periode
+from .impor import baca_import, jenis_file_import, sheet_valid_excel
+from .penyimpanan import SQLiteStore, TransaksiStore
+
+EKSTENSI_SQLITE = (".db", ".sqlite", ".sqlite3")
+EKSTENSI_FORMAT = {"xlsx": ".xlsx", "parquet": ".parquet", "arrow": ".arrow"}
+
+def periode_argumen(teks):
+    # "semua" -> {}, "2024" -> {"tahun": 2024, "bulan": None}, "2024-01" -> {"tahun": 2024, "bulan": 1}
+    if teks == "semua":
+        return {}
+    try:
+        tahun, _, bulan = teks.partition("-")
+        periode = {"tahun": int(tahun), "bulan": int(bulan) if bulan else None}
+    except ValueError:
+        periode = None
+    if periode is None or not 1 <= (periode["bulan"] or 1) <= 12:
+        raise argparse.ArgumentTypeError(f"periode harus YYYY, YYYY-MM atau 'semua': {teks!r}")
+    return periode
+
+def bulan_lalu():
+    sekarang = datetime.now(pytz.timezone("Asia/Jakarta"))
+    if sekarang.month == 1:
+        return {"tahun": sekarang.year - 1, "bulan": 12}
+    return {"tahun": sekarang.year, "bulan": sekarang.month - 1}
+
+def nama_periode(periode):
+    if not periode:
+        return "semua"
+    if periode["bulan"] is None:
+        return str(periode["tahun"])
+    return f"{periode['tahun']}-{periode['bulan']:02d}"
+
+def buka_buku(path, path_bagan=None, baris_lama=False):
+    """Buka buku satu entitas: database SQLite dipakai langsung, file transaksi dimuat ke memori.
+
+    path_bagan: CSV bagan akun (Kode, Nama, Tipe, Induk); kosong = bagan bawaan.
+    baris_lama: baris file tanpa nomor jurnal dimuat sebagai baris lama (tanpa jurnal).
+    """
+    bagan = BaganAkun.dari_csv(path_bagan) if path_bagan else None
+    if path.lower().endswith(EKSTENSI_SQLITE):
+        # SQLiteStore membuat database baru bila file tidak ada; di sini itu berarti salah ketik
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File tidak ditemukan: {path}")
+        return SQLiteStore(path, bagan=bagan)
+    jenis = jenis_file_import(path)
+    if jenis is None:
+        raise ValueError(f"Jenis file tidak didukung: {path}")
+    sheet, baris_header = None, 1
+    if jenis == "excel":
+        _, valid = sheet_valid_excel(path)
+        if not valid:
+            raise ValueError("Tidak ada sheet dengan kolom transaksi")
+        sheet = "Data Import" if "Data Import" in valid else next(iter(valid))
+        baris_header = valid[sheet]
+    store = TransaksiStore(bagan=bagan)
+    store.tambah_banyak(baca_import(path, jenis, sheet, baris_header), tanpa_jurnal=baris_lama)
+    return store
+
+def proses_entitas(path, daftar_periode, keluar, path_bagan=None, format_keluar="xlsx", baris_lama=False):
+    """Buat semua workbook (atau file Parquet/Arrow) satu entitas; dijalankan di proses pekerja.
+
+    Hasil berupa dict biasa (bisa di-pickle): entitas, detik buka, daftar laporan
+    (periode, baris, detik, file) dan daftar galat validasi.
+    """
+    entitas = os.path.splitext(os.path.basename(path))[0]
+    hasil = {"entitas": entitas, "detik_buka": 0.0, "laporan": [], "galat": []}
+    mulai = time.perf_counter()
+    try:
+        store = buka_buku(path, path_bagan, baris_lama)
+    except Exception as e:
+        hasil["galat"].append(f"gagal membaca {path}: {e}")
+        return hasil
+    hasil["detik_buka"] = time.perf_counter() - mulai
+
+    salah = store.tutup_buku.validasi()
+    salah = salah[~salah["Cocok"]]
+    if len(salah):
+        hasil["galat"].append(f"{len(salah)} saldo tutup buku tidak cocok dengan hitung ulang penuh")
+    tidak_seimbang = store.jurnal_tidak_seimbang()
+    if len(tidak_seimbang):
+        hasil["galat"].append(f"{len(tidak_seimbang)} jurnal tidak seimbang (Debit ≠ Kredit)")
+
+    jumlah_periode = store.periode.daftar()
+    for periode in daftar_periode:
+        jumlah = sum(j for (tahun, bulan), j in jumlah_periode.items()
+                     if not periode or (tahun == periode["tahun"] and periode["bulan"] in (None, bulan)))
+        laporan = {"periode": nama_periode(periode), "baris": jumlah, "detik": 0.0, "file": None}
+        hasil["laporan"].append(laporan)
+        if jumlah == 0:
+            continue
+        rentang = batas_periode(**periode) if periode else (None, None)
+        tujuan = os.path.join(keluar, f"{entitas}_{laporan['periode']}{EKSTENSI_FORMAT[format_keluar]}")
+        mulai = time.perf_counter()
+        try:
+            df = store.periode.ambil(**periode) if periode else store.frame()
+            if format_keluar == "xlsx":
+                from .export import export_excel_multi
+                export_excel_multi(df, bb=store.saldo.buku_besar(*rentang), ns=store.agregat.neraca_saldo(**periode),
+                                   lr=store.agregat.laporan_laba_rugi(**periode), streaming=True, tujuan=tujuan)
+            else:
+                from .kolumnar import export_arrow, export_parquet
+                (export_parquet if format_keluar == "parquet" else export_arrow)(df, tujuan=tujuan)
+        except Exception as e:
+            hasil["galat"].append(f"gagal export {laporan['periode']}: {e}")
+            continue
+        laporan["detik"] = time.perf_counter() - mulai
+        laporan["file"] = tujuan
+    return hasil
+
+def _cetak_hasil(hasil, keluaran):
+    for laporan in hasil["laporan"]:
+        if laporan["file"] is None:
+            status = "dilewati (tidak ada transaksi)" if laporan["baris"] == 0 else "GAGAL"
+            print(f"{hasil['entitas']:>20} {laporan['periode']:>8} {laporan['baris']:>10,}  {status}", file=keluaran)
+        else:
+            laju = laporan["baris"] / laporan["detik"] if laporan["detik"] else 0
+            print(f"{hasil['entitas']:>20} {laporan['periode']:>8} {laporan['baris']:>10,} {laporan['detik']:>8.2f} "
+                  f"{laju:>12,.0f}  {laporan['file']}", file=keluaran)
+    for galat in hasil["galat"]:
+        print(f"{hasil['entitas']:>20} ❌ {galat}", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m akuntansi", description=__doc__.splitlines()[0])
+    parser.add_argument("buku", nargs="+", help="file buku per entitas (.db, .xlsx, .csv, .parquet, .arrow)")
+    parser.add_argument("--periode", type=periode_argumen, action="append",
+                        help="YYYY-MM, YYYY atau 'semua'; boleh diulang (bawaan: bulan lalu)")
+    parser.add_argument("--keluar", default="laporan", help="folder file hasil (bawaan: laporan)")
+    parser.add_argument("--pekerja", type=int, default=os.cpu_count() or 1,
+                        help="jumlah proses paralel (bawaan: jumlah CPU)")
+    parser.add_argument("--format", choices=list(EKSTENSI_FORMAT), default="xlsx", dest="format_keluar",
+                        help="xlsx = workbook laporan (bawaan); parquet/arrow = data transaksi saja")
+    parser.add_argument("--bagan", metavar="FILE.csv",
+                        help="bagan akun (kolom Kode, Nama, Tipe, Induk); bawaan: bagan aplikasi")
+    parser.add_argument("--baris-lama", action="store_true",
+                        help="baris file tanpa nomor jurnal dimuat sebagai baris lama, tanpa pemeriksaan jurnal")
+    args = parser.parse_args(argv)
+
+    daftar_periode = args.periode or [bulan_lalu()]
+    os.makedirs(args.keluar, exist_ok=True)
+    print(f"{'entitas':>20} {'periode':>8} {'baris':>10} {'detik':>8} {'baris/detik':>12}  file")
+    mulai = time.perf_counter()
+    semua = []
+    if args.pekerja <= 1:
+        for path in args.buku:
+            semua.append(proses_entitas(path, daftar_periode, args.keluar, args.bagan, args.format_keluar,
+                                        args.baris_lama))
+            _cetak_hasil(semua[-1], sys.stdout)
+    else:
+        # Satu entitas per job: buku dibuka sekali lalu dipakai untuk semua periodenya
+        with ProcessPoolExecutor(max_workers=min(args.pekerja, len(args.buku))) as pool:
+            future = [pool.submit(proses_entitas, path, daftar_periode, args.keluar, args.bagan, args.format_keluar,
+                                  args.baris_lama)
+                      for path in args.buku]
+            for f in as_completed(future):
+                semua.append(f.result())
+                _cetak_hasil(semua[-1], sys.stdout)
+    durasi = time.perf_counter() - mulai
+
+    laporan = [l for h in semua for l in h["laporan"] if l["file"] is not None]
+    baris = sum(l["baris"] for l in laporan)
+    gagal = [h["entitas"] for h in semua if h["galat"]]
+    jenis_file = "workbook" if args.format_keluar == "xlsx" else f"file {args.format_keluar}"
+    print(f"\n{len(laporan)} {jenis_file}, {baris:,} baris dalam {durasi:.2f} detik "
+          f"({baris / durasi if durasi else 0:,.0f} baris/detik, {len(args.buku)} entitas, "
+          f"{min(max(args.pekerja, 1), len(args.buku))} pekerja)")
+    if gagal:
+        print(f"❌ Validasi gagal: {', '.join(sorted(gagal))}", file=sys.stderr)
+        return 1
+    return 0
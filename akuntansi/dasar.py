@@ -0,0 +1,61 @@
+"""Konstanta dan helper bersama: kolom transaksi, akun bagan bawaan, batas periode."""
+import numpy as np
+import pandas as pd
+
+from .bagan_akun import bagan_bawaan
+
+KOLOM_TRANSAKSI = ["Tanggal", "Akun", "Keterangan", "Debit", "Kredit"]
+
+def normalisasi_transaksi(df, ids, jurnal):
+    # Bentuk baku baris transaksi: index ID, Tanggal datetime64[ns], Debit/Kredit/Jurnal int64
+    return pd.DataFrame({
+        "Tanggal": pd.to_datetime(df["Tanggal"]).to_numpy(dtype="datetime64[ns]"),
+        "Akun": np.asarray(df["Akun"], dtype=object),
+        "Keterangan": np.asarray(df["Keterangan"], dtype=object),
+        "Debit": np.asarray(df["Debit"], dtype=np.int64),
+        "Kredit": np.asarray(df["Kredit"], dtype=np.int64),
+        "Jurnal": np.asarray(jurnal, dtype=np.int64),
+    }, index=pd.Index(ids))
+
+# Nama akun posting bagan bawaan; laporan memakai tipe di bagan, bukan daftar ini
+_BAWAAN = bagan_bawaan()
+pendapatan_akun = _BAWAAN.akun_posting("pendapatan")
+beban_akun = _BAWAAN.akun_posting("beban")
+semua_akun = _BAWAAN.akun_posting()
+akun_kredit_normal = [a for a in semua_akun if _BAWAAN.kredit_normal[_BAWAAN.id_dari_nama(a)]]
+
+def bagan_laporan(akun, bagan=None):
+    """(bagan, ID akun) untuk laporan dari DataFrame.
+
+    Tanpa bagan dipakai salinan bagan bawaan; akun di luar bagan bawaan didaftarkan
+    ke salinan itu sebagai aset. Bagan milik pemanggil tidak pernah diubah.
+    """
+    if bagan is None:
+        bagan = bagan_bawaan()
+        return bagan, bagan.id_akun(akun, daftarkan=True)
+    return bagan, bagan.id_akun(akun)
+
+def saldo_normal(akun, debit, kredit, bagan=None):
+    """Saldo menurut sisi normal akun: Debit - Kredit, atau Kredit - Debit untuk akun bersaldo normal Kredit.
+
+    Tanpa bagan: akun yang tidak ada di bagan bawaan dianggap bersaldo normal Debit.
+    """
+    bagan, ids = bagan_laporan(akun, bagan)
+    debit = np.asarray(debit, dtype=np.int64)
+    kredit = np.asarray(kredit, dtype=np.int64)
+    return np.where(bagan.kredit_normal[ids], kredit - debit, debit - kredit)
+
+def neraca_dari_total(akun, debit, kredit, bagan=None, gulung=False):
+    """Neraca saldo dari total per nama akun (lihat BaganAkun.neraca)."""
+    bagan, ids = bagan_laporan(akun, bagan)
+    total = bagan.total_per_akun(ids, debit, kredit, None)
+    return bagan.neraca(total, gulung)
+
+def ke_ns(tgl):
+    return pd.Timestamp(tgl).as_unit("ns").value
+
+def batas_periode(tahun, bulan=None):
+    # [awal, akhir) periode satu bulan atau satu tahun penuh
+    awal = pd.Timestamp(year=tahun, month=bulan or 1, day=1)
+    akhir = awal + (pd.DateOffset(months=1) if bulan else pd.DateOffset(years=1))
+    return awal, akhir
@@ -0,0 +1,79 @@
+"""Indeks duplikat untuk import ulang."""
+import numpy as np
+import pandas as pd
+
+from .instrumentasi import diukur
+
+class IndeksDuplikat:
+    """Indeks hash (Tanggal, Akun, Keterangan, Debit, Kredit) -> jumlah baris.
+
+    Tanggal dibulatkan ke detik karena sheet export hanya menyimpan sampai detik,
+    sehingga file hasil export yang diimport ulang tetap dikenali sebagai duplikat.
+    Indeks kedua tanpa Debit/Kredit dipakai untuk mendeteksi konflik nominal.
+    """
+
+    BARU, DUPLIKAT, KONFLIK = "Baru", "Duplikat", "Konflik"
+
+    def __init__(self, store):
+        self._store = store
+        self._siap = False
+        self._penuh = {}       # (detik, akun, ket, debit, kredit) -> jumlah baris
+        self._sebagian = {}    # (detik, akun, ket) -> jumlah baris
+
+    @staticmethod
+    def kunci_baris(rows):
+        detik = pd.to_datetime(rows["Tanggal"]).to_numpy(dtype="datetime64[s]").astype(np.int64).tolist()
+        akun = [str(a) for a in rows["Akun"]]
+        ket = ["" if pd.isna(k) else str(k) for k in rows["Keterangan"]]
+        debit = np.asarray(rows["Debit"], dtype=np.int64).tolist()
+        kredit = np.asarray(rows["Kredit"], dtype=np.int64).tolist()
+        return list(zip(detik, akun, ket, debit, kredit))
+
+    def _catat(self, kunci, tanda):
+        for tabel, k in ((self._penuh, kunci), (self._sebagian, kunci[:3])):
+            jumlah = tabel.get(k, 0) + tanda
+            if jumlah > 0:
+                tabel[k] = jumlah
+            else:
+                tabel.pop(k, None)
+
+    def _muat(self):
+        if not self._siap:
+            for kunci in self.kunci_baris(self._store.frame()):
+                self._catat(kunci, 1)
+            self._siap = True
+
+    def _terapkan(self, rows, tanda):
+        if not self._siap:
+            return
+        for kunci in self.kunci_baris(rows):
+            self._catat(kunci, tanda)
+
+    def saat_tambah(self, baru):
+        self._terapkan(baru, 1)
+
+    def saat_hapus(self, lama):
+        self._terapkan(lama, -1)
+
+    @diukur("import.duplikat")
+    def klasifikasi(self, rows):
+        """Status tiap baris calon import: Baru, Duplikat atau Konflik.
+
+        Baris kembar di dalam file yang sama hanya dianggap duplikat sebanyak
+        salinan yang sudah ada di buku; sisanya dihitung baru.
+        """
+        with self._store.kunci:
+            self._store.segarkan()
+            self._muat()
+            terpakai = {}
+            status = []
+            for kunci in self.kunci_baris(rows):
+                ada = self._penuh.get(kunci, 0)
+                if ada > terpakai.get(kunci, 0):
+                    terpakai[kunci] = terpakai.get(kunci, 0) + 1
+                    status.append(self.DUPLIKAT)
+                elif self._sebagian.get(kunci[:3], 0) > ada:
+                    status.append(self.KONFLIK)
+                else:
+                    status.append(self.BARU)
+        return np.array(status, dtype=object)
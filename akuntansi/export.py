@@ -0,0 +1,486 @@
+"""Export laporan ke Excel (mode lama dan mode streaming write-only).
+
+Modul ini satu-satunya yang memuat openpyxl untuk menulis; diimpor saat export saja.
+"""
+import calendar
+import io
+from copy import copy
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils import get_column_letter
+
+from .format import format_rupiah_angka, format_rupiah_kolom, format_tanggal_kolom
+from .instrumentasi import Tahapan, diukur
+from .jurnal import nomor_jurnal_lokal
+from .laporan import buku_besar, laporan_laba_rugi, neraca_saldo
+
+def _format_laba_rugi(label, val):
+    # Rugi ditulis dalam kurung, mis. (Rp 1.500,00); baris lain format rupiah biasa
+    if label == "Laba/Rugi" and val < 0:
+        val_str = f"(Rp {abs(val):,.2f})"
+        return val_str.replace(",", "X").replace(".", ",").replace("X", ".")
+    return format_rupiah_angka(val)
+
+@diukur("export.excel")
+def export_excel_multi(df, bb=None, ns=None, lr=None, streaming=False, tujuan=None, progres=None):
+    # streaming=True: worksheet write-only, memori tetap kecil untuk data besar
+    if streaming:
+        return _export_excel_streaming(df, bb=bb, ns=ns, lr=lr, tujuan=tujuan, progres=progres)
+    output = io.BytesIO()
+    wb = Workbook()
+
+    thin_border = Border(left=Side(style='thin'),
+                         right=Side(style='thin'),
+                         top=Side(style='thin'),
+                         bottom=Side(style='thin'))
+
+    header_fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")   # biru header
+    title_fill = PatternFill(start_color="bdd7ee", end_color="bdd7ee", fill_type="solid")    # biru muda
+    year_fill = PatternFill(start_color="d9e1f2", end_color="d9e1f2", fill_type="solid")     # biru sangat muda
+
+    font_white_bold = Font(bold=True, color="FFFFFF")
+    font_bold = Font(bold=True)
+    kiri = Alignment(horizontal="left")
+    kanan = Alignment(horizontal="right")
+    rata_transaksi = [kiri, kiri, kiri, kanan, kanan]
+
+    def kolom_transaksi(data, rupiah=True):
+        # Kolom diformat sekali per array (bukan per sel), lalu ditulis baris demi baris lewat zip
+        kolom = [format_tanggal_kolom(data["Tanggal"]), np.asarray(data["Akun"], dtype=object),
+                 np.asarray(data["Keterangan"], dtype=object)]
+        if rupiah:
+            return kolom + [format_rupiah_kolom(data["Debit"]), format_rupiah_kolom(data["Kredit"])]
+        return kolom + [data["Debit"].tolist(), data["Kredit"].tolist()]
+
+    def tulis_baris(lembar, r, kolom, rata):
+        # Style bersama (alignment/border) dipakai ulang untuk semua sel; hasil: baris berikutnya
+        for nilai in zip(*kolom):
+            for col, (v, a) in enumerate(zip(nilai, rata), start=1):
+                c = lembar.cell(row=r, column=col, value=v)
+                c.alignment = a
+                c.border = thin_border
+            r += 1
+        return r
+
+    df = df.assign(Tanggal=pd.to_datetime(df["Tanggal"])).sort_values("Tanggal")
+    df["Tahun"] = df["Tanggal"].dt.year
+    df["Bulan"] = df["Tanggal"].dt.month
+
+    # Sheet 1: Laporan Keuangan
+    ws = wb.active
+    ws.title = "Laporan Keuangan"
+    current_row = 1
+
+    for tahun, df_tahun in df.groupby("Tahun"):
+        ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=5)
+        tcell = ws.cell(row=current_row, column=1, value=f"Laporan Keuangan Tahun {tahun}")
+        tcell.font = Font(bold=True, size=14)
+        tcell.fill = year_fill
+        tcell.alignment = Alignment(horizontal="center", vertical="center")
+        for col in range(1, 6):
+            ws.cell(row=current_row, column=col).border = thin_border
+        current_row += 1
+
+        for bulan, df_bulan in df_tahun.groupby("Bulan"):
+            nama_bulan = calendar.month_name[bulan]
+            ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=5)
+            bcell = ws.cell(row=current_row, column=1, value=f"Bulan {nama_bulan}")
+            bcell.font = font_bold
+            bcell.fill = title_fill
+            bcell.alignment = Alignment(horizontal="center", vertical="center")
+            for col in range(1, 6):
+                ws.cell(row=current_row, column=col).border = thin_border
+
+            current_row += 1
+
+            headers = ["Tanggal", "Akun", "Keterangan", "Debit", "Kredit"]
+            for idx, val in enumerate(headers, start=1):
+                hcell = ws.cell(row=current_row, column=idx, value=val)
+                hcell.font = font_white_bold
+                hcell.fill = header_fill
+                hcell.alignment = Alignment(horizontal="center", vertical="center")
+                hcell.border = thin_border
+            current_row += 1
+
+            current_row = tulis_baris(ws, current_row, kolom_transaksi(df_bulan), rata_transaksi)
+            total_debit_bulan = int(df_bulan["Debit"].sum())
+            total_kredit_bulan = int(df_bulan["Kredit"].sum())
+
+            # Tambahkan baris Total
+            ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=3)
+            total_cell = ws.cell(row=current_row, column=1, value="Total")
+            total_cell.font = font_bold
+            total_cell.fill = title_fill
+            total_cell.alignment = Alignment(horizontal="center", vertical="center")
+            
+            debit_total_cell = ws.cell(row=current_row, column=4, value=format_rupiah_angka(total_debit_bulan))
+            debit_total_cell.font = font_bold
+            debit_total_cell.fill = title_fill
+            debit_total_cell.alignment = Alignment(horizontal="right")
+            
+            kredit_total_cell = ws.cell(row=current_row, column=5, value=format_rupiah_angka(total_kredit_bulan))
+            kredit_total_cell.font = font_bold
+            kredit_total_cell.fill = title_fill
+            kredit_total_cell.alignment = Alignment(horizontal="right")
+            
+            for col in range(1, 6):
+                ws.cell(row=current_row, column=col).border = thin_border
+            
+            current_row += 2
+
+        current_row += 1
+
+    col_widths = [22, 18, 30, 20, 20]
+    for i, width in enumerate(col_widths, start=1):
+        ws.column_dimensions[chr(64 + i)].width = width
+
+    # Sheet 2: Jurnal Umum
+    ws2 = wb.create_sheet("Jurnal Umum")
+    ws2.merge_cells(start_row=1, start_column=1, end_row=1, end_column=5)
+    title_cell = ws2.cell(row=1, column=1, value="Jurnal Umum")
+    title_cell.font = Font(bold=True, size=14)
+    title_cell.alignment = Alignment(horizontal="center", vertical="center")
+
+    headers = ["Tanggal", "Akun", "Keterangan", "Debit", "Kredit"]
+    for idx, val in enumerate(headers, start=1):
+        hcell = ws2.cell(row=2, column=idx, value=val)
+        hcell.font = font_white_bold
+        hcell.fill = header_fill
+        hcell.alignment = Alignment(horizontal="center", vertical="center")
+        hcell.border = thin_border
+
+    tulis_baris(ws2, 3, kolom_transaksi(df), rata_transaksi)
+
+    for i, width in enumerate(col_widths, 1):
+        ws2.column_dimensions[chr(64 + i)].width = width
+
+    # Sheet 3: Buku Besar
+    ws3 = wb.create_sheet("Buku Besar")
+    if bb is None:
+        bb = buku_besar(df)
+    r = 1
+    for akun, data in bb.items():
+        ws3.merge_cells(start_row=r, start_column=1, end_row=r, end_column=6)
+        a_cell = ws3.cell(row=r, column=1, value=f"Buku Besar - {akun}")
+        a_cell.font = font_bold
+        a_cell.alignment = Alignment(horizontal="center", vertical="center")
+        r += 1
+
+        headers = ["Tanggal", "Akun", "Keterangan", "Debit", "Kredit", "Saldo"]
+        for idx, val in enumerate(headers, start=1):
+            hcell = ws3.cell(row=r, column=idx, value=val)
+            hcell.font = font_white_bold
+            hcell.fill = header_fill
+            hcell.alignment = Alignment(horizontal="center", vertical="center")
+            hcell.border = thin_border
+        r += 1
+
+        r = tulis_baris(ws3, r, kolom_transaksi(data) + [format_rupiah_kolom(data["Saldo"])], rata_transaksi + [kanan])
+        r += 2
+
+    col_widths_bb = [22, 18, 30, 20, 20, 20]
+    for i, width in enumerate(col_widths_bb, 1):
+        ws3.column_dimensions[chr(64 + i)].width = width
+
+    # Sheet 4: Neraca Saldo
+    ws4 = wb.create_sheet("Neraca Saldo")
+    ws4.merge_cells(start_row=1, start_column=1, end_row=1, end_column=4)
+    c = ws4.cell(row=1, column=1, value="Neraca Saldo")
+    c.font = font_bold
+    c.alignment = Alignment(horizontal="center", vertical="center")
+
+    headers = ["Akun", "Debit", "Kredit", "Saldo"]
+    for idx, val in enumerate(headers, start=1):
+        hcell = ws4.cell(row=2, column=idx, value=val)
+        hcell.font = font_white_bold
+        hcell.fill = header_fill
+        hcell.alignment = Alignment(horizontal="center", vertical="center")
+        hcell.border = thin_border
+
+    if ns is None:
+        ns = neraca_saldo(df)
+    tulis_baris(ws4, 3, [ns.index.astype(object), format_rupiah_kolom(ns["Debit"]), format_rupiah_kolom(ns["Kredit"]),
+                         format_rupiah_kolom(ns["Saldo"])], [kiri, kanan, kanan, kanan])
+
+    col_widths_ns = [22, 20, 20, 20]
+    for i, width in enumerate(col_widths_ns, 1):
+        ws4.column_dimensions[chr(64 + i)].width = width
+
+    # Sheet 5: Laporan Laba Rugi
+    ws5 = wb.create_sheet("Laporan Laba Rugi")
+    ws5.merge_cells(start_row=1, start_column=1, end_row=1, end_column=2)
+    c = ws5.cell(row=1, column=1, value="Laporan Laba Rugi")
+    c.font = font_bold
+    c.alignment = Alignment(horizontal="center", vertical="center")
+    c.fill = year_fill
+
+    headers = ["Keterangan", "Jumlah"]
+    for idx, val in enumerate(headers, start=1):
+        hcell = ws5.cell(row=2, column=idx, value=val)
+        hcell.font = font_white_bold
+        hcell.fill = header_fill
+        hcell.alignment = Alignment(horizontal="center", vertical="center")
+        hcell.border = thin_border
+
+    if lr is None:
+        lr = laporan_laba_rugi(df)
+    labels = ["Total Pendapatan", "Total Beban", "Laba/Rugi"]
+    values = [lr["Total Pendapatan"], lr["Total Beban"], lr["Laba/Rugi"]]
+
+    r = 3
+    for label, val in zip(labels, values):
+        ws5.cell(row=r, column=1, value=label).alignment = Alignment(horizontal="left")
+        ws5.cell(row=r, column=1).border = thin_border
+
+        c = ws5.cell(row=r, column=2, value=_format_laba_rugi(label, val))
+        c.alignment = Alignment(horizontal="right")
+        c.border = thin_border
+
+        r += 1
+
+    ws5.column_dimensions['A'].width = 25
+    ws5.column_dimensions['B'].width = 20
+
+    # Sheet 6: Data Import (format sederhana untuk import ulang)
+    ws6 = wb.create_sheet("Data Import")
+    ws6.merge_cells(start_row=1, start_column=1, end_row=1, end_column=6)
+    title_cell = ws6.cell(row=1, column=1, value="Data Import - Format untuk Import Ulang")
+    title_cell.font = Font(bold=True, size=12, italic=True)
+    title_cell.alignment = Alignment(horizontal="center", vertical="center")
+    title_cell.fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
+    
+    headers = ["Tanggal", "Akun", "Keterangan", "Debit", "Kredit", "Jurnal"]
+    for idx, val in enumerate(headers, start=1):
+        hcell = ws6.cell(row=2, column=idx, value=val)
+        hcell.font = font_white_bold
+        hcell.fill = header_fill
+        hcell.alignment = Alignment(horizontal="center", vertical="center")
+        hcell.border = thin_border
+    
+    tulis_baris(ws6, 3, kolom_transaksi(df, rupiah=False) + [nomor_jurnal_lokal(df).tolist()], rata_transaksi + [kanan])
+
+    for i, width in enumerate(col_widths + [12], 1):
+        ws6.column_dimensions[chr(64 + i)].width = width
+
+    if tujuan is not None:
+        wb.save(tujuan)
+        return None
+    wb.save(output)
+    output.seek(0)
+    return output.getvalue()
+
+# ===========================
+# Export excel mode streaming (write-only, style bersama)
+# ===========================
+UKURAN_POTONGAN_EXPORT = 50000
+
+def _gaya_export(wb):
+    # Satu set named style untuk seluruh workbook, tidak membuat objek style per sel
+    tepi = Side(style="thin")
+    border = Border(left=tepi, right=tepi, top=tepi, bottom=tepi)
+    tengah = Alignment(horizontal="center", vertical="center")
+    header_fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")
+    title_fill = PatternFill(start_color="bdd7ee", end_color="bdd7ee", fill_type="solid")
+    year_fill = PatternFill(start_color="d9e1f2", end_color="d9e1f2", fill_type="solid")
+    for gaya in [
+        NamedStyle("ex_teks", font=copy(DEFAULT_FONT), border=border, alignment=Alignment(horizontal="left")),
+        NamedStyle("ex_angka", font=copy(DEFAULT_FONT), border=border, alignment=Alignment(horizontal="right")),
+        NamedStyle("ex_garis", font=copy(DEFAULT_FONT), border=border),
+        NamedStyle("ex_header", font=Font(bold=True, color="FFFFFF"), fill=header_fill, border=border, alignment=tengah),
+        NamedStyle("ex_tahun", font=Font(bold=True, size=14), fill=year_fill, border=border, alignment=tengah),
+        NamedStyle("ex_bulan", font=Font(bold=True), fill=title_fill, border=border, alignment=tengah),
+        NamedStyle("ex_total_angka", font=Font(bold=True), fill=title_fill, border=border, alignment=Alignment(horizontal="right")),
+        NamedStyle("ex_judul_besar", font=Font(bold=True, size=14), alignment=tengah),
+        NamedStyle("ex_judul", font=Font(bold=True), alignment=tengah),
+        NamedStyle("ex_judul_lr", font=Font(bold=True), fill=year_fill, alignment=tengah),
+        NamedStyle("ex_judul_import", font=Font(bold=True, size=12, italic=True), alignment=tengah,
+                   fill=PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")),
+    ]:
+        wb.add_named_style(gaya)
+
+def _potongan(n):
+    for awal in range(0, n, UKURAN_POTONGAN_EXPORT):
+        yield awal, min(awal + UKURAN_POTONGAN_EXPORT, n)
+
+class _LembarStreaming:
+    """Worksheet write-only yang mencatat nomor baris untuk merge."""
+
+    def __init__(self, wb, judul, lebar, progres=None):
+        self.ws = wb.create_sheet(judul)
+        for i, w in enumerate(lebar, start=1):
+            self.ws.column_dimensions[get_column_letter(i)].width = w
+        self.baris = 0
+        self.progres = progres
+
+    def sel(self, nilai, gaya):
+        c = WriteOnlyCell(self.ws, value=nilai)
+        c.style = gaya
+        return c
+
+    def tulis(self, isi):
+        self.ws.append(isi)
+        self.baris += 1
+
+    def kosong(self, jumlah=1):
+        for _ in range(jumlah):
+            self.tulis([])
+
+    def judul(self, teks, gaya, kolom, gaya_sisa=None):
+        # Baris judul yang di-merge dari kolom A sampai kolom ke-`kolom`
+        isi = [self.sel(teks, gaya)]
+        if gaya_sisa:
+            isi += [self.sel(None, gaya_sisa) for _ in range(kolom - 1)]
+        self.tulis(isi)
+        self.ws.merged_cells.add(f"A{self.baris}:{get_column_letter(kolom)}{self.baris}")
+
+    def header(self, kolom):
+        self.tulis([self.sel(k, "ex_header") for k in kolom])
+
+    def baris_data(self, kolom, gaya):
+        # kolom: list array sejajar; gaya: nama style per kolom.
+        # Baris langsung diserialisasi saat append, jadi objek sel yang sama dipakai ulang.
+        sel = [self.sel(None, g) for g in gaya]
+        jumlah = 0
+        for jumlah, nilai in enumerate(zip(*kolom), start=1):
+            for c, v in zip(sel, nilai):
+                c.value = v
+            self.tulis(sel)
+            if self.progres and jumlah % 2000 == 0:
+                self.progres(2000)
+        if self.progres:
+            self.progres(jumlah % 2000)
+
+def _export_excel_streaming(df, bb=None, ns=None, lr=None, tujuan=None, progres=None):
+    tahap = Tahapan("export")
+    tahap("persiapan", len(df))
+    wb = Workbook(write_only=True)
+    _gaya_export(wb)
+
+    df = df.assign(Tanggal=pd.to_datetime(df["Tanggal"])).sort_values("Tanggal", kind="stable")
+    if bb is None:
+        bb = buku_besar(df)
+    if progres is not None:
+        # progres(fraksi) dipanggil berkala; satuan kerja = baris data yang ditulis
+        total_baris = max(3 * len(df) + sum(len(d) for d in bb.values()), 1)
+        sudah = [0]
+
+        def maju(jumlah):
+            sudah[0] += jumlah
+            progres(min(sudah[0] / total_baris, 1.0))
+    else:
+        maju = None
+
+    tanggal = pd.to_datetime(df["Tanggal"]).to_numpy(dtype="datetime64[ns]")
+    akun = np.asarray(df["Akun"], dtype=object)
+    ket = np.asarray(df["Keterangan"], dtype=object)
+    debit = np.asarray(df["Debit"], dtype=np.int64)
+    kredit = np.asarray(df["Kredit"], dtype=np.int64)
+    jurnal = nomor_jurnal_lokal(df)
+    n = len(df)
+    headers = ["Tanggal", "Akun", "Keterangan", "Debit", "Kredit"]
+    col_widths = [22, 18, 30, 20, 20]
+    gaya_transaksi = ["ex_teks", "ex_teks", "ex_teks", "ex_angka", "ex_angka"]
+
+    def tulis_transaksi(lembar, awal, akhir, rupiah=True):
+        for a, b in _potongan(akhir - awal):
+            a, b = awal + a, awal + b
+            kolom = [format_tanggal_kolom(tanggal[a:b]), akun[a:b], ket[a:b]]
+            if rupiah:
+                kolom += [format_rupiah_kolom(debit[a:b]), format_rupiah_kolom(kredit[a:b])]
+                lembar.baris_data(kolom, gaya_transaksi)
+            else:
+                # Angka mentah + nomor jurnal agar jurnal tetap utuh saat diimport ulang
+                kolom += [debit[a:b].tolist(), kredit[a:b].tolist(), jurnal[a:b].tolist()]
+                lembar.baris_data(kolom, gaya_transaksi + ["ex_angka"])
+
+    # Sheet 1: Laporan Keuangan, batas bulan dicari sekali dari tanggal yang sudah urut
+    tahap("laporan_keuangan", n)
+    lembar = _LembarStreaming(wb, "Laporan Keuangan", col_widths, maju)
+    if n:
+        bulan_ke = tanggal.astype("datetime64[M]").astype(np.int64)
+        awal_bulan = np.r_[0, np.flatnonzero(np.diff(bulan_ke)) + 1]
+        akhir_bulan = np.r_[awal_bulan[1:], n]
+        total_debit = np.add.reduceat(debit, awal_bulan)
+        total_kredit = np.add.reduceat(kredit, awal_bulan)
+        tahun_lalu = None
+        for i, (awal, akhir) in enumerate(zip(awal_bulan, akhir_bulan)):
+            tahun, bulan = divmod(int(bulan_ke[awal]), 12)
+            tahun += 1970
+            if tahun != tahun_lalu:
+                if tahun_lalu is not None:
+                    lembar.kosong()
+                lembar.judul(f"Laporan Keuangan Tahun {tahun}", "ex_tahun", 5, "ex_garis")
+                tahun_lalu = tahun
+            lembar.judul(f"Bulan {calendar.month_name[bulan + 1]}", "ex_bulan", 5, "ex_garis")
+            lembar.header(headers)
+            tulis_transaksi(lembar, int(awal), int(akhir))
+            lembar.tulis([lembar.sel("Total", "ex_bulan"), lembar.sel(None, "ex_garis"), lembar.sel(None, "ex_garis"),
+                          lembar.sel(format_rupiah_angka(int(total_debit[i])), "ex_total_angka"),
+                          lembar.sel(format_rupiah_angka(int(total_kredit[i])), "ex_total_angka")])
+            lembar.ws.merged_cells.add(f"A{lembar.baris}:C{lembar.baris}")
+            lembar.kosong()
+
+    # Sheet 2: Jurnal Umum
+    tahap("jurnal_umum", n)
+    lembar = _LembarStreaming(wb, "Jurnal Umum", col_widths, maju)
+    lembar.judul("Jurnal Umum", "ex_judul_besar", 5)
+    lembar.header(headers)
+    tulis_transaksi(lembar, 0, n)
+
+    # Sheet 3: Buku Besar
+    tahap("buku_besar", sum(len(d) for d in bb.values()))
+    lembar = _LembarStreaming(wb, "Buku Besar", [22, 18, 30, 20, 20, 20], maju)
+    for nama_akun, data in bb.items():
+        lembar.judul(f"Buku Besar - {nama_akun}", "ex_judul", 6)
+        lembar.header(headers + ["Saldo"])
+        for a, b in _potongan(len(data)):
+            bagian = data.iloc[a:b]
+            lembar.baris_data([format_tanggal_kolom(bagian["Tanggal"]), np.asarray(bagian["Akun"], dtype=object),
+                               np.asarray(bagian["Keterangan"], dtype=object), format_rupiah_kolom(bagian["Debit"]),
+                               format_rupiah_kolom(bagian["Kredit"]), format_rupiah_kolom(bagian["Saldo"])],
+                              gaya_transaksi + ["ex_angka"])
+        lembar.kosong(2)
+
+    # Sheet 4: Neraca Saldo
+    tahap("neraca_saldo")
+    lembar = _LembarStreaming(wb, "Neraca Saldo", [22, 20, 20, 20])
+    lembar.judul("Neraca Saldo", "ex_judul", 4)
+    lembar.header(["Akun", "Debit", "Kredit", "Saldo"])
+    if ns is None:
+        ns = neraca_saldo(df)
+    lembar.baris_data([ns.index.astype(object), format_rupiah_kolom(ns["Debit"]), format_rupiah_kolom(ns["Kredit"]),
+                       format_rupiah_kolom(ns["Saldo"])], ["ex_teks", "ex_angka", "ex_angka", "ex_angka"])
+
+    # Sheet 5: Laporan Laba Rugi
+    tahap("laba_rugi")
+    lembar = _LembarStreaming(wb, "Laporan Laba Rugi", [25, 20])
+    lembar.judul("Laporan Laba Rugi", "ex_judul_lr", 2)
+    lembar.header(["Keterangan", "Jumlah"])
+    if lr is None:
+        lr = laporan_laba_rugi(df)
+    for label in ["Total Pendapatan", "Total Beban", "Laba/Rugi"]:
+        lembar.tulis([lembar.sel(label, "ex_teks"), lembar.sel(_format_laba_rugi(label, lr[label]), "ex_angka")])
+
+    # Sheet 6: Data Import (angka mentah untuk import ulang)
+    tahap("data_import", n)
+    lembar = _LembarStreaming(wb, "Data Import", col_widths + [12], maju)
+    lembar.judul("Data Import - Format untuk Import Ulang", "ex_judul_import", 6)
+    lembar.header(headers + ["Jurnal"])
+    tulis_transaksi(lembar, 0, n, rupiah=False)
+
+    # Write-only: isi sheet baru diserialisasi ke XML dan dikompres saat disimpan
+    tahap("simpan")
+    try:
+        if tujuan is not None:
+            wb.save(tujuan)
+            return None
+        output = io.BytesIO()
+        wb.save(output)
+    finally:
+        tahap.selesai()
+    return output.getvalue()
@@ -0,0 +1,80 @@
+"""Format Rupiah dan tanggal, per nilai maupun per kolom."""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .instrumentasi import diukur
+
+def format_rupiah_angka(n):
+    if n == 0 or n is None:
+        return "Rp -"
+    s = f"{n:,.2f}"
+    s = s.replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"Rp {s}"
+
+def format_tanggal(dt):
+    if pd.isna(dt):
+        return ""
+    if isinstance(dt, str):
+        try:
+            dt = pd.to_datetime(dt)
+        except:
+            return dt
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+BATAS_CACHE_RUPIAH = 4096
+
+@lru_cache(maxsize=65536)
+def _rupiah_tersimpan(n):
+    return format_rupiah_angka(n)
+
+def _rupiah_banyak(angka):
+    # Sama dengan format_rupiah_angka untuk bilangan bulat: satu format + satu replace per nilai
+    pola = "Rp {:_},00".format
+    return np.array([pola(n).replace("_", ".") if n else "Rp -" for n in angka.tolist()], dtype=object)
+
+@diukur("format.rupiah")
+def format_rupiah_kolom(nilai):
+    """Format seluruh kolom Rupiah sekaligus; tiap nilai unik cukup diformat sekali.
+
+    Nilai unik yang sedikit (Debit/Kredit) lewat cache LRU yang bertahan antar rerun,
+    yang banyak (Saldo berjalan) langsung diformat tanpa lewat cache.
+    """
+    seri = nilai if isinstance(nilai, pd.Series) else None
+    arr = np.asarray(nilai)
+    if arr.dtype.kind in "iub":
+        kode, unik = pd.factorize(arr.astype(np.int64, copy=False))
+        if len(unik) > BATAS_CACHE_RUPIAH:
+            teks = _rupiah_banyak(unik)
+        else:
+            teks = np.array([_rupiah_tersimpan(int(n)) for n in unik], dtype=object)
+        hasil = teks[kode] if len(unik) else np.empty(len(arr), dtype=object)
+    else:
+        hasil = np.array([format_rupiah_angka(n) for n in arr], dtype=object)
+    return pd.Series(hasil, index=seri.index, name=seri.name, dtype=object) if seri is not None else hasil
+
+@diukur("format.tanggal")
+def format_tanggal_kolom(tanggal):
+    """Format kolom datetime ke "YYYY-MM-DD HH:MM:SS" tanpa strftime per sel."""
+    seri = tanggal if isinstance(tanggal, pd.Series) else None
+    arr = np.asarray(tanggal)
+    if arr.dtype.kind != "M":
+        hasil = np.array([format_tanggal(t) for t in arr], dtype=object)
+    elif not len(arr):
+        # np.char.replace gagal pada array kosong (max dari ukuran buffer nol)
+        hasil = np.empty(0, dtype=object)
+    else:
+        teks = np.datetime_as_string(arr.astype("datetime64[s]"), unit="s")
+        hasil = np.where(np.isnat(arr), "", np.char.replace(teks, "T", " ")).astype(object)
+    return pd.Series(hasil, index=seri.index, name=seri.name, dtype=object) if seri is not None else hasil
+
+@diukur("format.tabel")
+def tabel_tampilan(df, rupiah=("Debit", "Kredit")):
+    # Salinan df untuk st.dataframe: Tanggal dan kolom uang sudah berupa teks
+    tampil = df.copy()
+    if "Tanggal" in tampil.columns:
+        tampil["Tanggal"] = format_tanggal_kolom(tampil["Tanggal"])
+    for kolom in rupiah:
+        tampil[kolom] = format_rupiah_kolom(tampil[kolom])
+    return tampil
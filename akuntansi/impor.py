@@ -0,0 +1,121 @@
+"""Import transaksi (Excel/CSV/Parquet/Arrow) per potongan dengan pembersihan vektor.
+
+openpyxl baru dimuat saat membaca file Excel, pyarrow saat membaca Parquet/Arrow.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from .dasar import KOLOM_TRANSAKSI
+from .instrumentasi import diukur
+from .jurnal import nomor_jurnal_lokal
+
+UKURAN_POTONGAN_IMPORT = 50000
+MAKS_BARIS_CARI_HEADER = 10
+# Kolom opsional: nomor jurnal (baris bernomor sama = satu jurnal); tanpa kolom ini baris tanpa jurnal
+KOLOM_OPSIONAL = ["Jurnal"]
+
+def parse_rupiah_kolom(nilai):
+    # Versi vektor dari parse Rupiah: angka dipotong ke int, teks "Rp 1.234.567,00" / "Rp -" diurai
+    nilai = pd.Series(nilai).reset_index(drop=True)
+    if pd.api.types.is_numeric_dtype(nilai):
+        return np.trunc(np.nan_to_num(nilai.to_numpy(dtype=float), nan=0.0)).astype(np.int64)
+    nilai = nilai.astype(object)
+    hasil = np.zeros(len(nilai), dtype=np.int64)
+    teks = nilai.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+    if (~teks).any():
+        angka = pd.to_numeric(nilai[~teks], errors="coerce").to_numpy(dtype=float)
+        hasil[~teks] = np.trunc(np.nan_to_num(angka, nan=0.0)).astype(np.int64)
+    if teks.any():
+        bersih = (nilai[teks].str.replace("Rp", "", regex=False).str.replace(" ", "", regex=False)
+                  .str.replace(".", "", regex=False).str.replace(",", ".", regex=False).str.strip())
+        angka = pd.to_numeric(bersih, errors="coerce").to_numpy(dtype=float)
+        hasil[teks] = np.trunc(np.nan_to_num(angka, nan=0.0, posinf=0.0, neginf=0.0)).astype(np.int64)
+    return hasil
+
+@diukur("import.bersihkan")
+def bersihkan_import(df):
+    # Tanggal tidak valid dibuang, Debit/Kredit diurai, hanya baris dengan nilai yang disimpan.
+    # Keseimbangan jurnal diperiksa saat disimpan (tambah_banyak), bukan di sini
+    tanggal = pd.to_datetime(df["Tanggal"], errors="coerce")
+    hasil = pd.DataFrame({
+        "Tanggal": tanggal.to_numpy(dtype="datetime64[ns]"),
+        "Akun": df["Akun"].astype(object).to_numpy(),
+        "Keterangan": df["Keterangan"].astype(object).where(df["Keterangan"].notna(), "").to_numpy(),
+        "Debit": parse_rupiah_kolom(df["Debit"]),
+        "Kredit": parse_rupiah_kolom(df["Kredit"]),
+        "Jurnal": nomor_jurnal_lokal(df),
+    })
+    valid = hasil["Tanggal"].notna() & hasil["Akun"].notna() & ((hasil["Debit"] > 0) | (hasil["Kredit"] > 0))
+    return hasil[valid.to_numpy()].reset_index(drop=True)
+
+def _normalisasi_header(baris):
+    return [str(h).strip() if h is not None else None for h in baris]
+
+def sheet_valid_excel(file):
+    # Satu kali buka read-only; header boleh di baris mana saja dalam 10 baris pertama
+    # (sheet hasil export punya judul di baris 1 dan header di baris 2)
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        semua = wb.sheetnames
+        valid = {}
+        for nama in semua:
+            for nomor, baris in enumerate(wb[nama].iter_rows(max_row=MAKS_BARIS_CARI_HEADER, values_only=True), start=1):
+                if set(KOLOM_TRANSAKSI) <= set(_normalisasi_header(baris)):
+                    valid[nama] = nomor
+                    break
+        return semua, valid
+    finally:
+        wb.close()
+
+def _potongan_excel(file, sheet, baris_header, ukuran):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet]
+        ws.reset_dimensions()
+        baris = ws.iter_rows(min_row=baris_header, values_only=True)
+        header = _normalisasi_header(next(baris))
+        kolom = KOLOM_TRANSAKSI + [k for k in KOLOM_OPSIONAL if k in header]
+        posisi = [header.index(k) for k in kolom]
+        potongan = []
+        for row in baris:
+            potongan.append(row)
+            if len(potongan) >= ukuran:
+                yield pd.DataFrame.from_records(potongan).reindex(columns=posisi).set_axis(kolom, axis=1)
+                potongan = []
+        if potongan:
+            yield pd.DataFrame.from_records(potongan).reindex(columns=posisi).set_axis(kolom, axis=1)
+    finally:
+        wb.close()
+
+def jenis_file_import(nama):
+    ekstensi = os.path.splitext(nama)[1].lower()
+    return {".xlsx": "excel", ".csv": "csv", ".parquet": "parquet", ".pq": "parquet",
+            ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow"}.get(ekstensi)
+
+@diukur("import.baca")
+def baca_import(file, jenis, sheet=None, baris_header=1, ukuran_potongan=UKURAN_POTONGAN_IMPORT):
+    """Baca file transaksi per potongan lalu bersihkan secara vektor.
+
+    jenis: "excel" (butuh sheet & baris_header), "csv", "parquet" atau "arrow".
+    """
+    if jenis == "excel":
+        potongan = _potongan_excel(file, sheet, baris_header, ukuran_potongan)
+    elif jenis == "csv":
+        kolom = set(KOLOM_TRANSAKSI + KOLOM_OPSIONAL)
+        potongan = pd.read_csv(file, usecols=lambda k: k in kolom, dtype={"Akun": object, "Keterangan": object},
+                               chunksize=ukuran_potongan)
+    elif jenis in ("parquet", "arrow"):
+        from .kolumnar import potongan_kolumnar
+        potongan = potongan_kolumnar(file, jenis, ukuran_potongan)
+    else:
+        raise ValueError(f"Jenis file tidak didukung: {jenis}")
+    hasil = [bersihkan_import(df) for df in potongan]
+    if not hasil:
+        return bersihkan_import(pd.DataFrame(columns=KOLOM_TRANSAKSI))
+    return pd.concat(hasil, ignore_index=True)
@@ -0,0 +1,269 @@
+"""Indeks teks penuh kolom Keterangan (inverted index token -> ID transaksi).
+
+Kueri: kata dipisah spasi dan semuanya harus ada (tidak peka huruf besar/kecil).
+Akhiri kata dengan * untuk awalan (bayar*), pakai tanda kutip untuk frasa
+("beban listrik"); kata yang terpecah tanda baca (BKT-0001) dicari sebagai frasa.
+"""
+import re
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from .instrumentasi import diukur
+from .memo import dimemo
+
+# Token = deret huruf/angka; tanda baca dan garis bawah jadi pemisah (sama dengan unicode61 di FTS5 SQLite)
+POLA_TOKEN = re.compile(r"[^\W_]+")
+POLA_KUERI = re.compile(r'"([^"]*)"(\*?)|(\S+)')
+# Delta digabung ke indeks utama setelah lewat batas ini (atau 10% indeks utama)
+MIN_DELTA = 50000
+# Tambah sampai sekian baris ditokenisasi per baris tanpa pandas
+BATAS_KECIL = 32
+_KOSONG = np.empty(0, dtype=np.int64)
+
+def token_teks(teks):
+    """Token huruf kecil sebuah teks, urut kemunculan."""
+    return POLA_TOKEN.findall(str(teks).lower())
+
+def urai_kueri(kueri):
+    """Kueri -> daftar syarat (token, awalan); token > 1 berarti frasa."""
+    syarat = []
+    for m in POLA_KUERI.finditer(kueri or ""):
+        if m.group(1) is not None:
+            teks, awalan = m.group(1), bool(m.group(2))
+        else:
+            teks, awalan = m.group(3), m.group(3).endswith("*")
+        token = tuple(token_teks(teks))
+        if token:
+            syarat.append((token, awalan))
+    return syarat
+
+def kueri_fts(syarat):
+    """Syarat hasil urai_kueri sebagai ekspresi MATCH FTS5 (token sudah bebas tanda kutip)."""
+    return " ".join(f'"{" ".join(token)}"' + ("*" if awalan else "") for token, awalan in syarat)
+
+def _irisan(a, b):
+    # Dua array ID urut unik: cari anggota array kecil di array besar
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a
+    posisi = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[posisi] == a]
+
+def _unik(a):
+    # np.unique lewat sort: jauh lebih cepat untuk jutaan int64
+    a = np.sort(a)
+    return a[np.r_[True, a[1:] != a[:-1]]] if len(a) else a
+
+def _kumpulkan(awal, akhir, data):
+    # Gabungan potongan data[awal[i]:akhir[i]] tanpa loop Python
+    panjang = akhir - awal
+    if not panjang.sum():
+        return _KOSONG
+    geser = np.arange(panjang.sum()) - np.repeat(np.cumsum(panjang) - panjang, panjang)
+    return data[np.repeat(awal, panjang) + geser]
+
+class IndeksKeterangan:
+    """Inverted index Keterangan: ID token -> ID transaksi urut naik.
+
+    Indeks utama rapat (CSR): ID transaksi semua token dalam satu array urut ID
+    token, plus offset per token. Tambah masuk ke delta per token dan hapus
+    dicatat sebagai tombstone; keduanya dilebur ke indeks utama sekaligus setelah
+    cukup banyak, jadi tulis kecil tidak menyalin indeks. Awalan dicari dengan
+    binary search di kosakata urut.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._siap = False
+        self._id_token = {}     # token -> ID token
+        self._token = []        # ID token -> token
+        self._awal = np.zeros(1, dtype=np.int64)    # offset ID token di _posting (indeks utama)
+        self._posting = _KOSONG
+        self._delta = {}        # ID token -> [array ID transaksi, ...] sejak peleburan terakhir
+        self._n_delta = 0
+        self._terhapus = _KOSONG                    # ID terhapus yang masih tercatat di indeks
+        self._urut = np.empty(0, dtype=object)      # kosakata urut (untuk awalan) ...
+        self._urut_id = _KOSONG                     # ... dan ID tokennya
+
+    def _pasangan(self, ids, keterangan):
+        # Pasangan (ID token, ID transaksi), tiap token sekali per baris
+        ids = np.asarray(ids, dtype=np.int64)
+        cari = POLA_TOKEN.findall
+        if len(ids) <= BATAS_KECIL:
+            # Tambah satu/sedikit baris dari halaman input: tanpa overhead pandas
+            teks = ["" if pd.isna(k) else str(k).lower() for k in np.asarray(keterangan, dtype=object).tolist()]
+            pasangan = [(t, i) for i, k in enumerate(teks) for t in dict.fromkeys(cari(k))]
+            # Token yang sama di beberapa baris harus dapat satu ID: cari ID per token unik
+            unik = list(dict.fromkeys(t for t, _ in pasangan))
+            peta = dict(zip(unik, self._id_token_dari(unik).tolist()))
+            token = np.array([peta[t] for t, _ in pasangan], dtype=np.int64)
+            return token, ids[np.array([i for _, i in pasangan], dtype=np.int64)]
+        # Tiap teks unik ditokenisasi sekali dan tiap token unik dicari sekali; sisanya operasi array
+        kode, unik = pd.factorize(pd.Series(np.asarray(keterangan, dtype=object)).fillna(""))
+        per_teks = list(map(cari, pd.Series(unik, dtype=object).astype(str).str.lower().tolist()))
+        panjang = np.fromiter(map(len, per_teks), dtype=np.int64, count=len(per_teks))
+        datar, kosakata = pd.factorize(pd.Series(list(chain.from_iterable(per_teks)), dtype=object))
+        peta = self._id_token_dari(kosakata.tolist())
+        # Token ganda dalam satu teks dibuang: kunci (teks, token) unik, urut teks
+        kunci = _unik(np.repeat(np.arange(len(unik), dtype=np.int64), panjang) * len(self._token) + peta[datar])
+        teks, token = np.divmod(kunci, max(len(self._token), 1))
+        panjang = np.bincount(teks, minlength=len(unik))
+        awal = np.cumsum(panjang) - panjang
+        baris = np.repeat(np.arange(len(kode)), panjang[kode])
+        return _kumpulkan(awal[kode], awal[kode] + panjang[kode], token), ids[baris]
+
+    def _id_token_dari(self, token):
+        # ID untuk daftar token unik; token yang belum ada didaftarkan ke kosakata
+        dapat = self._id_token.get
+        peta = np.array([dapat(t, -1) for t in token], dtype=np.int64)
+        baru = np.flatnonzero(peta < 0)
+        if len(baru):
+            mulai = len(self._token)
+            nama = [token[i] for i in baru.tolist()]
+            self._token.extend(nama)
+            self._id_token.update(zip(nama, range(mulai, mulai + len(nama))))
+            peta[baru] = np.arange(mulai, mulai + len(nama))
+        return peta
+
+    def _susun(self, token, ids):
+        urutan = np.lexsort((ids, token))
+        self._awal = np.r_[0, np.cumsum(np.bincount(token, minlength=len(self._token)))].astype(np.int64)
+        self._posting = ids[urutan]
+        self._delta = {}
+        self._n_delta = 0
+
+    def _muat(self):
+        if not self._siap:
+            df = self._store.frame()
+            self._susun(*self._pasangan(df.index, df["Keterangan"]))
+            self._urutkan_kosakata()
+            self._siap = True
+
+    @diukur("teks.lebur")
+    def _lebur(self):
+        # Indeks utama + delta - tombstone -> indeks utama baru
+        token = [np.repeat(np.arange(len(self._awal) - 1), np.diff(self._awal))]
+        ids = [self._posting]
+        for id_token, daftar in self._delta.items():
+            bagian = np.concatenate(daftar)
+            token.append(np.full(len(bagian), id_token, dtype=np.int64))
+            ids.append(bagian)
+        token, ids = np.concatenate(token), np.concatenate(ids)
+        hidup = ~np.isin(ids, self._terhapus)
+        self._susun(token[hidup], ids[hidup])
+        self._terhapus = _KOSONG
+
+    def _batas_delta(self):
+        return max(MIN_DELTA, len(self._posting) // 10)
+
+    def saat_tambah(self, baru):
+        if not self._siap:
+            return
+        token, ids = self._pasangan(baru.index, baru["Keterangan"])
+        if not len(token):
+            return
+        urutan = np.argsort(token, kind="stable")
+        token, ids = token[urutan], ids[urutan]
+        batas = np.flatnonzero(np.diff(token)) + 1
+        for awal, bagian in zip(np.r_[0, batas], np.split(ids, batas)):
+            self._delta.setdefault(int(token[awal]), []).append(bagian)
+        self._n_delta += len(ids)
+        if self._n_delta > self._batas_delta():
+            self._lebur()
+
+    def saat_hapus(self, lama):
+        if not self._siap:
+            return
+        self._terhapus = np.union1d(self._terhapus, lama.index.to_numpy(dtype=np.int64))
+        if len(self._terhapus) > self._batas_delta():
+            self._lebur()
+
+    def _ambil(self, id_token):
+        # ID transaksi satu token: indeks utama + delta (delta dirapatkan saat dibaca)
+        utama = self._posting[self._awal[id_token]:self._awal[id_token + 1]] if id_token < len(self._awal) - 1 \
+            else _KOSONG
+        daftar = self._delta.get(id_token)
+        if not daftar:
+            return utama
+        if len(daftar) > 1:
+            daftar[:] = [np.concatenate(daftar)]
+        return np.concatenate([utama, daftar[0]])
+
+    def _urutkan_kosakata(self):
+        # Token yang belum ada di kosakata urut disisipkan di posisinya (binary search)
+        mulai = len(self._urut)
+        if mulai < len(self._token):
+            sisa = self._token[mulai:]
+            urutan = np.array(sorted(range(len(sisa)), key=sisa.__getitem__), dtype=np.int64)
+            teks = np.array(sisa, dtype=object)[urutan]
+            posisi = np.searchsorted(self._urut, teks)
+            self._urut = np.insert(self._urut, posisi, teks)
+            self._urut_id = np.insert(self._urut_id, posisi, urutan + mulai)
+
+    def _id_awalan(self, awalan):
+        self._urutkan_kosakata()
+        kiri, kanan = np.searchsorted(self._urut, [awalan, awalan + "\U0010ffff"])
+        return self._urut_id[kiri:kanan]
+
+    def _cocok_awalan(self, awalan):
+        id_token = self._id_awalan(awalan)
+        utama = id_token[id_token < len(self._awal) - 1]
+        bagian = [_kumpulkan(self._awal[utama], self._awal[utama + 1], self._posting)]
+        if self._delta:
+            delta = [t for t in id_token.tolist() if t in self._delta] if len(id_token) < len(self._delta) \
+                else [t for t in self._delta if self._token[t].startswith(awalan)]
+            bagian += [np.concatenate(self._delta[t]) for t in delta]
+        # Satu baris bisa memuat beberapa token berawalan sama
+        return np.concatenate(bagian) if len(id_token) == 1 else _unik(np.concatenate(bagian))
+
+    def _kandidat(self, token, awalan):
+        utuh = token[:-1] if awalan else token
+        hasil = None
+        for t in dict.fromkeys(utuh):
+            id_token = self._id_token.get(t)
+            ids = _KOSONG if id_token is None else self._ambil(id_token)
+            hasil = ids if hasil is None else _irisan(hasil, ids)
+            if not len(hasil):
+                return hasil
+        if awalan:
+            ids = self._cocok_awalan(token[-1])
+            hasil = ids if hasil is None else _irisan(hasil, ids)
+        return hasil
+
+    def _saring_frasa(self, ids, token, awalan):
+        # Kandidat sudah memuat semua token; cek urutannya di teks yang dinormalisasi
+        df = self._store.frame()
+        posisi = np.searchsorted(df.index.to_numpy(), ids)
+        teks = df["Keterangan"].to_numpy()[posisi]
+        pola = " " + " ".join(token) + ("" if awalan else " ")
+        # Teks yang sama (mis. "Bayar listrik" tiap bulan) cukup dicek sekali
+        cek = {}
+        for k in teks:
+            if k not in cek:
+                cek[k] = pola in " " + " ".join(token_teks(k)) + " "
+        return ids[np.fromiter((cek[k] for k in teks), dtype=bool, count=len(teks))]
+
+    @dimemo
+    @diukur("teks.cocok")
+    def cocok(self, kueri):
+        """ID transaksi (urut naik) yang Keterangan-nya cocok dengan kueri; None bila kueri kosong."""
+        syarat = urai_kueri(kueri)
+        if not syarat:
+            return None
+        with self._store.kunci:
+            self._muat()
+            hasil = None
+            for token, awalan in syarat:
+                ids = self._kandidat(token, awalan)
+                hasil = ids if hasil is None else _irisan(hasil, ids)
+                if not len(hasil):
+                    return hasil
+            if len(self._terhapus):
+                hasil = hasil[~np.isin(hasil, self._terhapus)]
+            for token, awalan in syarat:
+                if len(token) > 1:
+                    hasil = self._saring_frasa(hasil, token, awalan)
+        return hasil
@@ -0,0 +1,213 @@
+"""Instrumentasi opt-in: rentang waktu (span) laporan, import/export dan render halaman.
+
+Aktif bila env AKUNTANSI_PROFIL=1 atau aktifkan() dipanggil. Saat mati, rentang()
+mengembalikan konteks kosong bersama sehingga biaya di jalur panas hampir nol.
+"""
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+MAKS_RENTANG = 5000
+
+_aktif = os.environ.get("AKUNTANSI_PROFIL", "") not in ("", "0")
+_rerun = contextvars.ContextVar("rerun", default=None)
+_induk = contextvars.ContextVar("induk", default=None)
+_nomor_rerun = itertools.count(1)
+
+class Perekam:
+    """Buffer melingkar rentang terbaru (thread-safe)."""
+
+    def __init__(self, maks=MAKS_RENTANG):
+        self._data = deque(maxlen=maks)
+        self._lock = threading.Lock()
+
+    def simpan(self, rentang):
+        with self._lock:
+            self._data.append(rentang)
+
+    def bersihkan(self):
+        with self._lock:
+            self._data.clear()
+
+    def daftar(self):
+        with self._lock:
+            return list(self._data)
+
+    def frame(self):
+        kolom = ["waktu", "nama", "induk", "detik", "baris", "bytes", "rerun", "halaman", "thread"]
+        df = pd.DataFrame(self.daftar(), columns=kolom)
+        for k in ("baris", "bytes", "rerun"):
+            df[k] = pd.to_numeric(df[k]).astype("Int64")
+        return df
+
+    def ringkasan(self):
+        """Per nama rentang: jumlah, p50/p95/maks detik, total detik, baris dan bytes."""
+        df = self.frame()
+        if df.empty:
+            return pd.DataFrame(columns=["Jumlah", "p50 (ms)", "p95 (ms)", "Maks (ms)", "Total (s)", "Baris", "Bytes"])
+        grup = df.groupby("nama")
+        hasil = pd.DataFrame({
+            "Jumlah": grup.size(),
+            "p50 (ms)": grup["detik"].quantile(0.5) * 1000,
+            "p95 (ms)": grup["detik"].quantile(0.95) * 1000,
+            "Maks (ms)": grup["detik"].max() * 1000,
+            "Total (s)": grup["detik"].sum(),
+            "Baris": grup["baris"].sum(min_count=1),
+            "Bytes": grup["bytes"].sum(min_count=1),
+        })
+        return hasil.sort_values("Total (s)", ascending=False)
+
+    def per_rerun(self):
+        """Satu baris per rerun halaman: total render dan waktu rentang tingkat pertama di dalamnya."""
+        df = self.frame()
+        df = df[df["rerun"].notna()]
+        if df.empty:
+            return pd.DataFrame(columns=["Waktu", "Halaman", "Total (ms)", "Rentang (ms)", "Jumlah Rentang"])
+        halaman = df[df["nama"] == "halaman"].set_index("rerun")
+        # Hanya anak langsung halaman agar rentang bersarang tidak terhitung dua kali
+        anak = df[df["induk"] == "halaman"].groupby("rerun")["detik"].agg(["sum", "size"])
+        hasil = pd.DataFrame({
+            "Waktu": waktu_lokal(halaman["waktu"]),
+            "Halaman": halaman["halaman"],
+            "Total (ms)": halaman["detik"] * 1000,
+            "Rentang (ms)": anak["sum"].reindex(halaman.index, fill_value=0) * 1000,
+            "Jumlah Rentang": anak["size"].reindex(halaman.index, fill_value=0),
+        })
+        return hasil.sort_index(ascending=False)
+
+    def json(self):
+        return json.dumps({"rentang": self.daftar()}, indent=1, default=_ke_json)
+
+perekam = Perekam()
+
+def waktu_lokal(detik_epoch):
+    return pd.to_datetime(detik_epoch, unit="s", utc=True).dt.tz_convert("Asia/Jakarta")
+
+def _ke_json(nilai):
+    if isinstance(nilai, np.generic):
+        return nilai.item()
+    raise TypeError(f"Tidak bisa diubah ke JSON: {type(nilai).__name__}")
+
+class _Rentang:
+    __slots__ = ("nama", "baris", "bytes", "_waktu", "_mulai", "_induk")
+
+    def __init__(self, nama, baris=None, bytes=None):
+        self.nama = nama
+        self.baris = baris
+        self.bytes = bytes
+
+    def catat(self, baris=None, bytes=None):
+        if baris is not None:
+            self.baris = baris
+        if bytes is not None:
+            self.bytes = bytes
+
+    def __enter__(self):
+        self._induk = _induk.get()
+        _induk.set(self.nama)
+        self._waktu = time.time()
+        self._mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        detik = time.perf_counter() - self._mulai
+        _induk.set(self._induk)
+        rerun = _rerun.get()
+        perekam.simpan({
+            "waktu": self._waktu,
+            "nama": self.nama,
+            "induk": self._induk,
+            "detik": detik,
+            "baris": self.baris,
+            "bytes": self.bytes,
+            "rerun": rerun[0] if rerun else None,
+            "halaman": rerun[1] if rerun else None,
+            "thread": threading.current_thread().name,
+        })
+        return False
+
+class _RentangKosong:
+    __slots__ = ()
+
+    def catat(self, baris=None, bytes=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_KOSONG = _RentangKosong()
+
+def aktif():
+    return _aktif
+
+def aktifkan(nyala=True):
+    global _aktif
+    _aktif = nyala
+
+def rentang(nama, baris=None, bytes=None):
+    """Context manager pengukur satu tahap; baris/bytes bisa diisi belakangan lewat catat()."""
+    return _Rentang(nama, baris, bytes) if _aktif else _KOSONG
+
+def _ukuran(args, hasil):
+    # Baris = panjang tabel/kolom masukan pertama, atau hasil bila masukan tidak ada
+    baris = next((len(a) for a in args if isinstance(a, (pd.DataFrame, pd.Series, np.ndarray))), None)
+    if baris is None and isinstance(hasil, pd.DataFrame):
+        baris = len(hasil)
+    return baris, len(hasil) if isinstance(hasil, (bytes, bytearray)) else None
+
+def diukur(nama):
+    """Dekorator: setiap panggilan dicatat sebagai rentang `nama` dengan baris & bytes."""
+    def bungkus(fungsi):
+        @wraps(fungsi)
+        def fungsi_diukur(*args, **kwargs):
+            if not _aktif:
+                return fungsi(*args, **kwargs)
+            with _Rentang(nama) as r:
+                hasil = fungsi(*args, **kwargs)
+                r.catat(*_ukuran(args, hasil))
+            return hasil
+        return fungsi_diukur
+    return bungkus
+
+class Tahapan:
+    """Rentang berurutan tanpa blok with: setiap panggilan menutup tahap sebelumnya."""
+
+    def __init__(self, awalan):
+        self._awalan = awalan
+        self._sekarang = None
+
+    def __call__(self, nama, baris=None):
+        self.selesai()
+        self._sekarang = rentang(f"{self._awalan}.{nama}", baris).__enter__()
+
+    def selesai(self):
+        if self._sekarang is not None:
+            self._sekarang.__exit__(None, None, None)
+            self._sekarang = None
+
+def mulai_rerun(halaman):
+    """Tandai awal satu rerun halaman; rentang setelahnya dikelompokkan ke rerun ini."""
+    if not _aktif:
+        return
+    r = _Rentang("halaman")
+    _rerun.set((next(_nomor_rerun), halaman, r))
+    _induk.set(None)
+    r.__enter__()
+
+def selesai_rerun():
+    # Tidak terpanggil bila rerun dihentikan st.rerun()/st.stop(); rerun itu tidak dicatat
+    rerun = _rerun.get()
+    if rerun is not None:
+        rerun[2].__exit__(None, None, None)
+        _rerun.set(None)
@@ -0,0 +1,59 @@
+"""Job export di latar belakang (thread pool + cache hasil)."""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+class JobExport:
+    """Satu export yang berjalan di thread pool; progres 0..1 dibaca halaman."""
+
+    def __init__(self):
+        self.progres = 0.0
+        self.hasil = None
+        self.error = None
+        self.durasi = None
+        self.future = None
+
+    def jalankan(self, fungsi):
+        mulai = time.perf_counter()
+        try:
+            self.hasil = fungsi(self._set_progres)
+            self.progres = 1.0
+        except Exception as e:
+            self.error = e
+        finally:
+            self.durasi = time.perf_counter() - mulai
+
+    def _set_progres(self, nilai):
+        self.progres = nilai
+
+    @property
+    def selesai(self):
+        return self.future.done()
+
+class ManajerExport:
+    """Thread pool export dengan cache hasil (LRU) per kunci (filter periode, versi buku)."""
+
+    def __init__(self, maks_pekerja=2, maks_hasil=8):
+        self._pool = ThreadPoolExecutor(max_workers=maks_pekerja, thread_name_prefix="export")
+        self._lock = threading.Lock()
+        self._job = OrderedDict()
+        self.maks_hasil = maks_hasil
+
+    def minta(self, kunci, fungsi):
+        # fungsi(progres) -> bytes; hanya dijalankan bila kunci belum ada atau sebelumnya gagal
+        with self._lock:
+            job = self._job.get(kunci)
+            if job is not None and not (job.selesai and job.error is not None):
+                self._job.move_to_end(kunci)
+                return job
+            job = JobExport()
+            job.future = self._pool.submit(job.jalankan, fungsi)
+            self._job[kunci] = job
+            # Buang hasil paling lama yang sudah selesai
+            for lama in list(self._job):
+                if len(self._job) <= self.maks_hasil:
+                    break
+                if lama != kunci and self._job[lama].selesai:
+                    del self._job[lama]
+            return job
@@ -0,0 +1,79 @@
+"""Jurnal berpasangan: satu jurnal = N baris yang total Debit-nya sama dengan total Kredit.
+
+Setiap baris transaksi membawa nomor jurnal di kolom "Jurnal". Nomor 0 dimiliki baris lama
+(satu baris per transaksi, dari versi sebelum ada jurnal) dan tidak ikut pemeriksaan. Baris baru
+tanpa nomor jurnal disatukan per batch (lihat satukan_tanpa_nomor), kecuali file lama yang
+sengaja diimport sebagai baris lama lewat tambah_banyak(df, tanpa_jurnal=True).
+Pemeriksaan dikerjakan vektor: satu sort + reduceat untuk jutaan baris sekaligus.
+"""
+import numpy as np
+import pandas as pd
+
+TANPA_JURNAL = 0
+
+class JurnalTidakSeimbang(ValueError):
+    """Ada jurnal dengan total Debit != total Kredit; rincian per jurnal di .rincian."""
+
+    def __init__(self, rincian):
+        self.rincian = rincian
+        contoh = rincian.iloc[0]
+        super().__init__(f"{len(rincian)} jurnal tidak seimbang, mis. jurnal {rincian.index[0]}: "
+                         f"Debit {int(contoh['Debit']):,} ≠ Kredit {int(contoh['Kredit']):,}")
+
+def ringkas_jurnal(jurnal, debit, kredit):
+    """Total per nomor jurnal (tanpa nomor 0): DataFrame index Jurnal, kolom Baris, Debit, Kredit, Selisih."""
+    jurnal = np.asarray(jurnal, dtype=np.int64)
+    debit = np.asarray(debit, dtype=np.int64)
+    kredit = np.asarray(kredit, dtype=np.int64)
+    pakai = jurnal != TANPA_JURNAL
+    jurnal, debit, kredit = jurnal[pakai], debit[pakai], kredit[pakai]
+    urutan = np.argsort(jurnal, kind="stable")
+    jurnal = jurnal[urutan]
+    awal = np.flatnonzero(np.r_[True, jurnal[1:] != jurnal[:-1]]) if len(jurnal) else np.empty(0, dtype=np.int64)
+    total_debit = np.add.reduceat(debit[urutan], awal) if len(awal) else np.empty(0, dtype=np.int64)
+    total_kredit = np.add.reduceat(kredit[urutan], awal) if len(awal) else np.empty(0, dtype=np.int64)
+    return pd.DataFrame({
+        "Baris": np.diff(np.r_[awal, len(jurnal)]),
+        "Debit": total_debit,
+        "Kredit": total_kredit,
+        "Selisih": total_debit - total_kredit,
+    }, index=pd.Index(jurnal[awal], name="Jurnal"))
+
+def jurnal_tidak_seimbang(jurnal, debit, kredit):
+    """Jurnal yang total Debit != Kredit, atau bernilai nol."""
+    ringkas = ringkas_jurnal(jurnal, debit, kredit)
+    return ringkas[(ringkas["Selisih"] != 0) | (ringkas["Debit"] == 0)]
+
+def periksa_seimbang(jurnal, debit, kredit):
+    salah = jurnal_tidak_seimbang(jurnal, debit, kredit)
+    if len(salah):
+        raise JurnalTidakSeimbang(salah)
+
+def nomor_jurnal_lokal(df):
+    """Nomor jurnal dari kolom "Jurnal" (file import / argumen); kosong -> 0 (baris tanpa jurnal)."""
+    if "Jurnal" not in df.columns:
+        return np.zeros(len(df), dtype=np.int64)
+    nomor = pd.to_numeric(pd.Series(np.asarray(df["Jurnal"], dtype=object)), errors="coerce")
+    return nomor.fillna(TANPA_JURNAL).to_numpy(dtype=np.int64)
+
+def satukan_tanpa_nomor(lokal):
+    """Baris batch tanpa nomor jurnal (0) dijadikan satu jurnal bernomor lokal baru.
+
+    Jadi file import tanpa kolom Jurnal tetap harus seimbang secara keseluruhan, kecuali
+    diimport sebagai baris lama (tanpa_jurnal=True).
+    """
+    lokal = np.array(lokal, dtype=np.int64)
+    kosong = lokal == TANPA_JURNAL
+    if kosong.any():
+        lokal[kosong] = max(int(lokal.max()), TANPA_JURNAL) + 1
+    return lokal
+
+def petakan_nomor(lokal, nomor_awal):
+    """Nomor lokal (unik per file) -> nomor baru di buku mulai nomor_awal; 0 tetap 0."""
+    kode, unik = pd.factorize(lokal, sort=True)
+    bernomor = unik != TANPA_JURNAL
+    jumlah = int(bernomor.sum())
+    baru = np.full(len(unik), TANPA_JURNAL, dtype=np.int64)
+    baru[bernomor] = np.arange(nomor_awal, nomor_awal + jumlah, dtype=np.int64)
+    hasil = baru[kode] if len(unik) else np.zeros(len(lokal), dtype=np.int64)
+    return hasil, nomor_awal + jumlah
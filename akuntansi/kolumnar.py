@@ -0,0 +1,128 @@
+"""Export/import transaksi kolumnar: Parquet dan Arrow IPC.
+
+Isinya sama dengan sheet "Data Import" (Tanggal, Akun, Keterangan, Debit, Kredit,
+Jurnal; urut Tanggal) tetapi dengan tipe asli, jadi dibaca ulang tanpa mengurai teks.
+Modul ini memuat pyarrow (paket opsional); diimpor saat export/import kolumnar saja.
+"""
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from .dasar import KOLOM_TRANSAKSI
+from .instrumentasi import diukur
+from .jurnal import nomor_jurnal_lokal
+
+KOLOM_KOLUMNAR = KOLOM_TRANSAKSI + ["Jurnal"]
+# Akun berulang: disimpan sebagai dictionary (kode int32 + daftar nama), dibaca jadi category
+SKEMA_KOLUMNAR = pa.schema([
+    ("Tanggal", pa.timestamp("ns")),
+    ("Akun", pa.dictionary(pa.int32(), pa.string())),
+    ("Keterangan", pa.string()),
+    ("Debit", pa.int64()),
+    ("Kredit", pa.int64()),
+    ("Jurnal", pa.int64()),
+])
+UKURAN_GRUP_PARQUET = 128 * 1024
+
+def tabel_transaksi(df):
+    """Transaksi -> pyarrow.Table berskema SKEMA_KOLUMNAR, urut Tanggal (stabil)."""
+    tanggal = pd.to_datetime(df["Tanggal"]).to_numpy(dtype="datetime64[ns]")
+    urutan = np.argsort(tanggal, kind="stable")
+    akun = df["Akun"]
+    if isinstance(akun.dtype, pd.CategoricalDtype):
+        kode = akun.cat.codes.to_numpy()
+        nama = akun.cat.categories.astype(object).to_numpy()
+    else:
+        kode, nama = pd.factorize(np.asarray(akun, dtype=object))
+    kode = np.asarray(kode, dtype=np.int32)[urutan]
+    keterangan = df["Keterangan"].astype(object).where(df["Keterangan"].notna(), "")
+    return pa.Table.from_arrays([
+        pa.array(tanggal[urutan], type=pa.timestamp("ns")),
+        pa.DictionaryArray.from_arrays(pa.array(kode, mask=kode < 0), pa.array(nama, type=pa.string())),
+        pa.array(keterangan.to_numpy()[urutan], type=pa.string()),
+        pa.array(np.asarray(df["Debit"], dtype=np.int64)[urutan]),
+        pa.array(np.asarray(df["Kredit"], dtype=np.int64)[urutan]),
+        pa.array(nomor_jurnal_lokal(df)[urutan]),
+    ], schema=SKEMA_KOLUMNAR)
+
+def _simpan(tulis, tujuan):
+    # Sama dengan export_excel_multi: tujuan (path/file) -> None, tanpa tujuan -> bytes
+    if tujuan is not None:
+        tulis(tujuan)
+        return None
+    output = io.BytesIO()
+    tulis(output)
+    return output.getvalue()
+
+@diukur("export.parquet")
+def export_parquet(df, tujuan=None, kompresi="zstd"):
+    """Transaksi ke file Parquet; row group ~128K baris dengan statistik min/maks Tanggal."""
+    tabel = tabel_transaksi(df)
+    return _simpan(lambda f: pq.write_table(tabel, f, compression=kompresi, row_group_size=UKURAN_GRUP_PARQUET),
+                   tujuan)
+
+@diukur("export.arrow")
+def export_arrow(df, tujuan=None):
+    """Transaksi ke file Arrow IPC tanpa kompresi, supaya kolom angka bisa di-memory-map apa adanya."""
+    tabel = tabel_transaksi(df)
+
+    def tulis(f):
+        with ipc.new_file(f, tabel.schema) as penulis:
+            penulis.write_table(tabel, max_chunksize=UKURAN_GRUP_PARQUET)
+    return _simpan(tulis, tujuan)
+
+def _sumber(file, memory_map=False):
+    # Path dibuka langsung (Arrow: memory map); bytes dan objek file upload dibaca sebagai buffer
+    if isinstance(file, str) or hasattr(file, "__fspath__"):
+        return pa.memory_map(str(file)) if memory_map else file
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        return pa.BufferReader(file)
+    if hasattr(file, "seek"):
+        file.seek(0)
+    return pa.BufferReader(file.read())
+
+def _kolom_ada(skema):
+    return KOLOM_TRANSAKSI + [k for k in KOLOM_KOLUMNAR[len(KOLOM_TRANSAKSI):] if k in skema.names]
+
+def potongan_kolumnar(file, jenis, ukuran):
+    """DataFrame per potongan ±ukuran baris; hanya kolom transaksi yang dibaca dari file."""
+    if jenis == "parquet":
+        berkas = pq.ParquetFile(_sumber(file))
+        try:
+            kolom = _kolom_ada(berkas.schema_arrow)
+            for batch in berkas.iter_batches(batch_size=ukuran, columns=kolom):
+                yield batch.to_pandas()
+        finally:
+            berkas.close()
+    elif jenis == "arrow":
+        sumber = _sumber(file, memory_map=True)
+        pembaca = ipc.open_file(sumber)
+        kolom = _kolom_ada(pembaca.schema)
+        for i in range(pembaca.num_record_batches):
+            batch = pembaca.get_batch(i).select(kolom)
+            for awal in range(0, batch.num_rows, ukuran):
+                yield batch.slice(awal, ukuran).to_pandas()
+    else:
+        raise ValueError(f"Jenis file kolumnar tidak didukung: {jenis}")
+
+def baca_kolumnar(file, jenis):
+    """Baca file hasil export_parquet/export_arrow apa adanya (tipe sama dengan store.frame()).
+
+    Berbeda dengan baca_import, baris tidak dibersihkan dan nomor jurnal tidak dipetakan.
+    """
+    if jenis == "parquet":
+        tabel = pq.read_table(_sumber(file))
+    elif jenis == "arrow":
+        tabel = ipc.open_file(_sumber(file, memory_map=True)).read_all()
+    else:
+        raise ValueError(f"Jenis file kolumnar tidak didukung: {jenis}")
+    df = tabel.select(_kolom_ada(tabel.schema)).to_pandas()
+    # pyarrow memberi teks bertipe str; store.frame() memakai object
+    akun = df["Akun"]
+    if isinstance(akun.dtype, pd.CategoricalDtype):
+        akun = akun.cat.set_categories(akun.cat.categories.astype(object))
+    return df.assign(Akun=akun, Keterangan=df["Keterangan"].astype(object))
@@ -0,0 +1,60 @@
+"""Laporan dari DataFrame transaksi: buku besar, neraca saldo, laba rugi, data grafik."""
+import pandas as pd
+
+from .dasar import bagan_laporan, neraca_dari_total
+from .instrumentasi import diukur
+
+@diukur("laporan.buku_besar")
+def buku_besar(df, bagan=None):
+    # Satu kali sort + cumsum per kelompok; untuk buku yang tersimpan pakai MesinSaldo.
+    # Saldo di sisi normal akun seperti neraca saldo: akun kredit normal = Kredit - Debit
+    df_urut = df.sort_values("Tanggal", kind="stable")
+    bagan, ids = bagan_laporan(df_urut["Akun"], bagan)
+    mutasi = df_urut["Debit"] - df_urut["Kredit"]
+    mutasi = mutasi.where(~bagan.kredit_normal[ids], -mutasi)
+    saldo = mutasi.groupby(df_urut["Akun"], observed=True, sort=False).cumsum()
+    kelompok = df_urut.assign(Saldo=saldo).groupby("Akun", observed=True, sort=False)
+    return {akun: kelompok.get_group(akun) for akun in df["Akun"].unique()}
+
+@diukur("laporan.neraca_saldo")
+def neraca_saldo(df, bagan=None):
+    grouped = df.groupby("Akun", observed=True)[["Debit", "Kredit"]].sum()
+    return neraca_dari_total(grouped.index, grouped["Debit"], grouped["Kredit"], bagan)
+
+@diukur("laporan.laba_rugi")
+def laporan_laba_rugi(df, bagan=None):
+    # Sisi normal: pendapatan bertambah di Kredit, beban di Debit; tipe akun dari bagan
+    bagan, ids = bagan_laporan(df["Akun"], bagan)
+    bersih = df["Kredit"].to_numpy(dtype="int64") - df["Debit"].to_numpy(dtype="int64")
+    total_pendapatan = int(bersih[bagan.tipe_akun("pendapatan")[ids]].sum())
+    total_beban = -int(bersih[bagan.tipe_akun("beban")[ids]].sum())
+    laba_rugi = total_pendapatan - total_beban
+    return {
+        "Total Pendapatan": total_pendapatan,
+        "Total Beban": total_beban,
+        "Laba/Rugi": laba_rugi
+    }
+
+def data_grafik(store):
+    """Data halaman Grafik dari agregat: total per akun dan tren pendapatan/beban per bulan.
+
+    Dimemo di store.memo, jadi hanya dihitung ulang setelah buku berubah.
+    """
+    return store.memo.ambil("data_grafik", lambda: _hitung_grafik(store))
+
+@diukur("laporan.data_grafik")
+def _hitung_grafik(store):
+    bulanan = store.agregat.bulanan()
+    per_akun = bulanan.groupby("Akun", sort=True)[["Debit", "Kredit"]].sum().reset_index()
+    periode = pd.to_datetime(pd.DataFrame({"year": bulanan["Tahun"], "month": bulanan["Bulan"], "day": 1}))
+    bulanan = bulanan.assign(Periode=periode)
+    # Sama dengan laporan_laba_rugi: menurut sisi normal akun
+    bagan = store.bagan
+    ids = bagan.id_akun(bulanan["Akun"])
+    bersih = bulanan["Kredit"] - bulanan["Debit"]
+    pendapatan = bersih[bagan.tipe_akun("pendapatan")[ids]].groupby(bulanan["Periode"]).sum()
+    beban = -bersih[bagan.tipe_akun("beban")[ids]].groupby(bulanan["Periode"]).sum()
+    tren = pd.DataFrame({"Pendapatan": pendapatan, "Beban": beban}).reindex(
+        pd.Index(sorted(bulanan["Periode"].unique()), name="Periode")).fillna(0).astype("int64")
+    tren["Laba/Rugi"] = tren["Pendapatan"] - tren["Beban"]
+    return per_akun, tren.reset_index()
@@ -0,0 +1,359 @@
+"""Log tulis append-only untuk buku memori: tambah, hapus (tombstone), tutup buku dan akun baru.
+
+Folder log berisi segmen `log-NNNNNN.bin` dan snapshot `snapshot-NNNNNN.bin`.
+Snapshot nomor g berisi seluruh buku hidup sampai sebelum segmen g, jadi pemulihan
+cukup memuat snapshot terbaru lalu memutar ulang segmen >= g. Setiap rekaman di-flush
+ke OS saat itu juga (aman dari proses mati); fsync dikumpulkan per `jeda_fsync` detik
+oleh thread latar (aman dari mati listrik dengan jeda sebesar itu).
+
+Rekaman dan snapshot memakai format kolumnar biner yang sama: array numpy mentah per
+kolom, teks sebagai satu blob UTF-8.
+"""
+import atexit
+import json
+import os
+import re
+import struct
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from .instrumentasi import rentang
+from .penyimpanan import TransaksiStore
+
+MAGIC_LOG = b"AKLOG1\n\0"
+MAGIC_SNAPSHOT = b"AKSNAP1\n"
+TAMBAH, HAPUS, TUTUP, AKUN = b"T", b"H", b"S", b"A"
+_KEPALA = struct.Struct("<cII")   # jenis, panjang isi, crc32 isi
+_POLA_FILE = re.compile(r"^(log|snapshot)-(\d{6})\.bin$")
+# Pemadatan otomatis setelah segmen sejak snapshot terakhir sebesar ini
+BATAS_PADAT = 64 * 1024 * 1024
+PEMISAH_TEKS = "\0"
+
+def kemas_kolom(kolom):
+    """dict nama -> array (angka atau teks) menjadi bytes kolumnar."""
+    kepala, isi = [], []
+    for nama, nilai in kolom.items():
+        nilai = np.asarray(nilai)
+        if nilai.dtype == object:
+            teks = [str(t) for t in nilai]
+            gabung = PEMISAH_TEKS.join(teks)
+            if gabung.count(PEMISAH_TEKS) == max(len(teks) - 1, 0):
+                jenis, data = "teks", gabung.encode()
+            else:
+                # Ada teks yang memuat pemisah: simpan panjang tiap teks di depan blob
+                panjang = np.array([len(t) for t in teks], dtype=np.int64)
+                jenis, data = "teks_panjang", panjang.tobytes() + "".join(teks).encode()
+        else:
+            jenis, data = nilai.dtype.str, np.ascontiguousarray(nilai).tobytes()
+        kepala.append([nama, jenis, len(nilai), len(data)])
+        isi.append(data)
+    meta = json.dumps(kepala).encode()
+    return struct.pack("<I", len(meta)) + meta + b"".join(isi)
+
+def buka_kolom(data):
+    """Kebalikan kemas_kolom: dict nama -> array numpy."""
+    data = memoryview(data)
+    (panjang_meta,) = struct.unpack_from("<I", data)
+    posisi = 4 + panjang_meta
+    hasil = {}
+    for nama, jenis, n, ukuran in json.loads(bytes(data[4:posisi])):
+        bagian = data[posisi:posisi + ukuran]
+        posisi += ukuran
+        if jenis == "teks":
+            hasil[nama] = np.array(str(bagian, "utf-8").split(PEMISAH_TEKS) if n else [], dtype=object)
+        elif jenis == "teks_panjang":
+            batas = np.r_[0, np.cumsum(np.frombuffer(bagian[:8 * n], dtype=np.int64))]
+            teks = str(bagian[8 * n:], "utf-8")
+            hasil[nama] = np.array([teks[a:b] for a, b in zip(batas[:-1], batas[1:])], dtype=object)
+        else:
+            hasil[nama] = np.frombuffer(bagian, dtype=np.dtype(jenis)).copy()
+    return hasil
+
+def _kolom_transaksi(rows):
+    return {
+        "ID": rows.index.to_numpy(dtype=np.int64),
+        "Tanggal": np.asarray(rows["Tanggal"], dtype="datetime64[ns]").view(np.int64),
+        "Akun": np.asarray(rows["Akun"], dtype=object),
+        "Keterangan": np.asarray(rows["Keterangan"], dtype=object),
+        "Debit": rows["Debit"].to_numpy(dtype=np.int64),
+        "Kredit": rows["Kredit"].to_numpy(dtype=np.int64),
+        "Jurnal": rows["Jurnal"].to_numpy(dtype=np.int64),
+    }
+
+def _frame_transaksi(kolom):
+    return pd.DataFrame({
+        "Tanggal": kolom["Tanggal"].view("datetime64[ns]"),
+        "Akun": kolom["Akun"],
+        "Keterangan": kolom["Keterangan"],
+        "Debit": kolom["Debit"],
+        "Kredit": kolom["Kredit"],
+        "Jurnal": kolom["Jurnal"],
+    }, index=pd.Index(kolom["ID"]))
+
+def _tutup_ke_json(periode, saldo):
+    return {"periode": list(periode), "saldo": {akun: list(nilai) for akun, nilai in saldo.items()}}
+
+def _tutup_dari_json(data):
+    return tuple(data["periode"]), {akun: tuple(nilai) for akun, nilai in data["saldo"].items()}
+
+def _fsync_folder(folder):
+    # Supaya rename/file baru ikut tahan mati listrik (tidak tersedia di Windows)
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+class LogBuku:
+    """Pendengar TransaksiStore yang menulis setiap perubahan ke log di `folder`.
+
+    Pakai buka_buku_log() untuk memulihkan buku dari log lalu memasang log-nya.
+    Log selalu menulis ke segmen baru setiap kali dibuka, jadi ekor segmen lama
+    yang terpotong karena crash tidak pernah disambung.
+    """
+
+    def __init__(self, folder, store, jeda_fsync=1.0, batas_padat=BATAS_PADAT):
+        self.folder = folder
+        self._store = store
+        self.jeda_fsync = jeda_fsync
+        self.batas_padat = batas_padat
+        self._kunci = threading.Lock()    # file segmen: penulis vs thread fsync vs rotasi
+        self._file = None
+        self._kotor = False
+        self._job_padat = None
+        self.segmen = 0
+        self.bytes_sejak_snapshot = 0
+        self.statistik = {}
+        os.makedirs(folder, exist_ok=True)
+        self._henti = threading.Event()
+        self._thread_fsync = threading.Thread(target=self._loop_fsync, name="log_buku_fsync", daemon=True)
+
+    # ---------- nama file ----------
+    def _daftar(self, jenis):
+        nomor = sorted(int(m.group(2)) for m in map(_POLA_FILE.match, os.listdir(self.folder))
+                       if m and m.group(1) == jenis)
+        return nomor
+
+    def _path(self, jenis, nomor):
+        return os.path.join(self.folder, f"{jenis}-{nomor:06d}.bin")
+
+    # ---------- pemulihan ----------
+    def _baca_snapshot(self, nomor):
+        with open(self._path("snapshot", nomor), "rb") as f:
+            data = f.read()
+        if data[:len(MAGIC_SNAPSHOT)] != MAGIC_SNAPSHOT:
+            raise ValueError("bukan file snapshot")
+        crc, panjang_meta = struct.unpack_from("<II", data, len(MAGIC_SNAPSHOT))
+        isi = memoryview(data)[len(MAGIC_SNAPSHOT) + 4:]
+        if zlib.crc32(isi) != crc:
+            raise ValueError("checksum snapshot tidak cocok")
+        meta = json.loads(bytes(isi[4:4 + panjang_meta]))
+        return meta, buka_kolom(isi[4 + panjang_meta:])
+
+    def _baca_segmen(self, nomor):
+        """Rekaman utuh satu segmen; ekor yang terpotong/rusak dibuang dari file."""
+        path = self._path("log", nomor)
+        with open(path, "rb") as f:
+            data = f.read()
+        rekaman = []
+        posisi = len(MAGIC_LOG) if data[:len(MAGIC_LOG)] == MAGIC_LOG else 0
+        while posisi + _KEPALA.size <= len(data):
+            jenis, panjang, crc = _KEPALA.unpack_from(data, posisi)
+            isi = data[posisi + _KEPALA.size:posisi + _KEPALA.size + panjang]
+            if len(isi) < panjang or zlib.crc32(isi) != crc or jenis not in (TAMBAH, HAPUS, TUTUP, AKUN):
+                break
+            rekaman.append((jenis, isi))
+            posisi += _KEPALA.size + panjang
+        if posisi < len(data):
+            # Crash saat menulis: potong file ke rekaman utuh terakhir
+            with open(path, "r+b") as f:
+                f.truncate(posisi)
+        return rekaman
+
+    def pulihkan(self):
+        """Muat snapshot terbaru + putar ulang segmen sesudahnya ke store (yang masih kosong)."""
+        with rentang("log.pulihkan") as r:
+            bagian, tombstone, tutup = [], [], []
+            meta = {"segmen": 0, "id_berikut": 0, "jurnal_berikut": 1, "tutup": [], "akun": []}
+            snapshot = self._daftar("snapshot")
+            for nomor in reversed(snapshot):
+                try:
+                    meta, kolom = self._baca_snapshot(nomor)
+                except (OSError, ValueError, KeyError, struct.error):
+                    continue     # snapshot rusak: pakai yang lebih lama, segmennya belum dihapus
+                bagian.append(kolom)
+                break
+            else:
+                if snapshot:
+                    # Segmen sebelum snapshot sudah dibuang; memutar sisanya akan kehilangan data
+                    raise ValueError(f"Semua snapshot di {self.folder} rusak; buku tidak bisa dipulihkan")
+            tutup = [_tutup_dari_json(t) for t in meta["tutup"]]
+            akun = list(meta.get("akun", []))
+            segmen = [s for s in self._daftar("log") if s >= meta["segmen"]]
+            for nomor in segmen:
+                rekaman = self._baca_segmen(nomor)
+                if not rekaman:
+                    os.remove(self._path("log", nomor))    # segmen kosong dari restart tanpa tulisan
+                for jenis, isi in rekaman:
+                    self.bytes_sejak_snapshot += _KEPALA.size + len(isi)
+                    if jenis == TAMBAH:
+                        bagian.append(buka_kolom(isi))
+                    elif jenis == HAPUS:
+                        tombstone.append(np.frombuffer(isi, dtype=np.int64))
+                    elif jenis == AKUN:
+                        akun.extend(json.loads(isi))
+                    else:
+                        tutup.append(_tutup_dari_json(json.loads(isi)))
+            kolom = {k: np.concatenate([b[k] for b in bagian]) for k in bagian[0]} if bagian else None
+            rows = _frame_transaksi(kolom) if kolom is not None else None
+            id_berikut, jurnal_berikut = meta["id_berikut"], meta["jurnal_berikut"]
+            if rows is not None and len(rows):
+                id_berikut = max(id_berikut, int(rows.index.max()) + 1)
+                jurnal_berikut = max(jurnal_berikut, int(rows["Jurnal"].max()) + 1)
+                if tombstone:
+                    rows = rows[~np.isin(rows.index.to_numpy(), np.concatenate(tombstone))]
+                rows = rows.sort_index(kind="stable")
+            # Akun yang didaftarkan lewat tambah_banyak(akun_baru=...) dan belum ada di bagan awal
+            for kode, nama, tipe, induk in akun:
+                if nama not in self._store.bagan:
+                    self._store.bagan.tambah(kode, nama, tipe, induk)
+            # Tutup buku dulu: TutupBuku membaca daftar periode tertutup saat pertama dipakai
+            for periode, saldo in tutup:
+                self._store.simpan_snapshot(periode, saldo)
+            self._store._pulihkan(rows, id_berikut, jurnal_berikut)
+            self.segmen = max(segmen + [meta["segmen"] - 1, 0]) + 1
+            self.statistik = {"segmen": len(segmen), "baris": 0 if rows is None else len(rows),
+                              "tombstone": int(sum(len(t) for t in tombstone))}
+            r.catat(baris=self.statistik["baris"], bytes=self.bytes_sejak_snapshot)
+
+    # ---------- tulis ----------
+    def mulai(self):
+        """Buka segmen baru dan mulai thread fsync; dipanggil setelah pulihkan()."""
+        with self._kunci:
+            self._buka_segmen(self.segmen)
+        self._thread_fsync.start()
+
+    def _buka_segmen(self, nomor):
+        self._file = open(self._path("log", nomor), "ab", buffering=0)
+        self._file.write(MAGIC_LOG)
+        os.fsync(self._file.fileno())
+        _fsync_folder(self.folder)
+        self.segmen = nomor
+
+    def _tulis(self, jenis, isi):
+        with self._kunci:
+            self._file.write(_KEPALA.pack(jenis, len(isi), zlib.crc32(isi)) + isi)
+            self._kotor = True
+        self.bytes_sejak_snapshot += _KEPALA.size + len(isi)
+        if self.bytes_sejak_snapshot > self.batas_padat and self._job_padat is None:
+            self.padatkan()
+
+    def saat_tambah(self, baru):
+        self._tulis(TAMBAH, kemas_kolom(_kolom_transaksi(baru)))
+
+    def saat_hapus(self, lama):
+        self._tulis(HAPUS, lama.index.to_numpy(dtype=np.int64).tobytes())
+
+    def saat_tutup(self, periode, saldo):
+        self._tulis(TUTUP, json.dumps(_tutup_ke_json(periode, saldo)).encode())
+
+    def saat_akun(self, baris):
+        self._tulis(AKUN, json.dumps([[kode, nama, tipe, induk] for _, kode, nama, tipe, induk in baris]).encode())
+
+    def _loop_fsync(self):
+        while not self._henti.wait(self.jeda_fsync):
+            self.fsync()
+
+    def fsync(self):
+        with self._kunci:
+            if self._kotor and self._file is not None:
+                os.fsync(self._file.fileno())
+                self._kotor = False
+
+    # ---------- pemadatan ----------
+    def padatkan(self, tunggu=False):
+        """Tulis snapshot buku hidup (tanpa tombstone) lalu buang segmen & snapshot lama.
+
+        Segmen dirotasi di bawah kunci buku; snapshot ditulis di thread latar dari frame
+        versi itu, jadi penulis lain tidak menunggu. Hasil: thread job.
+        """
+        with self._store.kunci:
+            if self._job_padat is not None:
+                job = self._job_padat
+            else:
+                with self._kunci:
+                    if self._kotor:
+                        os.fsync(self._file.fileno())
+                        self._kotor = False
+                    self._file.close()
+                    self._buka_segmen(self.segmen + 1)
+                self.bytes_sejak_snapshot = 0
+                keadaan = {
+                    "segmen": self.segmen,
+                    "rows": self._store.frame(),
+                    "id_berikut": self._store._id_berikut,
+                    "jurnal_berikut": self._store._nomor_jurnal_berikut(),
+                    "tutup": [_tutup_ke_json(p, s) for p, s in self._store.baca_snapshot().items()],
+                    "akun": [[kode, nama, tipe, induk] for _, kode, nama, tipe, induk in self._store.bagan.baris()],
+                }
+                job = self._job_padat = threading.Thread(target=self._tulis_snapshot, args=(keadaan,),
+                                                         name="log_buku_padat", daemon=True)
+                job.start()
+        if tunggu:
+            job.join()
+        return job
+
+    def _tulis_snapshot(self, keadaan):
+        try:
+            with rentang("log.padatkan", baris=len(keadaan["rows"])) as r:
+                nomor = keadaan.pop("segmen")
+                rows = keadaan.pop("rows")
+                meta = json.dumps({"segmen": nomor, **keadaan}).encode()
+                isi = struct.pack("<I", len(meta)) + meta + kemas_kolom(_kolom_transaksi(rows))
+                path = self._path("snapshot", nomor)
+                with open(path + ".tmp", "wb") as f:
+                    f.write(MAGIC_SNAPSHOT + struct.pack("<I", zlib.crc32(isi)) + isi)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(path + ".tmp", path)
+                _fsync_folder(self.folder)
+                # Baru setelah snapshot aman di disk, file yang sudah tercakup boleh dihapus
+                for s in self._daftar("snapshot"):
+                    if s < nomor:
+                        os.remove(self._path("snapshot", s))
+                for s in self._daftar("log"):
+                    if s < nomor:
+                        os.remove(self._path("log", s))
+                r.catat(bytes=len(isi))
+        finally:
+            self._job_padat = None
+
+    def akhiri(self):
+        """Hentikan thread fsync, fsync terakhir, lalu tutup file segmen."""
+        job = self._job_padat
+        if job is not None:
+            job.join()
+        self._henti.set()
+        if self._thread_fsync.is_alive():
+            self._thread_fsync.join()
+        self.fsync()
+        with self._kunci:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+def buka_buku_log(folder, bagan=None, jeda_fsync=1.0, batas_padat=BATAS_PADAT):
+    """TransaksiStore yang dipulihkan dari log di `folder`, dengan log terpasang (store.log)."""
+    store = TransaksiStore(bagan=bagan)
+    log = LogBuku(folder, store, jeda_fsync, batas_padat)
+    log.pulihkan()
+    store.log = store.daftarkan(log)
+    log.mulai()
+    atexit.register(log.akhiri)
+    if log.bytes_sejak_snapshot > batas_padat:
+        log.padatkan()
+    return store
@@ -0,0 +1,73 @@
+"""Memo hasil turunan buku (laporan, agregat grafik) per versi buku dengan batas LRU."""
+from collections import OrderedDict
+from functools import wraps
+
+MAKS_MEMO = 64
+_TIDAK_ADA = object()
+
+class MemoBuku:
+    """Cache LRU (kunci -> hasil) yang hanya berlaku untuk satu versi buku.
+
+    Setiap perubahan buku menaikkan store.version dan mengosongkan memo (termasuk
+    tulisan proses lain, lewat store.segarkan()), jadi hasil tidak pernah basi; selama buku tidak berubah, rerun memakai hasil yang sama.
+    Hasil dibagi ke semua pemanggil dan tidak boleh diubah di tempat.
+
+    Memo yang sudah ada dibaca tanpa kunci. Saat meleset, versi dibaca di bawah kunci
+    buku lalu hitung() berjalan di luar kunci, jadi penulis dan pembaca lain tidak
+    menunggu. hitung() hanya boleh memegang kunci sebentar untuk mengambil potret
+    data (salinan atau array yang tidak diubah di tempat). Hasil masuk memo hanya bila
+    versi buku masih sama saat selesai: potret yang diambil di antaranya pasti dari
+    versi itu, jadi (versi, kunci) selalu berisi hasil utuh versi itu.
+    """
+
+    def __init__(self, store, maks=MAKS_MEMO):
+        self._store = store
+        self._data = OrderedDict()
+        self.maks = maks
+        self.kena = 0
+        self.meleset = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def ambil(self, kunci, hitung):
+        self._store.segarkan()
+        versi_kunci = (self._store.version, kunci)
+        hasil = self._data.get(versi_kunci, _TIDAK_ADA)
+        if hasil is not _TIDAK_ADA:
+            try:
+                self._data.move_to_end(versi_kunci)
+            except KeyError:
+                pass    # baru saja dibuang penulis; hasil yang sudah didapat tetap utuh
+            self.kena += 1
+            return hasil
+        with self._store.kunci:
+            versi_kunci = (self._store.version, kunci)
+            hasil = self._data.get(versi_kunci, _TIDAK_ADA)
+            if hasil is not _TIDAK_ADA:
+                self._data.move_to_end(versi_kunci)
+                self.kena += 1
+                return hasil
+            self.meleset += 1
+        hasil = hitung()
+        with self._store.kunci:
+            # Ada tulisan selama menghitung: hasil tetap dikembalikan, tetapi tidak disimpan
+            if self._store.version == versi_kunci[0]:
+                self._data[versi_kunci] = hasil
+                while len(self._data) > self.maks:
+                    self._data.popitem(last=False)
+        return hasil
+
+    def bersihkan(self):
+        self._data.clear()
+
+def dimemo(fungsi):
+    """Dekorator metode pendengar buku (punya self._store): hasil dimemo per argumen.
+
+    Argumen harus hashable (angka, Timestamp, None, tuple).
+    """
+    @wraps(fungsi)
+    def fungsi_dimemo(self, *args, **kwargs):
+        kunci = (fungsi.__qualname__, args, tuple(sorted(kwargs.items())))
+        return self._store.memo.ambil(kunci, lambda: fungsi(self, *args, **kwargs))
+    return fungsi_dimemo
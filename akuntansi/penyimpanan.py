@@ -0,0 +1,845 @@
+"""Penyimpanan transaksi: di memori (TransaksiStore) atau file SQLite (SQLiteStore).
+
+Satu objek penyimpanan bisa dipakai bersama banyak sesi/thread: tulis (tambah,
+hapus, tutup buku) diserialkan lewat store.kunci, sedangkan baca memakai hasil
+yang sudah terbit untuk versi buku saat itu (frame, memo laporan) tanpa kunci.
+"""
+import queue
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .agregat import AgregatTransaksi
+from .bagan_akun import BaganAkun, bagan_bawaan
+from .dasar import KOLOM_TRANSAKSI, ke_ns, normalisasi_transaksi
+from .duplikat import IndeksDuplikat
+from .indeks_teks import IndeksKeterangan, kueri_fts, urai_kueri
+from .instrumentasi import diukur, rentang
+from .jurnal import (TANPA_JURNAL, jurnal_tidak_seimbang, nomor_jurnal_lokal, periksa_seimbang,
+                     petakan_nomor, satukan_tanpa_nomor)
+from .memo import MemoBuku
+from .periode import PartisiPeriode
+from .rentang import IndeksRentang
+from .saldo import MesinSaldo
+from .tutup_buku import TutupBuku
+
+class PenyimpananTransaksi:
+    """Antarmuka bersama penyimpanan transaksi (memori atau SQLite).
+
+    Halaman cukup meminta baris yang dibutuhkan lewat terbaru/per_akun/total;
+    frame() hanya dipakai bila memang perlu seluruh buku. Akun disimpan sebagai
+    ID di self.bagan; transaksi dengan akun yang belum ada di bagan ditolak, kecuali
+    akunnya ikut diberikan lewat tambah_banyak(..., akun_baru=...).
+    """
+
+    def __init__(self, bagan=None):
+        self.bagan = bagan_bawaan() if bagan is None else bagan
+        self._frame = None
+        self.version = 0
+        self.kunci = threading.RLock()
+        self._pendengar = []
+        self.memo = MemoBuku(self)
+        self.saldo = self.daftarkan(MesinSaldo(self))
+        self.agregat = self.daftarkan(AgregatTransaksi(self))
+        self.duplikat = self.daftarkan(IndeksDuplikat(self))
+        self.periode = self.daftarkan(PartisiPeriode(self))
+        self.teks = self.daftarkan(IndeksKeterangan(self))
+        self.rentang = self.daftarkan(IndeksRentang(self))
+        self.tutup_buku = TutupBuku(self)
+        self._snapshot = {}
+
+    def daftarkan(self, pendengar):
+        # Pendengar menerima saat_tambah(baru) dan saat_hapus(lama) setiap ada perubahan
+        self._pendengar.append(pendengar)
+        return pendengar
+
+    def segarkan(self):
+        # Penyimpanan yang bisa ditulis proses lain memuat ulang turunannya di sini;
+        # dipanggil sebelum frame, memo dan isi pendengar dipakai
+        pass
+
+    def _berubah(self):
+        # Semua turunan buku (frame, memo laporan) tidak berlaku lagi setelah versi naik
+        self.version += 1
+        self._frame = None
+        self.memo.bersihkan()
+
+    def _kabari_tambah(self, baru):
+        self._berubah()
+        for pendengar in self._pendengar:
+            pendengar.saat_tambah(baru)
+
+    def _kabari_hapus(self, lama):
+        self._berubah()
+        for pendengar in self._pendengar:
+            pendengar.saat_hapus(lama)
+
+    def frame(self):
+        # DataFrame dipakai bersama semua halaman sampai ada perubahan. Frame yang sudah
+        # terbit tidak pernah diubah (penulis menambah di luar view atau menyalin array),
+        # jadi dibaca tanpa kunci; paling buruk pembaca mendapat versi sebelum tulis berjalan
+        self.segarkan()
+        df = self._frame
+        if df is not None:
+            return df
+        with self.kunci:
+            if self._frame is None:
+                with rentang("buku.frame") as r:
+                    self._frame = self._muat_semua()
+                    r.catat(baris=len(self._frame))
+            return self._frame
+
+    def terbaru(self, n):
+        return self.frame().tail(n)
+
+    def per_akun(self, akun):
+        df = self.frame()
+        return df[df["Akun"] == akun]
+
+    def daftar_akun(self):
+        return list(self.frame()["Akun"].unique())
+
+    def baca_snapshot(self):
+        return dict(self._snapshot)
+
+    def simpan_snapshot(self, periode, saldo):
+        self._snapshot[periode] = dict(saldo)
+        for pendengar in self._pendengar:
+            saat_tutup = getattr(pendengar, "saat_tutup", None)
+            if saat_tutup is not None:
+                saat_tutup(periode, saldo)
+
+    def per_rentang(self, mulai=None, akhir=None):
+        # Baris dengan mulai <= Tanggal < akhir, urut (Tanggal, ID)
+        df = self.frame()
+        tanggal = df["Tanggal"].to_numpy(dtype="datetime64[ns]")
+        cocok = np.ones(len(df), dtype=bool)
+        if mulai is not None:
+            cocok &= tanggal >= pd.Timestamp(mulai).to_datetime64()
+        if akhir is not None:
+            cocok &= tanggal < pd.Timestamp(akhir).to_datetime64()
+        return df[cocok].sort_values("Tanggal", kind="stable")
+
+    def id_tanggal(self):
+        df = self.frame()
+        return df.index.to_numpy(dtype=np.int64), df["Tanggal"].to_numpy(dtype="datetime64[ns]")
+
+    def total(self):
+        return self.agregat.total()
+
+    def _siapkan_jurnal(self, df, tanpa_jurnal=False):
+        # Nomor jurnal di df hanya berlaku lokal: diperiksa seimbang dulu, lalu diberi nomor baru di buku.
+        # Baris tanpa nomor jurnal dihitung sebagai satu jurnal, jadi juga harus seimbang;
+        # tanpa_jurnal=True: baris itu disimpan sebagai baris lama (nomor 0) tanpa pemeriksaan
+        lokal = nomor_jurnal_lokal(df)
+        if not tanpa_jurnal:
+            lokal = satukan_tanpa_nomor(lokal)
+        periksa_seimbang(lokal, df["Debit"], df["Kredit"])
+        nomor, self._jurnal_berikut = petakan_nomor(lokal, self._nomor_jurnal_berikut())
+        return nomor
+
+    def _siapkan_akun(self, akun, akun_baru):
+        # ID akun batch dan baris bagan untuk akun_baru [(kode, nama, tipe, kode induk), ...].
+        # Akun baru diperiksa pada salinan bagan; bagan asli baru diubah setelah batch tersimpan
+        bagan = self.bagan
+        if akun_baru:
+            bagan = bagan.salin()
+            for kode, nama, tipe, induk in akun_baru:
+                bagan.tambah(kode, nama, tipe, induk)
+        return bagan.id_akun(akun), bagan.baris(len(self.bagan))
+
+    def _daftarkan_akun(self, baris):
+        for _, kode, nama, tipe, induk in baris:
+            self.bagan.tambah(kode, nama, tipe, induk)
+        for pendengar in self._pendengar:
+            saat_akun = getattr(pendengar, "saat_akun", None)
+            if saat_akun is not None and baris:
+                saat_akun(baris)
+
+    def tambah_jurnal(self, tgl, ket, baris):
+        """Satu jurnal berisi baris [(akun, debit, kredit), ...]; ditolak bila total Debit != Kredit."""
+        df = pd.DataFrame(list(baris), columns=["Akun", "Debit", "Kredit"])
+        df = df.assign(Tanggal=pd.Timestamp(tgl), Keterangan=ket, Jurnal=1)
+        return self.tambah_banyak(df[KOLOM_TRANSAKSI + ["Jurnal"]])
+
+    def jurnal_tidak_seimbang(self):
+        """Jurnal di buku yang total Debit != Kredit (baris tanpa jurnal tidak ikut)."""
+        def hitung():
+            df = self.frame()
+            return jurnal_tidak_seimbang(df["Jurnal"], df["Debit"], df["Kredit"])
+        return self.memo.ambil("jurnal_tidak_seimbang", hitung)
+
+    def baris_tanpa_jurnal(self):
+        return int((self.frame()["Jurnal"] == TANPA_JURNAL).sum())
+
+    def cari(self, akun=None, mulai=None, akhir=None, nominal_min=None, nominal_maks=None, kata=None,
+             urut="Tanggal", turun=False, offset=0, batas=50, teks=None):
+        """Satu halaman transaksi hasil filter dan urut: (jumlah cocok, DataFrame halaman).
+
+        Tanggal: mulai <= Tanggal < akhir. Nominal = Debit + Kredit. kata = potongan
+        teks Keterangan; teks = kueri indeks teks penuh (lihat indeks_teks). Baris
+        dengan nilai urut sama selalu diurutkan menurut ID, jadi posisi halaman stabil.
+        """
+        kunci = ("cari", tuple(akun or ()), mulai, akhir, nominal_min, nominal_maks, kata, urut, turun, teks)
+
+        def urutan_cocok():
+            # Frame ikut disimpan bersama posisinya supaya keduanya selalu dari versi yang sama
+            df = self.frame()
+            ids_teks = self.teks.cocok(teks) if teks else None
+            # Dengan kueri teks, filter lain hanya memeriksa baris hasil indeks
+            posisi = None if ids_teks is None else np.searchsorted(df.index.to_numpy(), ids_teks)
+            pilih = (lambda kolom: df[kolom]) if posisi is None else (lambda kolom: df[kolom].iloc[posisi])
+            cocok = np.ones(len(df) if posisi is None else len(posisi), dtype=bool)
+            if akun:
+                cocok &= pilih("Akun").isin(akun).to_numpy()
+            if mulai is not None or akhir is not None:
+                tanggal = pilih("Tanggal").to_numpy(dtype="datetime64[ns]")
+                if mulai is not None:
+                    cocok &= tanggal >= pd.Timestamp(mulai).to_datetime64()
+                if akhir is not None:
+                    cocok &= tanggal < pd.Timestamp(akhir).to_datetime64()
+            if nominal_min is not None or nominal_maks is not None:
+                nominal = pilih("Debit").to_numpy() + pilih("Kredit").to_numpy()
+                if nominal_min is not None:
+                    cocok &= nominal >= nominal_min
+                if nominal_maks is not None:
+                    cocok &= nominal <= nominal_maks
+            posisi = np.flatnonzero(cocok) if posisi is None else posisi[cocok]
+            if kata:
+                ket = df["Keterangan"].iloc[posisi]
+                posisi = posisi[ket.str.contains(kata, case=False, regex=False, na=False).to_numpy(dtype=bool)]
+            ids = df.index.to_numpy()[posisi]
+            if urut == "ID":
+                nilai = ids
+            elif urut == "Akun":
+                # Urut kode akun di bagan
+                nilai = self.bagan.kode[self.bagan.id_akun(df["Akun"].iloc[posisi])]
+            else:
+                nilai = df[urut].to_numpy()[posisi]
+            urutan = np.lexsort((ids, nilai))
+            return df, posisi[urutan[::-1] if turun else urutan]
+
+        # Urutan hasil filter dipakai ulang saat hanya halaman (offset) yang berubah
+        df, posisi = self.memo.ambil(kunci, urutan_cocok)
+        return len(posisi), df.iloc[posisi[offset:offset + batas]]
+
+    def ringkasan_bulanan(self):
+        df = self.frame()
+        tanggal = df["Tanggal"]
+        return df.groupby([tanggal.dt.year.rename("Tahun"), tanggal.dt.month.rename("Bulan"), "Akun"], observed=True).agg(
+            Debit=("Debit", "sum"), Kredit=("Kredit", "sum"), Jumlah=("Debit", "size")).reset_index()
+
+    def baris_akun_waktu(self):
+        # (Akun = ID bagan, Tanggal, Debit, Kredit, Jumlah) per transaksi; IndeksRentang yang menjumlahkan per waktu
+        df = self.frame()
+        return pd.DataFrame({"Akun": self.bagan.id_akun(df["Akun"]), "Tanggal": df["Tanggal"].to_numpy(),
+                             "Debit": df["Debit"].to_numpy(), "Kredit": df["Kredit"].to_numpy(), "Jumlah": 1})
+
+class TransaksiStore(PenyimpananTransaksi):
+    """Buku transaksi kolumnar: Tanggal datetime64, ID akun bagan int32, Debit/Kredit int64.
+
+    Setiap baris punya ID tetap (naik terus) yang dipakai sebagai index DataFrame.
+    Kolom Akun di frame() berupa kategori dengan kode = ID akun bagan.
+    """
+
+    def __init__(self, kapasitas=1024, bagan=None):
+        super().__init__(bagan)
+        self._n = 0
+        self._id_berikut = 0
+        self._id = np.empty(kapasitas, dtype=np.int64)
+        self._tanggal = np.empty(kapasitas, dtype="datetime64[ns]")
+        self._kode = np.empty(kapasitas, dtype=np.int32)
+        self._ket = np.empty(kapasitas, dtype=object)
+        self._debit = np.empty(kapasitas, dtype=np.int64)
+        self._kredit = np.empty(kapasitas, dtype=np.int64)
+        self._jurnal = np.empty(kapasitas, dtype=np.int64)
+        self._jurnal_berikut = 1
+        self.log = None    # LogBuku bila dibuka lewat buka_buku_log()
+
+    def __len__(self):
+        return self._n
+
+    def _kolom(self):
+        return ["_id", "_tanggal", "_kode", "_ket", "_debit", "_kredit", "_jurnal"]
+
+    def _nomor_jurnal_berikut(self):
+        return self._jurnal_berikut
+
+    def _pastikan_kapasitas(self, tambahan):
+        perlu = self._n + tambahan
+        kapasitas = len(self._id)
+        if perlu <= kapasitas:
+            return
+        while kapasitas < perlu:
+            kapasitas *= 2
+        # Selalu alokasi array baru supaya view lama tetap utuh
+        for nama in self._kolom():
+            lama = getattr(self, nama)
+            baru = np.empty(kapasitas, dtype=lama.dtype)
+            baru[:self._n] = lama[:self._n]
+            setattr(self, nama, baru)
+
+    @diukur("buku.tambah_banyak")
+    def tambah_banyak(self, df, tanpa_jurnal=False, akun_baru=()):
+        """Tambah batch transaksi; tanpa_jurnal=True menyimpan baris tanpa nomor jurnal sebagai baris lama.
+
+        akun_baru: [(kode, nama, tipe, kode induk), ...] yang didaftarkan ke bagan bersama batch ini.
+        """
+        with self.kunci:
+            m = len(df)
+            if m == 0:
+                return np.empty(0, dtype=np.int64)
+            self.tutup_buku.periksa(df["Tanggal"])
+            kode, baris_akun = self._siapkan_akun(df["Akun"], akun_baru)
+            jurnal = self._siapkan_jurnal(df, tanpa_jurnal)
+            self._pastikan_kapasitas(m)
+            awal, akhir = self._n, self._n + m
+            ids = np.arange(self._id_berikut, self._id_berikut + m, dtype=np.int64)
+            self._id[awal:akhir] = ids
+            self._tanggal[awal:akhir] = pd.to_datetime(df["Tanggal"]).to_numpy(dtype="datetime64[ns]")
+            self._kode[awal:akhir] = kode
+            self._ket[awal:akhir] = np.asarray(df["Keterangan"], dtype=object)
+            self._debit[awal:akhir] = np.asarray(df["Debit"], dtype=np.int64)
+            self._kredit[awal:akhir] = np.asarray(df["Kredit"], dtype=np.int64)
+            self._jurnal[awal:akhir] = jurnal
+            self._n = akhir
+            self._id_berikut += m
+            self._daftarkan_akun(baris_akun)
+            self._kabari_tambah(self._ambil(slice(awal, akhir)))
+            return ids
+
+    def _pulihkan(self, rows, id_berikut, jurnal_berikut):
+        # Isi buku kosong dari log apa adanya: ID dan nomor jurnal tidak diberi ulang
+        # dan tanggal tidak diperiksa terhadap tutup buku
+        with self.kunci:
+            if self._n:
+                raise ValueError("Buku harus kosong sebelum dipulihkan")
+            self._id_berikut = id_berikut
+            self._jurnal_berikut = jurnal_berikut
+            if rows is None or len(rows) == 0:
+                return
+            m = len(rows)
+            self._pastikan_kapasitas(m)
+            self._id[:m] = rows.index.to_numpy(dtype=np.int64)
+            self._tanggal[:m] = rows["Tanggal"].to_numpy(dtype="datetime64[ns]")
+            # Log lama tidak mencatat akun baru: nama yang belum ada didaftarkan seperti dulu
+            self._kode[:m] = self.bagan.id_akun(rows["Akun"], daftarkan=True)
+            self._ket[:m] = np.asarray(rows["Keterangan"], dtype=object)
+            self._debit[:m] = rows["Debit"].to_numpy(dtype=np.int64)
+            self._kredit[:m] = rows["Kredit"].to_numpy(dtype=np.int64)
+            self._jurnal[:m] = rows["Jurnal"].to_numpy(dtype=np.int64)
+            self._n = m
+            self._kabari_tambah(self._ambil(slice(0, m)))
+
+    def posisi(self, id_transaksi):
+        # ID selalu naik sesuai urutan simpan, jadi cukup binary search
+        pos = int(np.searchsorted(self._id[:self._n], id_transaksi))
+        if pos >= self._n or self._id[pos] != id_transaksi:
+            raise KeyError(id_transaksi)
+        return pos
+
+    def hapus(self, id_transaksi):
+        with self.kunci:
+            pos = self.posisi(id_transaksi)
+            if self._jurnal[pos] != TANPA_JURNAL:
+                raise ValueError(f"Transaksi {id_transaksi} bagian dari jurnal {self._jurnal[pos]}; hapus seluruh jurnal")
+            self._hapus_posisi(np.array([pos]))
+
+    def nomor_jurnal(self, id_transaksi):
+        with self.kunci:
+            return int(self._jurnal[self.posisi(id_transaksi)])
+
+    def hapus_jurnal(self, nomor):
+        with self.kunci:
+            posisi = np.flatnonzero(self._jurnal[:self._n] == nomor)
+            if nomor == TANPA_JURNAL or len(posisi) == 0:
+                raise KeyError(nomor)
+            self._hapus_posisi(posisi)
+
+    def _hapus_posisi(self, posisi):
+        dihapus = self._ambil(posisi)
+        self.tutup_buku.periksa(dihapus["Tanggal"])
+        # Salin ke array baru (copy-on-write) supaya frame yang sudah dibagikan tidak berubah
+        sisa = np.ones(self._n, dtype=bool)
+        sisa[posisi] = False
+        m = self._n - len(posisi)
+        for nama in self._kolom():
+            lama = getattr(self, nama)
+            baru = np.empty(len(lama), dtype=lama.dtype)
+            baru[:m] = lama[:self._n][sisa]
+            setattr(self, nama, baru)
+        self._n = m
+        self._kabari_hapus(dihapus)
+
+    def baris_periode(self, mulai, akhir, ids):
+        # Partisi periode sudah tahu ID-nya; cukup binary search posisi
+        return self._ambil(np.searchsorted(self._id[:self._n], ids))
+
+    def _ambil(self, posisi):
+        # Salinan kecil beberapa baris, untuk dikirim ke pendengar
+        return pd.DataFrame({
+            "Tanggal": self._tanggal[posisi],
+            "Akun": self.bagan.nama[self._kode[posisi]],
+            "Keterangan": self._ket[posisi],
+            "Debit": self._debit[posisi],
+            "Kredit": self._kredit[posisi],
+            "Jurnal": self._jurnal[posisi],
+        }, index=pd.Index(self._id[posisi]))
+
+    def _muat_semua(self):
+        # View tanpa salin data di atas array kolom
+        n = self._n
+        index = pd.Index(self._id[:n], copy=False)
+        return pd.DataFrame({
+            "Tanggal": self._tanggal[:n],
+            "Akun": pd.Categorical.from_codes(self._kode[:n], categories=pd.Index(self.bagan.nama, dtype=object)),
+            "Keterangan": pd.Series(self._ket[:n], index=index, dtype=object, copy=False),
+            "Debit": self._debit[:n],
+            "Kredit": self._kredit[:n],
+            "Jurnal": self._jurnal[:n],
+        }, index=index, copy=False)
+
+# ===========================
+# Penyimpanan transaksi di file SQLite
+# ===========================
+TABEL_TRANSAKSI = """
+CREATE TABLE IF NOT EXISTS {nama} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tanggal INTEGER NOT NULL,
+    akun_id INTEGER NOT NULL REFERENCES akun (id),
+    keterangan TEXT NOT NULL DEFAULT '',
+    debit INTEGER NOT NULL DEFAULT 0,
+    kredit INTEGER NOT NULL DEFAULT 0,
+    jurnal INTEGER NOT NULL DEFAULT 0
+);
+"""
+# Indeks dibuat sesudah migrasi skema lama (kolom akun TEXT, tanpa kolom jurnal)
+INDEKS_SQLITE = """
+CREATE INDEX IF NOT EXISTS idx_transaksi_akun_tanggal ON transaksi (akun_id, tanggal);
+CREATE INDEX IF NOT EXISTS idx_transaksi_tanggal ON transaksi (tanggal);
+CREATE INDEX IF NOT EXISTS idx_transaksi_jurnal ON transaksi (jurnal);
+"""
+# Indeks teks penuh Keterangan (FTS5, isi diambil dari tabel transaksi). Baris baru diindeks
+# _sisipkan sekali per tulis (INSERT ... SELECT, jauh lebih cepat dari trigger per baris);
+# hapus/ubah dijaga trigger. Tokenizer unicode61 tanpa buang diakritik = indeks_teks.token_teks
+INDEKS_TEKS_SQLITE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS transaksi_teks USING fts5(
+    keterangan, content='transaksi', content_rowid='id', tokenize='unicode61 remove_diacritics 0'
+);
+CREATE TRIGGER IF NOT EXISTS transaksi_teks_hapus AFTER DELETE ON transaksi BEGIN
+    INSERT INTO transaksi_teks (transaksi_teks, rowid, keterangan) VALUES ('delete', old.id, old.keterangan);
+END;
+CREATE TRIGGER IF NOT EXISTS transaksi_teks_ubah AFTER UPDATE OF keterangan ON transaksi BEGIN
+    INSERT INTO transaksi_teks (transaksi_teks, rowid, keterangan) VALUES ('delete', old.id, old.keterangan);
+    INSERT INTO transaksi_teks (rowid, keterangan) VALUES (new.id, new.keterangan);
+END;
+"""
+SKEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS akun (
+    id INTEGER PRIMARY KEY,
+    kode INTEGER NOT NULL UNIQUE,
+    nama TEXT NOT NULL UNIQUE,
+    tipe TEXT NOT NULL,
+    induk INTEGER
+);
+""" + TABEL_TRANSAKSI.format(nama="transaksi") + """
+CREATE TABLE IF NOT EXISTS periode_tutup (
+    tahun INTEGER NOT NULL,
+    bulan INTEGER NOT NULL,
+    dibuat INTEGER NOT NULL,
+    PRIMARY KEY (tahun, bulan)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    kunci TEXT PRIMARY KEY,
+    nilai INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS saldo_tutup (
+    tahun INTEGER NOT NULL,
+    bulan INTEGER NOT NULL,
+    akun TEXT NOT NULL,
+    debit INTEGER NOT NULL,
+    kredit INTEGER NOT NULL,
+    jumlah INTEGER NOT NULL,
+    PRIMARY KEY (tahun, bulan, akun)
+);
+"""
+
+class SQLiteStore(PenyimpananTransaksi):
+    """Buku transaksi persisten di file SQLite (mode WAL).
+
+    Tanggal disimpan sebagai integer nanodetik supaya urut dan cepat dikonversi.
+    Bagan akun disimpan di tabel akun; transaksi hanya menyimpan akun_id.
+    Query baca memakai kolam koneksi baca terpisah dari koneksi tulis; dengan WAL
+    setiap query melihat snapshot data yang sudah di-commit, jadi tidak perlu kunci.
+    Tulisan proses lain ke file yang sama terlihat lewat PRAGMA data_version; saat
+    berubah, jumlah baris, bagan dan semua turunan dimuat ulang (lihat segarkan).
+    `bagan` mengisi database baru; untuk database lama, akun di `bagan` yang
+    belum ada ikut ditambahkan.
+    """
+
+    def __init__(self, path, ukuran_batch=10000, bagan=None):
+        super().__init__()
+        self.path = path
+        self.ukuran_batch = ukuran_batch
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._kolam_baca = queue.SimpleQueue()   # koneksi baca yang sedang menganggur
+        self._conn.executescript(SKEMA_SQLITE)
+        kolom = {r[1] for r in self._conn.execute("PRAGMA table_info(transaksi)")}
+        # Database dari versi sebelum jurnal: tambah kolom, baris lama bernomor jurnal 0
+        if "jurnal" not in kolom:
+            self._conn.execute("ALTER TABLE transaksi ADD COLUMN jurnal INTEGER NOT NULL DEFAULT 0")
+        self._muat_bagan(bagan)
+        if "akun" in kolom:
+            self._migrasi_akun_id()
+        self._conn.executescript(INDEKS_SQLITE)
+        self._fts = self._buat_indeks_teks()
+        # Database dari versi sebelum penghitung jurnal: mulai dari nomor terbesar yang masih ada
+        self._conn.execute("INSERT OR IGNORE INTO meta (kunci, nilai) "
+                           "SELECT 'jurnal_berikut', COALESCE(MAX(jurnal), 0) + 1 FROM transaksi")
+        self._jurnal_berikut = 1
+        self._n = self._conn.execute("SELECT COUNT(*) FROM transaksi").fetchone()[0]
+        self._versi_data = self._data_version()
+
+    def _data_version(self):
+        # Hanya berubah oleh commit koneksi lain, jadi tulisan store ini sendiri tidak terhitung
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def segarkan(self):
+        if self._data_version() == self._versi_data:
+            return
+        with self.kunci:
+            versi = self._data_version()
+            if versi != self._versi_data:
+                self._muat_ulang()
+                self._versi_data = versi
+
+    def _muat_ulang(self):
+        # Proses lain menulis file ini: akun barunya masuk bagan (ID = urutan di tabel akun),
+        # lalu pendengar dan snapshot tutup buku dikosongkan di tempat dan dimuat malas lagi.
+        # Objeknya tidak diganti supaya rujukan yang sudah dipegang halaman tetap berlaku
+        for _, kode, nama, tipe, induk in self._conn.execute(
+                "SELECT id, kode, nama, tipe, induk FROM akun WHERE id >= ? ORDER BY id", (len(self.bagan),)).fetchall():
+            self.bagan.tambah(kode, nama, tipe, induk)
+        self._akun_tersimpan = len(self.bagan)
+        self._n = self._conn.execute("SELECT COUNT(*) FROM transaksi").fetchone()[0]
+        for turunan in (self.saldo, self.agregat, self.duplikat, self.periode, self.teks, self.rentang,
+                        self.tutup_buku):
+            turunan.__init__(self)
+        self._berubah()
+
+    def _muat_bagan(self, bagan):
+        tersimpan = self._conn.execute("SELECT kode, nama, tipe, induk FROM akun ORDER BY id").fetchall()
+        if tersimpan:
+            self.bagan = BaganAkun(tersimpan)
+            for _, kode, nama, tipe, induk in (bagan.baris() if bagan is not None else ()):
+                if nama not in self.bagan:
+                    self.bagan.tambah(kode, nama, tipe, induk)
+        elif bagan is not None:
+            self.bagan = bagan
+        self._akun_tersimpan = len(tersimpan)
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._simpan_akun_baru()
+        self._conn.execute("COMMIT")
+
+    def _simpan_akun_baru(self):
+        # Dipanggil di dalam transaksi tulis: akun yang baru didaftarkan ke bagan ikut disimpan
+        baru = self.bagan.baris(self._akun_tersimpan)
+        if baru:
+            self._conn.executemany("INSERT INTO akun (id, kode, nama, tipe, induk) VALUES (?, ?, ?, ?, ?)", baru)
+            self._akun_tersimpan = len(self.bagan)
+
+    def _migrasi_akun_id(self):
+        # Skema lama menyimpan nama akun per baris: salin ulang tabel dengan akun_id
+        for (nama,) in self._conn.execute("SELECT DISTINCT akun FROM transaksi").fetchall():
+            self.bagan.id_dari_nama(nama, daftarkan=True)
+        seq = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'transaksi'").fetchone()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._simpan_akun_baru()
+            self._conn.execute("DROP INDEX IF EXISTS idx_transaksi_akun_tanggal")
+            self._conn.execute(TABEL_TRANSAKSI.format(nama="transaksi_baru"))
+            self._conn.execute(
+                "INSERT INTO transaksi_baru (id, tanggal, akun_id, keterangan, debit, kredit, jurnal) "
+                "SELECT t.id, t.tanggal, a.id, t.keterangan, t.debit, t.kredit, t.jurnal "
+                "FROM transaksi t JOIN akun a ON a.nama = t.akun")
+            self._conn.execute("DROP TABLE transaksi")
+            self._conn.execute("ALTER TABLE transaksi_baru RENAME TO transaksi")
+            # ID yang pernah dihapus tetap tidak dipakai ulang
+            if seq:
+                self._conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'transaksi'", seq)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _buat_indeks_teks(self):
+        # Database lama: indeks teks diisi sekali dari baris yang sudah ada.
+        # SQLite tanpa FTS5: kueri teks jatuh ke pencarian potongan teks biasa
+        ada = self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'transaksi_teks'").fetchone()
+        try:
+            self._conn.executescript(INDEKS_TEKS_SQLITE)
+        except sqlite3.OperationalError:
+            return False
+        if not ada:
+            self._conn.execute("INSERT INTO transaksi_teks (transaksi_teks) VALUES ('rebuild')")
+        return True
+
+    def __len__(self):
+        self.segarkan()
+        return self._n
+
+    def _nomor_jurnal_berikut(self):
+        # Penghitung di tabel meta hanya naik, jadi nomor jurnal yang sudah dihapus tidak dipakai ulang
+        tersimpan = self._conn.execute("SELECT nilai FROM meta WHERE kunci = 'jurnal_berikut'").fetchone()[0]
+        return max(self._jurnal_berikut, tersimpan)
+
+    def _koneksi_baca(self):
+        try:
+            return self._kolam_baca.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA query_only=ON")
+            return conn
+
+    def _query(self, sql, params=()):
+        return self._query_banyak((sql, params))[0]
+
+    def _query_banyak(self, *kueri):
+        # Beberapa query dalam satu transaksi baca: semuanya melihat snapshot WAL yang sama
+        if self.path == ":memory:":
+            # Database memori hanya terlihat dari koneksi tulis
+            with self.kunci:
+                return [self._conn.execute(sql, params).fetchall() for sql, params in kueri]
+        conn = self._koneksi_baca()
+        try:
+            if len(kueri) == 1:
+                return [conn.execute(*kueri[0]).fetchall()]
+            conn.execute("BEGIN")
+            try:
+                return [conn.execute(sql, params).fetchall() for sql, params in kueri]
+            finally:
+                conn.execute("COMMIT")
+        finally:
+            self._kolam_baca.put(conn)
+
+    def _ke_frame(self, baris):
+        data = pd.DataFrame.from_records(baris, columns=["ID"] + KOLOM_TRANSAKSI + ["Jurnal"])
+        data["Tanggal"] = pd.to_datetime(data["Tanggal"].astype("int64"), unit="ns")
+        data["Akun"] = pd.Categorical.from_codes(data["Akun"].to_numpy(dtype=np.int32),
+                                                 categories=pd.Index(self.bagan.nama, dtype=object))
+        data["Keterangan"] = data["Keterangan"].astype(object)
+        data["Debit"] = data["Debit"].astype("int64")
+        data["Kredit"] = data["Kredit"].astype("int64")
+        data["Jurnal"] = data["Jurnal"].astype("int64")
+        return data.set_index("ID").rename_axis(None)
+
+    _SELECT = "SELECT id, tanggal, akun_id, keterangan, debit, kredit, jurnal FROM transaksi "
+
+    def _select(self, sql_tambahan="", params=()):
+        self.segarkan()     # akun_id dari proses lain harus sudah ada di bagan
+        return self._ke_frame(self._query(self._SELECT + sql_tambahan, params))
+
+    def _muat_semua(self):
+        return self._select("ORDER BY id")
+
+    def terbaru(self, n):
+        return self._select("ORDER BY id DESC LIMIT ?", (n,)).iloc[::-1]
+
+    def per_akun(self, akun):
+        return self._select("WHERE akun_id = ? ORDER BY tanggal, id", (self.bagan.id_dari_nama(akun, daftarkan=False),))
+
+    def daftar_akun(self):
+        ids = [r[0] for r in self._query("SELECT akun_id FROM transaksi GROUP BY akun_id ORDER BY MIN(id)")]
+        return self.bagan.nama[ids].tolist()
+
+    def baca_snapshot(self):
+        snapshot = {(tahun, bulan): {} for tahun, bulan in self._query("SELECT tahun, bulan FROM periode_tutup")}
+        for tahun, bulan, akun, debit, kredit, jumlah in self._query(
+                "SELECT tahun, bulan, akun, debit, kredit, jumlah FROM saldo_tutup"):
+            snapshot[(tahun, bulan)][akun] = (debit, kredit, jumlah)
+        return snapshot
+
+    def simpan_snapshot(self, periode, saldo):
+        with self.kunci:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("INSERT INTO periode_tutup (tahun, bulan, dibuat) VALUES (?, ?, ?)",
+                                   (*periode, int(time.time())))
+                self._conn.executemany(
+                    "INSERT INTO saldo_tutup (tahun, bulan, akun, debit, kredit, jumlah) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(*periode, akun, *nilai) for akun, nilai in saldo.items()])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def per_rentang(self, mulai=None, akhir=None):
+        syarat, params = [], []
+        if mulai is not None:
+            syarat.append("tanggal >= ?")
+            params.append(ke_ns(mulai))
+        if akhir is not None:
+            syarat.append("tanggal < ?")
+            params.append(ke_ns(akhir))
+        where = ("WHERE " + " AND ".join(syarat)) if syarat else ""
+        return self._select(f"{where} ORDER BY tanggal, id", params)
+
+    def id_tanggal(self):
+        baris = self._query("SELECT id, tanggal FROM transaksi ORDER BY id")
+        data = np.array(baris, dtype=np.int64).reshape(-1, 2)
+        return data[:, 0].copy(), data[:, 1].copy().view("datetime64[ns]")
+
+    def baris_periode(self, mulai, akhir, ids):
+        # Rentang tanggal satu periode lewat indeks tanggal
+        return self._select("WHERE tanggal >= ? AND tanggal < ? ORDER BY id", (ke_ns(mulai), ke_ns(akhir)))
+
+    def cari(self, akun=None, mulai=None, akhir=None, nominal_min=None, nominal_maks=None, kata=None,
+             urut="Tanggal", turun=False, offset=0, batas=50, teks=None):
+        # Filter, urut dan LIMIT/OFFSET dikerjakan SQLite; hanya satu halaman yang dibaca
+        syarat, params = [], []
+        if akun:
+            syarat.append(f"akun_id IN ({', '.join('?' * len(akun))})")
+            params.extend(self.bagan.id_dari_nama(a, daftarkan=False) for a in akun)
+        if mulai is not None:
+            syarat.append("tanggal >= ?")
+            params.append(pd.Timestamp(mulai).value)
+        if akhir is not None:
+            syarat.append("tanggal < ?")
+            params.append(pd.Timestamp(akhir).value)
+        if nominal_min is not None:
+            syarat.append("debit + kredit >= ?")
+            params.append(int(nominal_min))
+        if nominal_maks is not None:
+            syarat.append("debit + kredit <= ?")
+            params.append(int(nominal_maks))
+        if kata:
+            syarat.append("instr(lower(keterangan), ?) > 0")
+            params.append(kata.lower())
+        kueri = urai_kueri(teks)
+        if kueri and self._fts:
+            syarat.append("id IN (SELECT rowid FROM transaksi_teks WHERE transaksi_teks MATCH ?)")
+            params.append(kueri_fts(kueri))
+        for token, _ in (kueri if not self._fts else ()):
+            syarat.append("instr(lower(keterangan), ?) > 0")
+            params.append(" ".join(token))
+        where = ("WHERE " + " AND ".join(syarat)) if syarat else ""
+        arah = "DESC" if turun else "ASC"
+        kolom = {"Tanggal": "tanggal", "Akun": "(SELECT kode FROM akun WHERE akun.id = akun_id)", "Debit": "debit",
+                 "Kredit": "kredit", "ID": "id"}[urut]
+        urutan = f"ORDER BY {kolom} {arah}" + (f", id {arah}" if kolom != "id" else "")
+        # Jumlah dan halaman dari snapshot yang sama tanpa kunci buku: penulis tidak ditunggu
+        jumlah, halaman = self._query_banyak(
+            (f"SELECT COUNT(*) FROM transaksi {where}", params),
+            (f"{self._SELECT}{where} {urutan} LIMIT ? OFFSET ?", params + [int(batas), int(offset)]))
+        return jumlah[0][0], self._ke_frame(halaman)
+
+    def ringkasan_bulanan(self):
+        detik = "tanggal / 1000000000, 'unixepoch'"
+        data = pd.DataFrame(self._query(
+            f"SELECT CAST(strftime('%Y', {detik}) AS INTEGER), CAST(strftime('%m', {detik}) AS INTEGER), "
+            "akun_id, SUM(debit), SUM(kredit), COUNT(*) FROM transaksi GROUP BY 1, 2, 3"),
+            columns=["Tahun", "Bulan", "Akun", "Debit", "Kredit", "Jumlah"])
+        data["Akun"] = self.bagan.nama[data["Akun"].to_numpy(dtype=np.int64)]
+        return data
+
+    def baris_akun_waktu(self):
+        # Tanpa GROUP BY: di SQLite 2x lebih lambat daripada menjumlahkan di IndeksRentang
+        data = np.array(self._query("SELECT akun_id, tanggal, debit, kredit, 1 FROM transaksi"),
+                        dtype=np.int64).reshape(-1, 5)
+        return pd.DataFrame({"Akun": data[:, 0], "Tanggal": data[:, 1].view("datetime64[ns]"), "Debit": data[:, 2],
+                             "Kredit": data[:, 3], "Jumlah": data[:, 4]})
+
+    def _sisipkan(self, baris, baris_akun=()):
+        # Satu transaksi tulis, dikirim per batch supaya memori tetap kecil; akun baru ikut transaksi yang sama
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            if baris_akun:
+                self._conn.executemany("INSERT INTO akun (id, kode, nama, tipe, induk) VALUES (?, ?, ?, ?, ?)",
+                                       baris_akun)
+            seq = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'transaksi'").fetchone()
+            awal = (seq[0] if seq else 0) + 1
+            for i in range(0, len(baris), self.ukuran_batch):
+                self._conn.executemany(
+                    "INSERT INTO transaksi (tanggal, akun_id, keterangan, debit, kredit, jurnal) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    baris[i:i + self.ukuran_batch])
+            if self._fts:
+                self._conn.execute("INSERT INTO transaksi_teks (rowid, keterangan) "
+                                   "SELECT id, keterangan FROM transaksi WHERE id >= ?", (awal,))
+            self._conn.execute("UPDATE meta SET nilai = MAX(nilai, ?) WHERE kunci = 'jurnal_berikut'",
+                               (self._jurnal_berikut,))
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._n += len(baris)
+        return np.arange(awal, awal + len(baris), dtype=np.int64)
+
+    @diukur("buku.tambah_banyak")
+    def tambah_banyak(self, df, tanpa_jurnal=False, akun_baru=()):
+        if len(df) == 0:
+            return np.empty(0, dtype=np.int64)
+        tanggal = pd.to_datetime(df["Tanggal"]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        with self.kunci:
+            # Pendengar harus memuat tulisan proses lain dulu sebelum menerima baris baru
+            self.segarkan()
+            self.tutup_buku.periksa(df["Tanggal"])
+            kode, baris_akun = self._siapkan_akun(df["Akun"], akun_baru)
+            jurnal = self._siapkan_jurnal(df, tanpa_jurnal)
+            baris = list(zip(tanggal.tolist(), kode.tolist(), map(str, df["Keterangan"]),
+                             np.asarray(df["Debit"], dtype=np.int64).tolist(),
+                             np.asarray(df["Kredit"], dtype=np.int64).tolist(), jurnal.tolist()))
+            ids = self._sisipkan(baris, baris_akun)
+            # Akun baru masuk bagan hanya setelah COMMIT berhasil
+            self._daftarkan_akun(baris_akun)
+            self._akun_tersimpan = len(self.bagan)
+            self._kabari_tambah(normalisasi_transaksi(df, ids, jurnal))
+        return ids
+
+    def hapus(self, id_transaksi):
+        with self.kunci:
+            lama = self._select("WHERE id = ?", (int(id_transaksi),))
+            if len(lama) == 0:
+                raise KeyError(id_transaksi)
+            if lama["Jurnal"].iat[0] != TANPA_JURNAL:
+                raise ValueError(f"Transaksi {id_transaksi} bagian dari jurnal {lama['Jurnal'].iat[0]}; "
+                                 "hapus seluruh jurnal")
+            self.tutup_buku.periksa(lama["Tanggal"])
+            self._conn.execute("DELETE FROM transaksi WHERE id = ?", (int(id_transaksi),))
+            self._n -= 1
+            self._kabari_hapus(lama)
+
+    def nomor_jurnal(self, id_transaksi):
+        baris = self._query("SELECT jurnal FROM transaksi WHERE id = ?", (int(id_transaksi),))
+        if not baris:
+            raise KeyError(id_transaksi)
+        return baris[0][0]
+
+    def hapus_jurnal(self, nomor):
+        with self.kunci:
+            lama = self._select("WHERE jurnal = ?", (int(nomor),))
+            if nomor == TANPA_JURNAL or len(lama) == 0:
+                raise KeyError(nomor)
+            self.tutup_buku.periksa(lama["Tanggal"])
+            self._conn.execute("DELETE FROM transaksi WHERE jurnal = ?", (int(nomor),))
+            self._n -= len(lama)
+            self._kabari_hapus(lama)
+
+    def jurnal_tidak_seimbang(self):
+        # Dihitung SQLite dengan GROUP BY; baris tidak perlu dimuat
+        return self.memo.ambil("jurnal_tidak_seimbang", lambda: pd.DataFrame(self._query(
+            "SELECT jurnal, COUNT(*), SUM(debit), SUM(kredit), SUM(debit) - SUM(kredit) FROM transaksi "
+            "WHERE jurnal != 0 GROUP BY jurnal HAVING SUM(debit) != SUM(kredit) OR SUM(debit) = 0"),
+            columns=["Jurnal", "Baris", "Debit", "Kredit", "Selisih"]).set_index("Jurnal"))
+
+    def baris_tanpa_jurnal(self):
+        return self._query("SELECT COUNT(*) FROM transaksi WHERE jurnal = 0")[0][0]
+
+def buka_penyimpanan(path=None, bagan=None):
+    """SQLiteStore di `path`, atau TransaksiStore di memori bila path None."""
+    return TransaksiStore(bagan=bagan) if path is None else SQLiteStore(path, bagan=bagan)
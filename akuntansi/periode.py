@@ -0,0 +1,172 @@
+"""Partisi buku per (tahun, bulan) dengan partisi beku untuk periode yang sudah ditutup."""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from .dasar import KOLOM_TRANSAKSI, batas_periode
+from .memo import dimemo
+
+def _hanya_baca(arr):
+    arr.setflags(write=False)
+    return arr
+
+class _PartisiBeku:
+    """Baris satu periode tertutup sebagai array numpy hanya-baca; tidak pernah diubah.
+
+    Akun disimpan sebagai kode int32 ke daftar nama. DataFrame dibangun sekali saat
+    pertama dibaca; pembacaan berikutnya mendapat salinan dangkal (copy-on-write).
+    """
+
+    def __init__(self, rows):
+        self.n = len(rows)
+        self.ids = _hanya_baca(rows.index.to_numpy(dtype=np.int64, copy=True))
+        kode, akun = pd.factorize(np.asarray(rows["Akun"], dtype=object))
+        self.kode = _hanya_baca(kode.astype(np.int32))
+        self.akun = _hanya_baca(np.asarray(akun, dtype=object))
+        self.tanggal = _hanya_baca(rows["Tanggal"].to_numpy(dtype="datetime64[ns]", copy=True))
+        self.ket = _hanya_baca(np.array(rows["Keterangan"], dtype=object))
+        self.debit = _hanya_baca(rows["Debit"].to_numpy(dtype=np.int64, copy=True))
+        self.kredit = _hanya_baca(rows["Kredit"].to_numpy(dtype=np.int64, copy=True))
+        self.jurnal = _hanya_baca(rows["Jurnal"].to_numpy(dtype=np.int64, copy=True))
+        self._frame = None
+
+    def frame(self):
+        if self._frame is None:
+            self._frame = pd.DataFrame({
+                "Tanggal": self.tanggal,
+                "Akun": self.akun[self.kode],
+                "Keterangan": self.ket,
+                "Debit": self.debit,
+                "Kredit": self.kredit,
+                "Jurnal": self.jurnal,
+            }, index=pd.Index(self.ids), copy=False)
+        return self._frame.copy(deep=False)
+
+class _PartisiAktif:
+    """ID transaksi satu periode terbuka, urut naik, dalam buffer yang tumbuh dua kali lipat."""
+
+    def __init__(self, ids):
+        self.id = np.array(ids, dtype=np.int64)
+        self.n = len(self.id)
+
+    def ids(self):
+        return self.id[:self.n]
+
+    def sambung(self, ids):
+        # ID baru selalu lebih besar dari ID lama, jadi cukup ditulis di ujung buffer
+        n, m = self.n, len(ids)
+        if n + m > len(self.id):
+            baru = np.empty(max(2 * len(self.id), n + m), dtype=np.int64)
+            baru[:n] = self.id[:n]
+            self.id = baru
+        self.id[n:n + m] = ids
+        self.n = n + m
+
+    def buang(self, ids):
+        self.id = np.setdiff1d(self.ids(), ids, assume_unique=True)
+        self.n = len(self.id)
+
+class PartisiPeriode:
+    """Partisi buku per (tahun, bulan): ID transaksi tiap periode, urut ID.
+
+    Periode yang sudah ditutup TutupBuku dikunci dari tambah/hapus, jadi dibekukan
+    saat pertama dibaca menjadi _PartisiBeku dan pembacaan berikutnya tidak
+    menyentuh penyimpanan sama sekali. Periode terbuka tetap berupa daftar ID.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._siap = False
+        self._aktif = {}   # (tahun, bulan) -> _PartisiAktif
+        self._beku = {}    # (tahun, bulan) -> _PartisiBeku
+
+    @staticmethod
+    def _kelompokkan(ids, tanggal):
+        bulan_ke = tanggal.astype("datetime64[M]").astype(np.int64)
+        urutan = np.argsort(bulan_ke, kind="stable")
+        bulan_ke, ids = bulan_ke[urutan], ids[urutan]
+        batas = np.flatnonzero(np.diff(bulan_ke)) + 1
+        for awal, bagian in zip(np.r_[0, batas], np.split(ids, batas)):
+            if len(bagian):
+                tahun, bulan = divmod(int(bulan_ke[awal]), 12)
+                yield (tahun + 1970, bulan + 1), bagian
+
+    def _muat(self):
+        if not self._siap:
+            ids, tanggal = self._store.id_tanggal()
+            for periode, bagian in self._kelompokkan(ids, tanggal):
+                self._aktif[periode] = _PartisiAktif(bagian)
+            self._siap = True
+
+    def _cairkan(self, periode):
+        # Jaga-jaga saja: TutupBuku menolak perubahan di periode tertutup
+        beku = self._beku.pop(periode, None)
+        if beku is not None:
+            self._aktif[periode] = _PartisiAktif(beku.ids)
+
+    def saat_tambah(self, baru):
+        if not self._siap:
+            return
+        ids = baru.index.to_numpy(dtype=np.int64)
+        for periode, bagian in self._kelompokkan(ids, baru["Tanggal"].to_numpy(dtype="datetime64[ns]")):
+            self._cairkan(periode)
+            aktif = self._aktif.get(periode)
+            if aktif is None:
+                self._aktif[periode] = _PartisiAktif(bagian)
+            else:
+                aktif.sambung(bagian)
+
+    def saat_hapus(self, lama):
+        if not self._siap:
+            return
+        ids = lama.index.to_numpy(dtype=np.int64)
+        for periode, bagian in self._kelompokkan(ids, lama["Tanggal"].to_numpy(dtype="datetime64[ns]")):
+            self._cairkan(periode)
+            aktif = self._aktif.get(periode)
+            if aktif is None:
+                continue
+            aktif.buang(bagian)
+            if not aktif.n:
+                del self._aktif[periode]
+
+    def bulan_berjalan(self):
+        sekarang = datetime.now(pytz.timezone("Asia/Jakarta"))
+        return sekarang.year, sekarang.month
+
+    @dimemo
+    def daftar(self):
+        """{(tahun, bulan): jumlah transaksi}, urut periode."""
+        with self._store.kunci:
+            self._muat()
+            jumlah = {p: aktif.n for p, aktif in self._aktif.items()}
+            jumlah.update({p: beku.n for p, beku in self._beku.items()})
+        return dict(sorted(jumlah.items()))
+
+    def _baca(self, periode, tertutup):
+        beku = self._beku.get(periode)
+        if beku is not None:
+            return beku.frame()
+        awal, akhir = batas_periode(*periode)
+        rows = self._store.baris_periode(awal, akhir, self._aktif[periode].ids())
+        if not tertutup:
+            return rows
+        beku = self._beku[periode] = _PartisiBeku(rows)
+        del self._aktif[periode]
+        return beku.frame()
+
+    def ambil(self, tahun=None, bulan=None):
+        """Transaksi satu tahun/bulan (atau semua bila tahun None), urut periode lalu ID."""
+        with self._store.kunci:
+            self._store.segarkan()
+            self._muat()
+            ditutup = self._store.tutup_buku.periode_tutup()
+            tutup_sampai = ditutup[-1] if ditutup else None
+            periode = sorted(p for p in set(self._aktif) | set(self._beku)
+                             if (tahun is None or p[0] == tahun) and (bulan is None or p[1] == bulan))
+            bagian = [self._baca(p, tutup_sampai is not None and p <= tutup_sampai) for p in periode]
+        if not bagian:
+            return pd.DataFrame({k: pd.Series(dtype=t) for k, t in zip(
+                KOLOM_TRANSAKSI + ["Jurnal"], ["datetime64[ns]", object, object, np.int64, np.int64, np.int64])})
+        return pd.concat(bagian) if len(bagian) > 1 else bagian[0]
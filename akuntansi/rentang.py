@@ -0,0 +1,116 @@
+"""Indeks jumlah kumulatif (prefix sum) debit/kredit per akun untuk laporan rentang tanggal."""
+import numpy as np
+
+from .dasar import ke_ns
+from .instrumentasi import diukur
+
+# Kunci sel = ID akun << GESER_AKUN | (detik + NOL_DETIK): urut per akun, lalu per waktu
+GESER_AKUN = 40
+NOL_DETIK = 1 << 39
+NS_PER_DETIK = 10 ** 9
+# Tunda digabung lebih awal bila sudah sebanyak ini (tambah satu-satu tanpa laporan)
+MAKS_TUNDA = 1024
+
+def _detik(ns, atas=False):
+    # Batas rentang dibulatkan ke atas: "Tanggal >= batas" tetap tepat untuk waktu per detik
+    ns = np.asarray(ns, dtype=np.int64)
+    return -(-ns // NS_PER_DETIK) if atas else ns // NS_PER_DETIK
+
+def _kunci(ids, detik):
+    return (np.asarray(ids, dtype=np.int64) << GESER_AKUN) + (detik + NOL_DETIK)
+
+class IndeksRentang:
+    """Total debit/kredit/jumlah baris per (akun, waktu) beserta kumulatifnya.
+
+    Sel diurutkan per akun lalu per waktu, jadi total akun mana pun pada rentang
+    [mulai, akhir) adalah selisih dua titik kumulatif yang dicari dengan binary
+    search: O(akun × log n) per laporan, tanpa filter dan groupby baris.
+    Waktu transaksi disimpan per detik (tanggal + jam input sudah tepat).
+    Tambah/hapus hanya dicatat; sel dan kumulatif digabung ulang saat laporan
+    berikutnya diminta.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._siap = False
+        self._kunci = np.empty(0, dtype=np.int64)        # kunci sel, urut naik
+        self._nilai = np.zeros((0, 3), dtype=np.int64)   # debit, kredit, jumlah baris per sel
+        self._kum = np.zeros((1, 3), dtype=np.int64)     # baris 0 = nol, baris i+1 = kumulatif sampai sel i
+        self._tunda = []                                 # (kunci, nilai) yang belum digabung
+
+    def _muat(self):
+        if not self._siap:
+            baris = self._store.baris_akun_waktu()
+            self._catat(baris["Akun"], baris["Tanggal"],
+                        baris[["Debit", "Kredit", "Jumlah"]].to_numpy(dtype=np.int64))
+            self._siap = True
+        self._gabung()
+
+    def _catat(self, akun, tanggal, nilai):
+        ns = np.asarray(tanggal, dtype="datetime64[ns]").view(np.int64)
+        self._tunda.append((_kunci(akun, _detik(ns)), nilai))
+        if len(self._tunda) > MAKS_TUNDA:
+            self._gabung()
+
+    @diukur("rentang.gabung")
+    def _gabung(self):
+        # Hanya sel tunda yang diurutkan; sel lama (sudah urut) cukup ditambah atau disisipi,
+        # dan kumulatif dihitung ulang mulai sel pertama yang berubah
+        if not self._tunda:
+            return
+        kunci = np.concatenate([k for k, _ in self._tunda])
+        nilai = np.concatenate([n for _, n in self._tunda])
+        self._tunda = []
+        if not len(kunci):
+            return
+        urutan = np.argsort(kunci, kind="stable")
+        kunci, nilai = kunci[urutan], nilai[urutan]
+        awal = np.flatnonzero(np.r_[True, kunci[1:] != kunci[:-1]])
+        kunci, nilai = kunci[awal], np.add.reduceat(nilai, awal, axis=0)
+        posisi = np.searchsorted(self._kunci, kunci)
+        ada = posisi < len(self._kunci)
+        ada[ada] = self._kunci[posisi[ada]] == kunci[ada]
+        semua_nilai = self._nilai.copy()
+        semua_nilai[posisi[ada]] += nilai[ada]
+        semua_kunci = self._kunci
+        if not ada.all():
+            semua_kunci = np.insert(semua_kunci, posisi[~ada], kunci[~ada])
+            semua_nilai = np.insert(semua_nilai, posisi[~ada], nilai[~ada], axis=0)
+        dari = int(posisi[0])
+        # Sel yang semua barisnya sudah dihapus dibuang
+        hidup = semua_nilai[:, 2] != 0
+        if not hidup.all():
+            semua_kunci, semua_nilai, dari = semua_kunci[hidup], semua_nilai[hidup], 0
+        kum = np.empty((len(semua_nilai) + 1, 3), dtype=np.int64)
+        kum[:dari + 1] = self._kum[:dari + 1]
+        np.cumsum(semua_nilai[dari:], axis=0, out=kum[dari + 1:])
+        kum[dari + 1:] += kum[dari]
+        self._kunci, self._nilai, self._kum = semua_kunci, semua_nilai, kum
+
+    def _terapkan(self, rows, tanda):
+        if not self._siap:
+            return
+        nilai = np.stack([rows["Debit"].to_numpy(dtype=np.int64), rows["Kredit"].to_numpy(dtype=np.int64),
+                          np.ones(len(rows), dtype=np.int64)], axis=1) * tanda
+        self._catat(self._store.bagan.id_akun(rows["Akun"]), rows["Tanggal"], nilai)
+
+    def saat_tambah(self, baru):
+        self._terapkan(baru, 1)
+
+    def saat_hapus(self, lama):
+        self._terapkan(lama, -1)
+
+    @diukur("rentang.total")
+    def total(self, mulai=None, akhir=None):
+        """Array (ID akun, 3) debit, kredit, jumlah baris dengan mulai <= Tanggal < akhir."""
+        with self._store.kunci:
+            self._muat()
+            # _gabung selalu mengganti array (tidak mengubah di tempat): cukup simpan rujukannya
+            kunci, kum, n = self._kunci, self._kum, len(self._store.bagan)
+        dasar = np.arange(n, dtype=np.int64) << GESER_AKUN
+        # Dua binary search per akun: awal dan akhir rentang di potongan sel akun itu
+        kiri = dasar + (0 if mulai is None else _detik(ke_ns(mulai), atas=True) + NOL_DETIK)
+        kanan = dasar + ((1 << GESER_AKUN) if akhir is None else _detik(ke_ns(akhir), atas=True) + NOL_DETIK)
+        kiri = np.searchsorted(kunci, kiri)
+        kanan = np.maximum(np.searchsorted(kunci, kanan), kiri)
+        return kum[kanan] - kum[kiri]
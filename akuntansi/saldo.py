@@ -0,0 +1,166 @@
+"""Mesin saldo buku besar (inkremental)."""
+from copy import copy
+
+import numpy as np
+import pandas as pd
+
+from .dasar import ke_ns
+from .instrumentasi import diukur
+from .memo import dimemo
+
+class _BukuAkun:
+    """Baris satu akun urut (Tanggal, ID) beserta kumulatif debit dan kredit.
+
+    Saldo di sisi normal akun (kredit_normal: Kredit - Debit), sama dengan neraca saldo.
+    """
+
+    _KOLOM = ["tanggal", "id", "ket", "debit", "kredit", "kum_debit", "kum_kredit"]
+
+    def __init__(self, akun, df, kredit_normal=False):
+        self.akun = akun
+        self.tanda = -1 if kredit_normal else 1
+        tanggal = df["Tanggal"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        ids = df.index.to_numpy(dtype=np.int64)
+        urutan = np.lexsort((ids, tanggal))
+        self.n = len(df)
+        self.tanggal = tanggal[urutan]
+        self.id = ids[urutan]
+        self.ket = np.asarray(df["Keterangan"], dtype=object)[urutan]
+        self.debit = np.asarray(df["Debit"], dtype=np.int64)[urutan]
+        self.kredit = np.asarray(df["Kredit"], dtype=np.int64)[urutan]
+        self.kum_debit = np.cumsum(self.debit)
+        self.kum_kredit = np.cumsum(self.kredit)
+
+    def _hitung_ulang(self, dari):
+        # Hanya akhiran mulai posisi `dari` yang dihitung ulang
+        n = self.n
+        dasar_debit = self.kum_debit[dari - 1] if dari else 0
+        dasar_kredit = self.kum_kredit[dari - 1] if dari else 0
+        self.kum_debit[dari:n] = dasar_debit + np.cumsum(self.debit[dari:n])
+        self.kum_kredit[dari:n] = dasar_kredit + np.cumsum(self.kredit[dari:n])
+
+    def sisip(self, tanggal, ids, ket, debit, kredit):
+        n, m = self.n, len(ids)
+        if n == 0 or tanggal[0] >= self.tanggal[n - 1]:
+            # Jalur cepat: semua baris baru jatuh setelah tanggal terakhir
+            if n + m > len(self.id):
+                kapasitas = max(2 * len(self.id), n + m)
+                for nama in self._KOLOM:
+                    lama = getattr(self, nama)
+                    baru = np.empty(kapasitas, dtype=lama.dtype)
+                    baru[:n] = lama[:n]
+                    setattr(self, nama, baru)
+            self.tanggal[n:n + m] = tanggal
+            self.id[n:n + m] = ids
+            self.ket[n:n + m] = ket
+            self.debit[n:n + m] = debit
+            self.kredit[n:n + m] = kredit
+            self.n = n + m
+            self._hitung_ulang(n)
+            return
+        # Transaksi mundur tanggal: sisipkan lalu hitung ulang akhiran akun ini saja
+        posisi = np.searchsorted(self.tanggal[:n], tanggal, side="right")
+        dari = int(posisi[0])
+        for nama, nilai in zip(self._KOLOM[:5], (tanggal, ids, ket, debit, kredit)):
+            setattr(self, nama, np.insert(getattr(self, nama)[:n], posisi, nilai))
+        for nama in self._KOLOM[5:]:
+            lama = getattr(self, nama)
+            baru = np.empty(n + m, dtype=np.int64)
+            baru[:dari] = lama[:dari]
+            setattr(self, nama, baru)
+        self.n = n + m
+        self._hitung_ulang(dari)
+
+    def buang(self, tanggal, ids):
+        n = self.n
+        kiri = np.searchsorted(self.tanggal[:n], tanggal, side="left")
+        kanan = np.searchsorted(self.tanggal[:n], tanggal, side="right")
+        posisi = [k + int(np.flatnonzero(self.id[k:r] == i)[0]) for k, r, i in zip(kiri, kanan, ids)
+                  if (self.id[k:r] == i).any()]
+        if not posisi:
+            return
+        for nama in self._KOLOM:
+            setattr(self, nama, np.delete(getattr(self, nama)[:n], posisi))
+        self.n = n - len(posisi)
+        self._hitung_ulang(min(posisi))
+
+    def frame(self, mulai=None, akhir=None):
+        n = self.n
+        awal = 0 if mulai is None else int(np.searchsorted(self.tanggal[:n], ke_ns(mulai), side="left"))
+        # Rentang [mulai, akhir) seperti batas_periode dan API rentang lainnya
+        ujung = n if akhir is None else int(np.searchsorted(self.tanggal[:n], ke_ns(akhir), side="left"))
+        # Saldo dihitung dari awal rentang, sama seperti cumsum pada data yang sudah difilter
+        dasar = (self.kum_debit[awal - 1] - self.kum_kredit[awal - 1]) if awal else 0
+        return pd.DataFrame({
+            "Tanggal": self.tanggal[awal:ujung].view("datetime64[ns]"),
+            "Akun": np.full(ujung - awal, self.akun, dtype=object),
+            "Keterangan": self.ket[awal:ujung],
+            "Debit": self.debit[awal:ujung],
+            "Kredit": self.kredit[awal:ujung],
+            "Saldo": self.tanda * (self.kum_debit[awal:ujung] - self.kum_kredit[awal:ujung] - dasar),
+        }, index=pd.Index(self.id[awal:ujung]))
+
+class MesinSaldo:
+    """Saldo berjalan per akun yang diperbarui setiap tambah/hapus transaksi.
+
+    Buku tiap akun baru dimuat saat pertama diminta, setelah itu hanya diperbarui.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._buku = {}
+
+    def _akun(self, akun):
+        buku = self._buku.get(akun)
+        if buku is None:
+            bagan = self._store.bagan
+            buku = _BukuAkun(akun, self._store.per_akun(akun), bagan.kredit_normal[bagan.id_dari_nama(akun, daftarkan=False)])
+            self._buku[akun] = buku
+        return buku
+
+    def saat_tambah(self, baru):
+        for akun, rows in baru.groupby("Akun", observed=True, sort=False):
+            buku = self._buku.get(akun)
+            if buku is None:
+                continue
+            tanggal = rows["Tanggal"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+            ids = rows.index.to_numpy(dtype=np.int64)
+            urutan = np.lexsort((ids, tanggal))
+            buku.sisip(tanggal[urutan], ids[urutan], np.asarray(rows["Keterangan"], dtype=object)[urutan],
+                       np.asarray(rows["Debit"], dtype=np.int64)[urutan],
+                       np.asarray(rows["Kredit"], dtype=np.int64)[urutan])
+
+    def saat_hapus(self, lama):
+        for akun, rows in lama.groupby("Akun", observed=True, sort=False):
+            buku = self._buku.get(akun)
+            if buku is not None:
+                buku.buang(rows["Tanggal"].to_numpy(dtype="datetime64[ns]").view(np.int64),
+                           rows.index.to_numpy(dtype=np.int64))
+
+    # Potret buku akun = salinan dangkal: penulis hanya mengisi array di luar [0, n) atau
+    # mengganti array, jadi frame() potret boleh dibuat di luar kunci
+
+    @dimemo
+    def buku(self, akun, mulai=None, akhir=None):
+        with self._store.kunci:
+            buku = copy(self._akun(akun))
+        return buku.frame(mulai, akhir)
+
+    def saldo_akhir(self, akun):
+        with self._store.kunci:
+            self._store.segarkan()
+            buku = self._akun(akun)
+            return int(buku.tanda * (buku.kum_debit[buku.n - 1] - buku.kum_kredit[buku.n - 1])) if buku.n else 0
+
+    @dimemo
+    @diukur("saldo.buku_besar")
+    def buku_besar(self, mulai=None, akhir=None):
+        # Sama dengan buku_besar(df) untuk df berisi transaksi mulai <= Tanggal < akhir.
+        # Seluruh buku besar satu entri memo: buku per akun tidak lewat self.buku supaya
+        # ribuan akun tidak mendesak keluar isi memo lainnya.
+        with self._store.kunci:
+            potret = [copy(self._akun(akun)) for akun in self._store.daftar_akun()]
+        hasil = [buku.frame(mulai, akhir) for buku in potret]
+        hasil = [d for d in hasil if len(d)]
+        hasil.sort(key=lambda d: (d["Tanggal"].iat[0], d.index[0]))
+        return {d["Akun"].iat[0]: d for d in hasil}
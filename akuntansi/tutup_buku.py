@@ -0,0 +1,143 @@
+"""Tutup buku: snapshot saldo akhir periode."""
+import numpy as np
+import pandas as pd
+
+from .dasar import batas_periode, neraca_dari_total
+from .instrumentasi import diukur
+from .memo import dimemo
+
+class TutupBuku:
+    """Snapshot saldo kumulatif per akun di akhir periode yang ditutup.
+
+    Periode sampai snapshot terakhir dikunci (tambah/hapus ditolak), jadi snapshot
+    tetap benar dan laporan cukup mulai dari snapshot terakhir sebelum periode
+    yang diminta, tanpa membaca riwayat sebelumnya.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._snapshot = None    # (tahun, bulan) -> {akun: (debit, kredit, jumlah)}, urut periode
+
+    def _muat(self):
+        if self._snapshot is None:
+            self._snapshot = dict(sorted(self._store.baca_snapshot().items()))
+        return self._snapshot
+
+    def periode_tutup(self):
+        self._store.segarkan()
+        if self._snapshot is None:
+            with self._store.kunci:
+                self._muat()
+        return list(self._snapshot)
+
+    def batas(self):
+        """Awal periode pertama yang masih terbuka, atau None bila belum ada yang ditutup."""
+        snapshot = self._muat()
+        if not snapshot:
+            return None
+        return batas_periode(*next(reversed(snapshot)))[1]
+
+    def periksa(self, tanggal):
+        # Dipanggil penyimpanan sebelum tambah/hapus; tanggal: array-like datetime
+        batas = self.batas()
+        if batas is None:
+            return
+        tanggal = pd.to_datetime(pd.Series(tanggal)).to_numpy(dtype="datetime64[ns]")
+        if len(tanggal) and tanggal.min() < batas.to_datetime64():
+            raise ValueError(f"Periode sebelum {batas:%Y-%m-%d} sudah ditutup")
+
+    def _sebelum(self, tanggal):
+        # Snapshot terakhir yang akhir periodenya <= tanggal
+        hasil = None
+        for periode in self._muat():
+            if batas_periode(*periode)[1] > tanggal:
+                break
+            hasil = periode
+        return hasil
+
+    def _akumulasi(self, dasar, sampai):
+        # Saldo dasar + sel agregat bulanan setelah `dasar` sampai `sampai` (inklusif)
+        saldo = {akun: list(nilai) for akun, nilai in self._muat().get(dasar, {}).items()}
+        for tahun, bulan, akun, debit, kredit, jumlah in self._store.agregat.bulanan().itertuples(index=False):
+            if (dasar is None or (tahun, bulan) > dasar) and (tahun, bulan) <= sampai:
+                sel = saldo.setdefault(akun, [0, 0, 0])
+                sel[0] += int(debit)
+                sel[1] += int(kredit)
+                sel[2] += int(jumlah)
+        return saldo
+
+    def tutup(self, tahun, bulan):
+        """Tutup buku sampai akhir (tahun, bulan); snapshot dihitung dari agregat, bukan baris."""
+        with self._store.kunci:
+            self._store.segarkan()
+            snapshot = self._muat()
+            terakhir = next(reversed(snapshot), None)
+            if terakhir is not None and (tahun, bulan) <= terakhir:
+                raise ValueError(f"Periode {bulan}/{tahun} sudah ditutup")
+            saldo = {akun: tuple(nilai) for akun, nilai in self._akumulasi(terakhir, (tahun, bulan)).items()}
+            self._store.simpan_snapshot((tahun, bulan), saldo)
+            # Dict baru (bukan diubah di tempat) supaya pembaca tanpa kunci tidak melihat setengah jadi
+            self._snapshot = {**snapshot, (tahun, bulan): saldo}
+            # Laporan yang dimemo memakai snapshot sebagai titik awal
+            self._store.memo.bersihkan()
+            return saldo
+
+    @dimemo
+    @diukur("tutup_buku.neraca_saldo")
+    def neraca_saldo(self, tahun, bulan=None, gulung=False):
+        """Saldo kumulatif per akun di akhir periode: snapshot terakhir + agregat sesudahnya."""
+        sampai = (tahun, bulan or 12)
+        with self._store.kunci:
+            dasar = self._sebelum(batas_periode(tahun, bulan)[1])
+            saldo = self._akumulasi(dasar, sampai)
+        akun = list(saldo)
+        return neraca_dari_total(akun, [saldo[a][0] for a in akun], [saldo[a][1] for a in akun],
+                                 self._store.bagan, gulung)
+
+    @dimemo
+    @diukur("tutup_buku.buku_besar")
+    def buku_besar(self, mulai, akhir):
+        """Buku besar [mulai, akhir) dengan saldo awal dari snapshot: ({akun: DataFrame}, {akun: saldo awal}).
+
+        Hanya transaksi sesudah snapshot terakhir sebelum `mulai` yang dibaca. Saldo di sisi
+        normal akun, sama dengan MesinSaldo dan neraca saldo.
+        """
+        mulai = pd.Timestamp(mulai)
+        with self._store.kunci:
+            dasar = self._sebelum(mulai)
+            saldo_awal = {a: d - k for a, (d, k, _) in self._muat().get(dasar, {}).items()}
+            rows = self._store.per_rentang(batas_periode(*dasar)[1] if dasar else None, akhir)
+        sebelum = rows["Tanggal"] < mulai
+        for akun, nilai in (rows.loc[sebelum, "Debit"] - rows.loc[sebelum, "Kredit"]).groupby(
+                np.asarray(rows.loc[sebelum, "Akun"], dtype=object)).sum().items():
+            saldo_awal[akun] = saldo_awal.get(akun, 0) + int(nilai)
+        rows = rows[~sebelum.to_numpy()]
+        bagan = self._store.bagan
+        tanda = {akun: -1 if bagan.kredit_normal[bagan.id_dari_nama(akun, daftarkan=False)] else 1
+                 for akun in set(saldo_awal) | set(pd.unique(np.asarray(rows["Akun"], dtype=object)))}
+        saldo_awal = {akun: tanda[akun] * nilai for akun, nilai in saldo_awal.items()}
+        hasil = {}
+        for akun in pd.unique(np.asarray(rows["Akun"], dtype=object)):
+            d = rows[np.asarray(rows["Akun"], dtype=object) == akun]
+            hasil[akun] = d.assign(Akun=akun, Saldo=saldo_awal.get(akun, 0) + tanda[akun] * (d["Debit"] - d["Kredit"]).cumsum())
+        return hasil, saldo_awal
+
+    def validasi(self):
+        """Bandingkan setiap snapshot dengan hitung ulang penuh dari semua transaksi.
+
+        Hasil: satu baris per (periode, akun) dengan kolom Cocok.
+        """
+        with self._store.kunci:
+            self._store.segarkan()
+            snapshot = dict(self._muat())
+            ringkasan = self._store.ringkasan_bulanan()
+        baris = []
+        for (tahun, bulan), saldo in snapshot.items():
+            sampai = (ringkasan["Tahun"] < tahun) | ((ringkasan["Tahun"] == tahun) & (ringkasan["Bulan"] <= bulan))
+            hitung = ringkasan[sampai].groupby("Akun")[["Debit", "Kredit", "Jumlah"]].sum()
+            for akun in sorted(set(saldo) | set(hitung.index)):
+                tersimpan = saldo.get(akun, (0, 0, 0))
+                ulang = tuple(int(x) for x in hitung.loc[akun]) if akun in hitung.index else (0, 0, 0)
+                baris.append((tahun, bulan, akun, *tersimpan, *ulang, tuple(tersimpan) == ulang))
+        return pd.DataFrame(baris, columns=["Tahun", "Bulan", "Akun", "Debit Snapshot", "Kredit Snapshot",
+                                            "Jumlah Snapshot", "Debit Hitung", "Kredit Hitung", "Jumlah Hitung", "Cocok"])
@@ -0,0 +1,47 @@
+"""Benchmark export_excel_multi: mode lama (Workbook biasa) vs mode streaming (write-only).
+
+Contoh:
+    python benchmarks/bench_export.py --baris 10000 50000 200000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from buku_sintetis import buat_buku  # noqa: E402
+
+from akuntansi import export_excel_multi  # noqa: E402
+
+def ukur(df, streaming, memori):
+    if memori:
+        tracemalloc.start()
+    mulai = time.perf_counter()
+    hasil = export_excel_multi(df, streaming=streaming)
+    durasi = time.perf_counter() - mulai
+    puncak = tracemalloc.get_traced_memory()[1] if memori else None
+    if memori:
+        tracemalloc.stop()
+    return durasi, len(hasil), puncak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--memori", action="store_true", help="ukur puncak memori Python (lebih lambat)")
+    parser.add_argument("--tanpa-lama", action="store_true", help="lewati mode lama untuk data besar")
+    args = parser.parse_args()
+
+    print(f"{'baris':>8} {'mode':>10} {'detik':>8} {'baris/detik':>12} {'ukuran':>10} {'puncak MB':>10}")
+    for n in args.baris:
+        df = buat_buku(n)
+        for streaming in ([True] if args.tanpa_lama else [False, True]):
+            durasi, ukuran, puncak = ukur(df, streaming, args.memori)
+            puncak_mb = f"{puncak / 1e6:.1f}" if puncak is not None else "-"
+            print(f"{n:>8} {'streaming' if streaming else 'lama':>10} {durasi:>8.2f} {n / durasi:>12,.0f} "
+                  f"{ukuran / 1e6:>9.1f}M {puncak_mb:>10}")
+
+if __name__ == "__main__":
+    main()
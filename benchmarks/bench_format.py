@@ -0,0 +1,51 @@
+"""Micro-benchmark format tabel: apply(format_rupiah_angka/format_tanggal) vs format kolom vektor.
+
+Contoh:
+    python benchmarks/bench_format.py --baris 1000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from buku_sintetis import buat_buku  # noqa: E402
+
+from akuntansi import format as fmt  # noqa: E402
+
+def ukur(fungsi, ulang):
+    terbaik = float("inf")
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik, hasil
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--ulang", type=int, default=3, help="ambil waktu terbaik dari N kali")
+    args = parser.parse_args()
+
+    print(f"{'baris':>8} {'kolom':>8} {'apply (s)':>10} {'vektor (s)':>11} {'percepatan':>11}")
+    for n in args.baris:
+        df = buat_buku(n)
+        # Saldo berjalan: hampir semua nilai unik, kasus terburuk untuk cache
+        saldo = (df["Debit"] - df["Kredit"]).cumsum()
+        kasus = [
+            ("Debit", lambda: df["Debit"].apply(fmt.format_rupiah_angka), lambda: fmt.format_rupiah_kolom(df["Debit"])),
+            ("Saldo", lambda: saldo.apply(fmt.format_rupiah_angka), lambda: fmt.format_rupiah_kolom(saldo)),
+            ("Tanggal", lambda: df["Tanggal"].apply(fmt.format_tanggal), lambda: fmt.format_tanggal_kolom(df["Tanggal"])),
+        ]
+        for nama, lama, baru in kasus:
+            fmt._rupiah_tersimpan.cache_clear()
+            durasi_lama, hasil_lama = ukur(lama, args.ulang)
+            durasi_baru, hasil_baru = ukur(baru, args.ulang)
+            assert np.array_equal(hasil_lama.to_numpy(dtype=object), hasil_baru.to_numpy(dtype=object)), nama
+            print(f"{n:>8} {nama:>8} {durasi_lama:>10.4f} {durasi_baru:>11.4f} {durasi_lama / durasi_baru:>10.1f}x")
+
+if __name__ == "__main__":
+    main()
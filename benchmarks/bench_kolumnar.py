@@ -0,0 +1,67 @@
+"""Benchmark export/import transaksi: Excel (sheet Data Import) vs Parquet vs Arrow IPC.
+
+Tulis: export_excel_multi (streaming) / export_parquet / export_arrow ke file.
+Baca: baca_import (dibersihkan, per potongan) dan baca_kolumnar (apa adanya, Arrow di-memory-map).
+
+Contoh:
+    python benchmarks/bench_kolumnar.py --baris 100000 1000000 --tanpa-excel
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from buku_sintetis import buat_buku  # noqa: E402
+
+from akuntansi import TransaksiStore, baca_import, sheet_valid_excel  # noqa: E402
+from akuntansi import baca_kolumnar, export_arrow, export_excel_multi, export_parquet  # noqa: E402
+
+def waktu(fungsi):
+    mulai = time.perf_counter()
+    hasil = fungsi()
+    return time.perf_counter() - mulai, hasil
+
+def cetak(n, format_file, kasus, detik, keterangan=""):
+    print(f"{n:>9,} {format_file:>8} {kasus:>14} {detik:>8.3f} {n / detik if detik else 0:>12,.0f}  {keterangan}",
+          flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, nargs="+", default=[100000])
+    parser.add_argument("--tanpa-excel", action="store_true", help="lewati Excel (lambat untuk data besar)")
+    args = parser.parse_args()
+
+    print(f"{'baris':>9} {'format':>8} {'kasus':>14} {'detik':>8} {'baris/detik':>12}")
+    folder = tempfile.mkdtemp(prefix="bench_kolumnar_")
+    try:
+        for n in args.baris:
+            store = TransaksiStore()
+            store.tambah_banyak(buat_buku(n))
+            df = store.frame()
+            penulis = {"parquet": export_parquet, "arrow": export_arrow}
+            if not args.tanpa_excel:
+                penulis = {"xlsx": lambda df, tujuan: export_excel_multi(df, streaming=True, tujuan=tujuan),
+                           **penulis}
+            for format_file, tulis in penulis.items():
+                path = os.path.join(folder, f"buku_{n}.{format_file}")
+                detik, _ = waktu(lambda: tulis(df, tujuan=path))
+                cetak(n, format_file, "export", detik, f"{os.path.getsize(path) / 1e6:.1f} MB")
+                if format_file == "xlsx":
+                    pembaca = {"baca_import": lambda: baca_import(path, "excel", "Data Import",
+                                                                  sheet_valid_excel(path)[1]["Data Import"])}
+                else:
+                    pembaca = {"baca_import": lambda: baca_import(path, format_file),
+                               "baca_kolumnar": lambda: baca_kolumnar(path, format_file)}
+                for kasus, baca in pembaca.items():
+                    detik, hasil = waktu(baca)
+                    cetak(n, format_file, kasus, detik, f"{len(hasil):,} baris")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark log tulis buku memori: throughput tulis dan waktu pemulihan saat start.
+
+Tulis: tambah_jurnal satu per satu dan tambah_banyak per batch, dengan dan tanpa log.
+Pulih: buka_buku_log dari log saja (putar ulang semua segmen + tombstone) dan dari
+snapshot hasil pemadatan.
+
+Contoh:
+    python benchmarks/bench_log.py --baris 100000 1000000 --tunggal 5000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from buku_sintetis import buat_buku  # noqa: E402
+
+from akuntansi import TransaksiStore, buka_buku_log  # noqa: E402
+
+BATAS_TANPA_PADAT = 1 << 62
+
+def ukuran_folder(folder):
+    return sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder))
+
+def tulis_tunggal(store, df):
+    # Satu jurnal (dua baris) per panggilan, seperti input dari halaman Input Transaksi
+    jurnal = [(g["Tanggal"].iat[0], g["Keterangan"].iat[0], list(zip(g["Akun"], g["Debit"], g["Kredit"])))
+              for _, g in df.groupby("Jurnal", sort=False)]
+    mulai = time.perf_counter()
+    for tgl, ket, baris in jurnal:
+        store.tambah_jurnal(tgl, ket, baris)
+    return time.perf_counter() - mulai
+
+def tulis_batch(store, df, batch):
+    mulai = time.perf_counter()
+    for i in range(0, len(df), batch):
+        store.tambah_banyak(df.iloc[i:i + batch])
+    return time.perf_counter() - mulai
+
+def cetak(kasus, n, detik, keterangan=""):
+    print(f"{kasus:>24} {n:>9,} {detik:>9.3f} {n / detik if detik else 0:>12,.0f}  {keterangan}", flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--tunggal", type=int, default=2000, help="jumlah baris yang ditambah per jurnal (tambah_jurnal)")
+    parser.add_argument("--batch", type=int, default=1000, help="baris per tambah_banyak")
+    parser.add_argument("--hapus", type=int, default=200, help="jumlah jurnal yang dihapus (tombstone)")
+    parser.add_argument("--jeda-fsync", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{'kasus':>24} {'baris':>9} {'detik':>9} {'baris/detik':>12}")
+    folder = tempfile.mkdtemp(prefix="bench_log_")
+    try:
+        df = buat_buku(args.tunggal)
+        cetak("tambah_jurnal tanpa log", args.tunggal, tulis_tunggal(TransaksiStore(), df))
+        store = buka_buku_log(os.path.join(folder, "tunggal"), jeda_fsync=args.jeda_fsync)
+        cetak("tambah_jurnal + log", args.tunggal, tulis_tunggal(store, df))
+        store.log.akhiri()
+
+        for n in args.baris:
+            df = buat_buku(n)
+            cetak("tambah_banyak tanpa log", n, tulis_batch(TransaksiStore(), df, args.batch))
+            path = os.path.join(folder, f"buku_{n}")
+            store = buka_buku_log(path, jeda_fsync=args.jeda_fsync, batas_padat=BATAS_TANPA_PADAT)
+            cetak("tambah_banyak + log", n, tulis_batch(store, df, args.batch))
+            jurnal = store.frame()["Jurnal"].unique()
+            hapus = jurnal[::max(len(jurnal) // args.hapus, 1)][:args.hapus] if args.hapus > 0 else []
+            mulai = time.perf_counter()
+            for nomor in hapus:
+                store.hapus_jurnal(int(nomor))
+            cetak("hapus_jurnal + log", len(hapus), time.perf_counter() - mulai, "tombstone")
+            store.log.akhiri()
+            ukuran_log = ukuran_folder(path)
+
+            mulai = time.perf_counter()
+            store = buka_buku_log(path, batas_padat=BATAS_TANPA_PADAT)
+            cetak("pulih dari log", len(store), time.perf_counter() - mulai,
+                  f"{store.log.statistik['segmen']} segmen, {ukuran_log / 1e6:.1f} MB")
+            mulai = time.perf_counter()
+            store.log.padatkan(tunggu=True)
+            cetak("padatkan", len(store), time.perf_counter() - mulai)
+            store.log.akhiri()
+
+            mulai = time.perf_counter()
+            store = buka_buku_log(path, batas_padat=BATAS_TANPA_PADAT)
+            cetak("pulih dari snapshot", len(store), time.perf_counter() - mulai,
+                  f"{ukuran_folder(path) / 1e6:.1f} MB")
+            store.log.akhiri()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
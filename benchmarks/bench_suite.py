@@ -0,0 +1,231 @@
+"""Benchmark suite: laporan, export, import dan render halaman pada buku sintetis.
+
+Setiap kasus diukur pada beberapa ukuran buku (bawaan 1k/100k/1M baris): waktu
+terbaik dan median dari beberapa ulangan, plus puncak memori (tracemalloc) dari
+satu run terpisah. Hasil disimpan sebagai JSON agar run bisa dibandingkan.
+
+Contoh:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --baris 1000 100000 --kasus buku_besar import_csv
+    python benchmarks/bench_suite.py --akun 2000 --kasus neraca_saldo neraca_bertingkat
+    python benchmarks/bench_suite.py --banding benchmarks/hasil/suite-20240101-120000.json
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, FOLDER)
+sys.path.insert(0, os.path.join(FOLDER, ".."))
+
+from buku_sintetis import buat_bagan, buat_buku  # noqa: E402
+
+from akuntansi import TransaksiStore, baca_import, buku_besar, export_excel_multi  # noqa: E402
+from akuntansi import laporan_laba_rugi, neraca_saldo, sheet_valid_excel  # noqa: E402
+
+# Halaman yang dirender lewat streamlit AppTest; Import/Export tidak ikut karena
+# halaman Export langsung memulai job di latar belakang
+HALAMAN = {
+    "halaman_dashboard": "🏠 Dashboard",
+    "halaman_lihat": "📋 Lihat Transaksi",
+    "halaman_buku_besar": "📖 Buku Besar",
+    "halaman_neraca": "⚖️ Neraca Saldo",
+    "halaman_laba_rugi": "💰 Laporan Laba Rugi",
+    "halaman_grafik": "📈 Grafik",
+    "halaman_tutup_buku": "🔒 Tutup Buku",
+}
+
+class Persiapan:
+    """Data bersama per ukuran buku; dibuat sekali dan dipakai semua kasus."""
+
+    def __init__(self, df, bagan=None):
+        self.df = df
+        self.bagan = bagan
+        self._xlsx = None
+        self._csv = None
+        self._store = None
+        self._app = None
+
+    def store(self):
+        if self._store is None:
+            self._store = TransaksiStore(bagan=self.bagan)
+            self._store.tambah_banyak(self.df)
+        return self._store
+
+    def xlsx(self):
+        if self._xlsx is None:
+            self._xlsx = export_excel_multi(self.df, streaming=True)
+        return self._xlsx
+
+    def csv(self):
+        if self._csv is None:
+            self._csv = self.df.to_csv(index=False).encode()
+        return self._csv
+
+    def app(self):
+        # Satu sesi AppTest dengan buku di memori; run pertama (import modul) tidak diukur
+        if self._app is None:
+            import streamlit.logger
+            from streamlit.testing.v1 import AppTest
+
+            streamlit.logger.set_log_level("error")
+
+            store = TransaksiStore(bagan=self.bagan)
+            store.tambah_banyak(self.df)
+            self._app = AppTest.from_file(os.path.join(FOLDER, "..", "run.py"), default_timeout=600)
+            self._app.session_state["transaksi"] = store
+            self._app.run()
+        return self._app
+
+def _render(app, menu):
+    def jalan():
+        app.sidebar.radio[0].set_value(menu).run()
+        if app.exception:
+            raise RuntimeError(f"{menu}: {app.exception[0].value}")
+    return jalan
+
+def _import_excel(data):
+    def jalan():
+        _, valid = sheet_valid_excel(io.BytesIO(data))
+        return baca_import(io.BytesIO(data), "excel", "Data Import", valid["Data Import"])
+    return jalan
+
+def _neraca_bertingkat(store):
+    # Neraca dari agregat + roll-up hierarki bagan; memo dikosongkan agar benar-benar dihitung
+    def jalan():
+        store.memo.bersihkan()
+        return store.agregat.neraca_saldo(gulung=True)
+    return jalan
+
+def _cari_teks(store):
+    # Indeks teks dibangun sekali di luar pengukuran; yang diukur kueri token, awalan, dan frasa
+    store.teks.cocok("x")
+
+    def jalan():
+        store.memo.bersihkan()
+        return [store.cari(teks=kueri) for kueri in ("listrik", "bkt*", '"sewa gudang"')]
+    return jalan
+
+def _laporan_rentang(store):
+    # Neraca per tanggal + laba rugi rentang dari IndeksRentang; indeks dibangun di luar pengukuran
+    store.rentang.total()
+    tanggal = store.frame()["Tanggal"]
+    mulai, akhir = tanggal.quantile(0.25), tanggal.quantile(0.75)
+
+    def jalan():
+        store.memo.bersihkan()
+        return store.agregat.neraca_saldo(akhir=akhir), store.agregat.laporan_laba_rugi(mulai=mulai, akhir=akhir)
+    return jalan
+
+KASUS = {
+    "buku_besar": lambda p: lambda: buku_besar(p.df),
+    "neraca_saldo": lambda p: lambda: neraca_saldo(p.df, p.bagan),
+    "neraca_bertingkat": lambda p: _neraca_bertingkat(p.store()),
+    "cari_teks": lambda p: _cari_teks(p.store()),
+    "laporan_rentang": lambda p: _laporan_rentang(p.store()),
+    "laporan_laba_rugi": lambda p: lambda: laporan_laba_rugi(p.df, p.bagan),
+    "muat_buku": lambda p: lambda: TransaksiStore(bagan=p.bagan).tambah_banyak(p.df),
+    "export_excel": lambda p: lambda: export_excel_multi(p.df, streaming=True),
+    "import_csv": lambda p: (lambda data: lambda: baca_import(io.BytesIO(data), "csv"))(p.csv()),
+    "import_excel": lambda p: _import_excel(p.xlsx()),
+}
+KASUS.update({nama: (lambda menu: lambda p: _render(p.app(), menu))(menu) for nama, menu in HALAMAN.items()})
+
+def ukur(fungsi, ulang, batas_detik):
+    # Minimal satu run; ulangan berhenti bila total waktu sudah melewati batas
+    sampel = []
+    while len(sampel) < ulang and (not sampel or sum(sampel) < batas_detik):
+        mulai = time.perf_counter()
+        fungsi()
+        sampel.append(time.perf_counter() - mulai)
+    return sampel
+
+def puncak_memori(fungsi):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fungsi()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def info_lingkungan(seed):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=FOLDER, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "waktu": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu": os.cpu_count(),
+        "seed": seed,
+    }
+
+def muat_pembanding(path):
+    with open(path) as f:
+        return {(h["kasus"], h["baris"]): h for h in json.load(f)["hasil"]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--kasus", nargs="+", choices=list(KASUS), default=list(KASUS))
+    parser.add_argument("--ulang", type=int, default=3, help="jumlah ulangan per kasus (bawaan 3)")
+    parser.add_argument("--batas-detik", type=float, default=20.0, help="berhenti mengulang setelah total N detik")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--akun", type=int, help="pakai bagan sintetis ±N akun (bawaan: bagan aplikasi)")
+    parser.add_argument("--tanpa-memori", action="store_true", help="lewati run tracemalloc")
+    parser.add_argument("--keluar", help="file JSON hasil (bawaan: benchmarks/hasil/suite-<waktu>.json)")
+    parser.add_argument("--banding", help="file JSON run sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    pembanding = muat_pembanding(args.banding) if args.banding else {}
+    hasil = {**info_lingkungan(args.seed), "akun": args.akun, "hasil": []}
+    print(f"{'kasus':>20} {'baris':>9} {'terbaik (s)':>12} {'median (s)':>11} {'baris/detik':>12} "
+          f"{'puncak MB':>10} {'vs banding':>11}")
+    for n in args.baris:
+        bagan = buat_bagan(args.akun) if args.akun else None
+        persiapan = Persiapan(buat_buku(n, seed=args.seed, bagan=bagan), bagan)
+        for nama in args.kasus:
+            fungsi = KASUS[nama](persiapan)
+            sampel = ukur(fungsi, args.ulang, args.batas_detik)
+            puncak = None if args.tanpa_memori else puncak_memori(fungsi)
+            baris = {
+                "kasus": nama,
+                "baris": n,
+                "detik": min(sampel),
+                "median": float(np.median(sampel)),
+                "sampel": sampel,
+                "baris_per_detik": n / min(sampel),
+                "puncak_mb": None if puncak is None else puncak / 1e6,
+            }
+            hasil["hasil"].append(baris)
+            lama = pembanding.get((nama, n))
+            banding = f"{lama['detik'] / baris['detik']:>10.2f}x" if lama else f"{'-':>11}"
+            puncak_mb = f"{baris['puncak_mb']:.1f}" if puncak is not None else "-"
+            print(f"{nama:>20} {n:>9} {baris['detik']:>12.4f} {baris['median']:>11.4f} "
+                  f"{baris['baris_per_detik']:>12,.0f} {puncak_mb:>10} {banding}", flush=True)
+
+    keluar = args.keluar or os.path.join(FOLDER, "hasil", f"suite-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(keluar)), exist_ok=True)
+    with open(keluar, "w") as f:
+        json.dump(hasil, f, indent=2)
+    print(f"\nHasil disimpan di {keluar}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Generator buku transaksi sintetis yang deterministik untuk benchmark.
+
+Memakai daftar akun aplikasi, nominal Rupiah per akun (dibulatkan ke ribuan) dan
+tanggal yang tersebar beberapa tahun. Seed yang sama selalu menghasilkan buku yang sama.
+
+Contoh:
+    from buku_sintetis import buat_bagan, buat_buku
+    df = buat_buku(100000, seed=42, tahun_mulai=2021, jumlah_tahun=3)
+    bagan = buat_bagan(2000)
+    df = buat_buku(100000, bagan=bagan)   # akun utama dipecah ke sub-akun bagan
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from akuntansi.bagan_akun import TIPE_AKUN, bagan_bawaan  # noqa: E402
+from akuntansi.dasar import semua_akun  # noqa: E402
+
+# akun: (bobot frekuensi, median nominal Rp, sisi) — sisi "D"/"K" tetap, "DK" bisa keduanya.
+# Setiap jurnal = akun utama di sisinya + Kas di sisi lawan (bobot Kas 0: hanya jadi lawan).
+# Sisi mengikuti saldo normal: pendapatan dan modal bertambah di Kredit, beban di Debit.
+PROFIL_AKUN = {
+    "Kas": (0, 750_000, "DK"),
+    "Piutang": (12, 2_500_000, "DK"),
+    "Modal": (2, 25_000_000, "K"),
+    "Pendapatan Jasa": (18, 3_000_000, "K"),
+    "Pendapatan Lainnya": (5, 500_000, "K"),
+    "Beban Gaji": (8, 6_500_000, "D"),
+    "Beban Listrik": (6, 850_000, "D"),
+    "Beban Sewa": (4, 7_500_000, "D"),
+    "Beban Lainnya": (15, 250_000, "D"),
+}
+KETERANGAN_AKUN = {
+    "Kas": ["Setoran tunai", "Penarikan kas", "Kas kecil"],
+    "Piutang": ["Tagihan pelanggan", "Pelunasan piutang"],
+    "Modal": ["Setoran modal pemilik"],
+    "Pendapatan Jasa": ["Jasa konsultasi", "Jasa servis", "Jasa desain"],
+    "Pendapatan Lainnya": ["Bunga bank", "Penjualan aset bekas"],
+    "Beban Gaji": ["Gaji karyawan", "Lembur karyawan"],
+    "Beban Listrik": ["Tagihan PLN"],
+    "Beban Sewa": ["Sewa kantor", "Sewa gudang"],
+    "Beban Lainnya": ["ATK", "Konsumsi rapat", "Transportasi", "Biaya admin bank"],
+}
+
+def buat_bagan(jumlah_akun):
+    """Bagan bawaan + sub-akun di bawah akun PROFIL_AKUN (selain Kas) sampai ±jumlah_akun akun."""
+    bagan = bagan_bawaan()
+    induk = [a for a in PROFIL_AKUN if PROFIL_AKUN[a][0] > 0]
+    per_induk = max(jumlah_akun - len(bagan), 0) // len(induk)
+    for nama in induk:
+        id_induk = bagan.id_dari_nama(nama, daftarkan=False)
+        kode, tipe = int(bagan.kode[id_induk]), TIPE_AKUN[bagan.tipe[id_induk]]
+        for i in range(1, per_induk + 1):
+            bagan.tambah(kode * 1000 + i, f"{nama} {i:04d}", tipe, kode)
+    return bagan
+
+def _sub_akun(bagan, akun_utama, rng):
+    # Akun utama yang punya sub-akun diganti salah satu sub-akunnya secara acak
+    hasil = akun_utama.copy()
+    daftar = bagan.frame()
+    for nama in np.unique(akun_utama):
+        kode = daftar.loc[daftar["Akun"] == nama, "Kode"].iloc[0]
+        anak = daftar.loc[(daftar["Induk"] == kode) & daftar["Posting"], "Akun"].to_numpy(dtype=object)
+        if len(anak):
+            posisi = np.flatnonzero(akun_utama == nama)
+            hasil[posisi] = anak[rng.integers(0, len(anak), len(posisi))]
+    return hasil
+
+def buat_buku(n, seed=42, tahun_mulai=2021, jumlah_tahun=3, bagan=None):
+    """DataFrame n baris transaksi (KOLOM_TRANSAKSI + Jurnal) urut tanggal, semua jurnal seimbang.
+
+    Jurnal dua baris (akun utama + Kas); bila n ganjil, jurnal terakhir tiga baris
+    dengan sisi Kas dipecah dua. Dengan `bagan` (lihat buat_bagan) akun utama
+    disebar ke sub-akunnya.
+    """
+    awal = pd.Timestamp(year=tahun_mulai, month=1, day=1)
+    if n < 2:
+        # Buku sekecil ini berisi satu jurnal satu baris; agar seimbang Debit = Kredit
+        return pd.DataFrame({"Tanggal": [awal], "Akun": ["Kas"], "Keterangan": ["Kas kecil BKT-0000001"],
+                             "Debit": [1000], "Kredit": [1000], "Jurnal": [1]}).astype(
+                                 {"Debit": np.int64, "Kredit": np.int64, "Jurnal": np.int64}).head(n)
+    rng = np.random.default_rng(seed)
+    m = n // 2
+    akun = np.array(semua_akun, dtype=object)
+    bobot = np.array([PROFIL_AKUN[a][0] for a in semua_akun], dtype=float)
+    kode = rng.choice(len(akun), size=m, p=bobot / bobot.sum())
+
+    # Nominal log-normal di sekitar median akun, minimal Rp 1.000, dibulatkan ke ribuan
+    median = np.array([PROFIL_AKUN[a][1] for a in semua_akun], dtype=float)[kode]
+    nominal = np.maximum(np.round(median * rng.lognormal(0.0, 0.6, m) / 1000), 1).astype(np.int64) * 1000
+    sisi = np.array([PROFIL_AKUN[a][2] for a in semua_akun], dtype=object)[kode]
+    di_debit = np.where(sisi == "DK", rng.random(m) < 0.5, sisi == "D")
+
+    rentang = (pd.Timestamp(year=tahun_mulai + jumlah_tahun, month=1, day=1) - awal) // pd.Timedelta(1, unit="s")
+    detik = np.sort(rng.integers(0, rentang, m))
+
+    # Keterangan: template acak per akun utama + nomor bukti urut per jurnal
+    template = np.empty(m, dtype=object)
+    for i, nama in enumerate(semua_akun):
+        posisi = np.flatnonzero(kode == i)
+        pilihan = np.array(KETERANGAN_AKUN[nama], dtype=object)
+        template[posisi] = pilihan[rng.integers(0, len(pilihan), len(posisi))]
+    nomor = np.char.zfill(np.arange(1, m + 1).astype(str), 7)
+    keterangan = (pd.Series(template, dtype=object) + " BKT-" + pd.Series(nomor, dtype=object)).to_numpy(dtype=object)
+
+    # Baris 2j = akun utama, 2j+1 = Kas di sisi lawan
+    debit = np.stack([np.where(di_debit, nominal, 0), np.where(di_debit, 0, nominal)], axis=1).ravel()
+    kredit = np.stack([np.where(di_debit, 0, nominal), np.where(di_debit, nominal, 0)], axis=1).ravel()
+    akun_utama = akun[kode] if bagan is None else _sub_akun(bagan, akun[kode], rng)
+    akun_baris = np.stack([akun_utama, np.full(m, "Kas", dtype=object)], axis=1).ravel()
+    jurnal = np.repeat(np.arange(1, m + 1, dtype=np.int64), 2)
+    ulang = np.repeat(np.arange(m), 2)
+    if n % 2:
+        # Baris ke-n: sisi Kas jurnal terakhir dipecah dua
+        setengah_d, setengah_k = debit[-1] // 2, kredit[-1] // 2
+        debit = np.r_[debit[:-1], debit[-1] - setengah_d, setengah_d]
+        kredit = np.r_[kredit[:-1], kredit[-1] - setengah_k, setengah_k]
+        akun_baris = np.append(akun_baris, "Kas")
+        jurnal = np.r_[jurnal, m]
+        ulang = np.r_[ulang, m - 1]
+
+    return pd.DataFrame({
+        "Tanggal": awal + pd.to_timedelta(detik[ulang], unit="s"),
+        "Akun": akun_baris.astype(object),
+        "Keterangan": keterangan[ulang],
+        "Debit": debit.astype(np.int64),
+        "Kredit": kredit.astype(np.int64),
+        "Jurnal": jurnal,
+    })
@@ -1,12 +1,15 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
 from datetime import datetime
 import pytz
-import io
+import os
 import calendar
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from akuntansi import (
+    KOLOM_TRANSAKSI, TANPA_JURNAL, TIPE_AKUN, BaganAkun, IndeksDuplikat, SQLiteStore, TransaksiStore, ManajerExport, baca_import,
+    batas_periode, buka_buku_log, data_grafik, format_rupiah_angka, jenis_file_import, jurnal_tidak_seimbang, sheet_valid_excel,
+    satukan_tanpa_nomor, tabel_tampilan,
+)
+from akuntansi import instrumentasi
 
 # ===========================
 # Styling tema pantai
@@ -78,371 +81,133 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+def baca_bagan(path_bagan):
+    # AKUNTANSI_BAGAN=bagan.csv (kolom Kode, Nama, Tipe, Induk); kosong = bagan bawaan
+    return BaganAkun.dari_csv(path_bagan) if path_bagan else None
+
+@st.cache_resource
+def buka_sqlite(path, path_bagan=None):
+    # Satu koneksi per proses, dipakai bersama semua sesi
+    return SQLiteStore(path, bagan=baca_bagan(path_bagan))
+
+@st.cache_resource
+def buku_memori_bersama(folder_log, path_bagan=None):
+    # Satu buku memori per proses: semua sesi membaca dan menulis buku yang sama.
+    # Dengan folder log, buku dipulihkan dari log saat proses mulai ulang
+    bagan = baca_bagan(path_bagan)
+    return buka_buku_log(folder_log, bagan) if folder_log else TransaksiStore(bagan=bagan)
+
+def buat_penyimpanan():
+    # AKUNTANSI_STORAGE: sesi (bawaan) = buku memori sementara per sesi, hilang saat sesi berakhir.
+    # sqlite = file AKUNTANSI_DB (bawaan akuntansi.db) dan memori = satu buku per proses; keduanya
+    # dipakai bersama SEMUA sesi, jadi setiap pengguna melihat dan mengubah buku yang sama.
+    # AKUNTANSI_LOG: folder log tulis buku memori (kosong = tanpa log)
+    path_bagan = os.environ.get("AKUNTANSI_BAGAN")
+    storage = os.environ.get("AKUNTANSI_STORAGE", "sesi")
+    if storage == "sesi":
+        return TransaksiStore(bagan=baca_bagan(path_bagan))
+    if storage == "memori":
+        return buku_memori_bersama(os.environ.get("AKUNTANSI_LOG", "akuntansi_log"), path_bagan)
+    return buka_sqlite(os.environ.get("AKUNTANSI_DB", "akuntansi.db"), path_bagan)
+
 # ===========================
 # Session state untuk simpan transaksi
 # ===========================
 if "transaksi" not in st.session_state:
-    st.session_state.transaksi = []
+    st.session_state.transaksi = buat_penyimpanan()
 
 # ===========================
-# Fungsi format rupiah sesuai contoh
+# Fungsi-fungsi akun
 # ===========================
-def format_rupiah_angka(n):
-    if n == 0 or n is None:
-        return "Rp -"
-    s = f"{n:,.2f}"
-    s = s.replace(",", "X").replace(".", ",").replace("X", ".")
-    return f"Rp {s}"
-
-def format_tanggal(dt):
-    if pd.isna(dt):
-        return ""
-    if isinstance(dt, str):
-        try:
-            dt = pd.to_datetime(dt)
-        except:
-            return dt
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
+def tambah_jurnal(tgl, ket, baris):
+    return st.session_state.transaksi.tambah_jurnal(tgl, ket, baris)
+
+def tambah_transaksi_banyak(df, tanpa_jurnal=False, akun_baru=()):
+    return st.session_state.transaksi.tambah_banyak(df, tanpa_jurnal=tanpa_jurnal, akun_baru=akun_baru)
+
+def hapus_transaksi(id_transaksi):
+    # Baris bagian dari jurnal dihapus bersama seluruh jurnalnya agar jurnal tetap seimbang.
+    # Cek nomor dan hapus dalam satu kunci: sesi lain tidak bisa menyela di antaranya
+    store = st.session_state.transaksi
+    with store.kunci:
+        nomor = store.nomor_jurnal(id_transaksi)
+        if nomor:
+            store.hapus_jurnal(nomor)
+        else:
+            store.hapus(id_transaksi)
+    return nomor
+
+def df_transaksi():
+    return st.session_state.transaksi.frame()
+
+def tampilkan_tabel(data, **kwargs):
+    # st.dataframe menserialisasi data ke Arrow saat dipanggil; waktunya ikut dicatat instrumentasi
+    with instrumentasi.rentang("ui.dataframe", baris=len(data)):
+        st.dataframe(data, **kwargs)
 
 # ===========================
-# Fungsi-fungsi akun
+# Job export di latar belakang
 # ===========================
-pendapatan_akun = ["Pendapatan Jasa", "Pendapatan Lainnya"]
-beban_akun = ["Beban Gaji", "Beban Listrik", "Beban Sewa", "Beban Lainnya"]
-
-def tambah_transaksi(tgl, akun, ket, debit, kredit):
-    st.session_state.transaksi.append({
-        "Tanggal": tgl,
-        "Akun": akun,
-        "Keterangan": ket,
-        "Debit": int(debit),
-        "Kredit": int(kredit)
-    })
-
-def hapus_transaksi(idx):
-    st.session_state.transaksi.pop(idx)
-
-def buku_besar(df):
-    akun_list = df["Akun"].unique()
-    buku_besar_data = {}
-    for akun in akun_list:
-        df_akun = df[df["Akun"] == akun].copy().sort_values("Tanggal")
-        df_akun["Saldo"] = df_akun["Debit"].cumsum() - df_akun["Kredit"].cumsum()
-        buku_besar_data[akun] = df_akun
-    return buku_besar_data
-
-def neraca_saldo(df):
-    grouped = df.groupby("Akun")[["Debit", "Kredit"]].sum()
-    grouped["Saldo"] = grouped["Debit"] - grouped["Kredit"]
-    return grouped
-
-def laporan_laba_rugi(df):
-    total_pendapatan = df[df["Akun"].isin(pendapatan_akun)]["Debit"].sum()
-    total_beban = df[df["Akun"].isin(beban_akun)]["Kredit"].sum()
-    laba_rugi = total_pendapatan - total_beban
-    return {
-        "Total Pendapatan": total_pendapatan,
-        "Total Beban": total_beban,
-        "Laba/Rugi": laba_rugi
-    }
+@st.cache_resource
+def manajer_export():
+    return ManajerExport()
+
+# Format export: (nama, ekstensi, mime). Parquet/Arrow hanya berisi data transaksi
+FORMAT_EXPORT = {
+    "excel": ("Excel", ".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "parquet": ("Parquet", ".parquet", "application/vnd.apache.parquet"),
+    "arrow": ("Arrow IPC", ".arrow", "application/vnd.apache.arrow.file"),
+}
+
+@st.fragment(run_every=0.5)
+def _pantau_job_export(job, nama_format):
+    # Hanya fragment ini yang di-rerun selama export berjalan
+    if job.selesai:
+        st.rerun()
+    st.progress(job.progres, text=f"⏳ Menyiapkan file {nama_format}... {job.progres:.0%}")
+
+def panel_job_export(job, nama_file, format_export="excel"):
+    nama_format, ekstensi, mime = FORMAT_EXPORT[format_export]
+    if not job.selesai:
+        _pantau_job_export(job, nama_format)
+    elif isinstance(job.error, ImportError):
+        st.error(f"❌ Export {nama_format} membutuhkan paket pyarrow: {job.error}")
+    elif job.error is not None:
+        st.error(f"Error saat generate file {nama_format}: {job.error}")
+    else:
+        st.download_button(f"Download Laporan Akuntansi{ekstensi}", job.hasil, file_name=nama_file + ekstensi, mime=mime)
+        st.success(f"File siap diunduh! (dibuat dalam {job.durasi:.1f} detik)")
 
 # ===========================
-# Fungsi export excel lengkap dan sesuai template
+# Import transaksi
 # ===========================
-def export_excel_multi(df):
-    output = io.BytesIO()
-    wb = Workbook()
-
-    thin_border = Border(left=Side(style='thin'),
-                         right=Side(style='thin'),
-                         top=Side(style='thin'),
-                         bottom=Side(style='thin'))
-
-    header_fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")   # biru header
-    title_fill = PatternFill(start_color="bdd7ee", end_color="bdd7ee", fill_type="solid")    # biru muda
-    year_fill = PatternFill(start_color="d9e1f2", end_color="d9e1f2", fill_type="solid")     # biru sangat muda
-
-    font_white_bold = Font(bold=True, color="FFFFFF")
-    font_bold = Font(bold=True)
-
-    df["Tanggal"] = pd.to_datetime(df["Tanggal"])
-    df = df.sort_values("Tanggal")
-    df["Tahun"] = df["Tanggal"].dt.year
-    df["Bulan"] = df["Tanggal"].dt.month
-
-    # Sheet 1: Laporan Keuangan
-    ws = wb.active
-    ws.title = "Laporan Keuangan"
-    current_row = 1
-
-    for tahun, df_tahun in df.groupby("Tahun"):
-        ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=5)
-        tcell = ws.cell(row=current_row, column=1, value=f"Laporan Keuangan Tahun {tahun}")
-        tcell.font = Font(bold=True, size=14)
-        tcell.fill = year_fill
-        tcell.alignment = Alignment(horizontal="center", vertical="center")
-        for col in range(1, 6):
-            ws.cell(row=current_row, column=col).border = thin_border
-        current_row += 1
-
-        for bulan, df_bulan in df_tahun.groupby("Bulan"):
-            nama_bulan = calendar.month_name[bulan]
-            ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=5)
-            bcell = ws.cell(row=current_row, column=1, value=f"Bulan {nama_bulan}")
-            bcell.font = font_bold
-            bcell.fill = title_fill
-            bcell.alignment = Alignment(horizontal="center", vertical="center")
-            for col in range(1, 6):
-                ws.cell(row=current_row, column=col).border = thin_border
-
-            current_row += 1
-
-            headers = ["Tanggal", "Akun", "Keterangan", "Debit", "Kredit"]
-            for idx, val in enumerate(headers, start=1):
-                hcell = ws.cell(row=current_row, column=idx, value=val)
-                hcell.font = font_white_bold
-                hcell.fill = header_fill
-                hcell.alignment = Alignment(horizontal="center", vertical="center")
-                hcell.border = thin_border
-            current_row += 1
-
-            total_debit_bulan = 0
-            total_kredit_bulan = 0
-
-            for _, row in df_bulan.iterrows():
-                ws.cell(row=current_row, column=1, value=row["Tanggal"].strftime("%Y-%m-%d %H:%M:%S")).alignment = Alignment(horizontal="left")
-                ws.cell(row=current_row, column=2, value=row["Akun"]).alignment = Alignment(horizontal="left")
-                ws.cell(row=current_row, column=3, value=row["Keterangan"]).alignment = Alignment(horizontal="left")
-
-                debit_str = format_rupiah_angka(row["Debit"])
-                kredit_str = format_rupiah_angka(row["Kredit"])
-
-                dcell = ws.cell(row=current_row, column=4, value=debit_str)
-                dcell.alignment = Alignment(horizontal="right")
-                dcell.border = thin_border
-
-                kcell = ws.cell(row=current_row, column=5, value=kredit_str)
-                kcell.alignment = Alignment(horizontal="right")
-                kcell.border = thin_border
-
-                for col in range(1, 6):
-                    ws.cell(row=current_row, column=col).border = thin_border
-                current_row += 1
-                
-                total_debit_bulan += row["Debit"]
-                total_kredit_bulan += row["Kredit"]
-
-            # Tambahkan baris Total
-            ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=3)
-            total_cell = ws.cell(row=current_row, column=1, value="Total")
-            total_cell.font = font_bold
-            total_cell.fill = title_fill
-            total_cell.alignment = Alignment(horizontal="center", vertical="center")
-            
-            debit_total_cell = ws.cell(row=current_row, column=4, value=format_rupiah_angka(total_debit_bulan))
-            debit_total_cell.font = font_bold
-            debit_total_cell.fill = title_fill
-            debit_total_cell.alignment = Alignment(horizontal="right")
-            
-            kredit_total_cell = ws.cell(row=current_row, column=5, value=format_rupiah_angka(total_kredit_bulan))
-            kredit_total_cell.font = font_bold
-            kredit_total_cell.fill = title_fill
-            kredit_total_cell.alignment = Alignment(horizontal="right")
-            
-            for col in range(1, 6):
-                ws.cell(row=current_row, column=col).border = thin_border
-            
-            current_row += 2
-
-        current_row += 1
-
-    col_widths = [22, 18, 30, 20, 20]
-    for i, width in enumerate(col_widths, start=1):
-        ws.column_dimensions[chr(64 + i)].width = width
-
-    # Sheet 2: Jurnal Umum
-    ws2 = wb.create_sheet("Jurnal Umum")
-    ws2.merge_cells(start_row=1, start_column=1, end_row=1, end_column=5)
-    title_cell = ws2.cell(row=1, column=1, value="Jurnal Umum")
-    title_cell.font = Font(bold=True, size=14)
-    title_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    headers = ["Tanggal", "Akun", "Keterangan", "Debit", "Kredit"]
-    for idx, val in enumerate(headers, start=1):
-        hcell = ws2.cell(row=2, column=idx, value=val)
-        hcell.font = font_white_bold
-        hcell.fill = header_fill
-        hcell.alignment = Alignment(horizontal="center", vertical="center")
-        hcell.border = thin_border
-
-    r = 3
-    for _, row in df.iterrows():
-        ws2.cell(row=r, column=1, value=row["Tanggal"].strftime("%Y-%m-%d %H:%M:%S")).alignment = Alignment(horizontal="left")
-        ws2.cell(row=r, column=2, value=row["Akun"]).alignment = Alignment(horizontal="left")
-        ws2.cell(row=r, column=3, value=row["Keterangan"]).alignment = Alignment(horizontal="left")
-
-        debit_str = format_rupiah_angka(row["Debit"])
-        kredit_str = format_rupiah_angka(row["Kredit"])
-
-        ws2.cell(row=r, column=4, value=debit_str).alignment = Alignment(horizontal="right")
-        ws2.cell(row=r, column=5, value=kredit_str).alignment = Alignment(horizontal="right")
-
-        for col in range(1, 6):
-            ws2.cell(row=r, column=col).border = thin_border
-        r += 1
-
-    for i, width in enumerate(col_widths, 1):
-        ws2.column_dimensions[chr(64 + i)].width = width
-
-    # Sheet 3: Buku Besar
-    ws3 = wb.create_sheet("Buku Besar")
-    bb = buku_besar(df)
-    r = 1
-    for akun, data in bb.items():
-        ws3.merge_cells(start_row=r, start_column=1, end_row=r, end_column=6)
-        a_cell = ws3.cell(row=r, column=1, value=f"Buku Besar - {akun}")
-        a_cell.font = font_bold
-        a_cell.alignment = Alignment(horizontal="center", vertical="center")
-        r += 1
-
-        headers = ["Tanggal", "Akun", "Keterangan", "Debit", "Kredit", "Saldo"]
-        for idx, val in enumerate(headers, start=1):
-            hcell = ws3.cell(row=r, column=idx, value=val)
-            hcell.font = font_white_bold
-            hcell.fill = header_fill
-            hcell.alignment = Alignment(horizontal="center", vertical="center")
-            hcell.border = thin_border
-        r += 1
-
-        for _, row in data.iterrows():
-            ws3.cell(row=r, column=1, value=row["Tanggal"].strftime("%Y-%m-%d %H:%M:%S")).alignment = Alignment(horizontal="left")
-            ws3.cell(row=r, column=2, value=row["Akun"]).alignment = Alignment(horizontal="left")
-            ws3.cell(row=r, column=3, value=row["Keterangan"]).alignment = Alignment(horizontal="left")
-
-            ws3.cell(row=r, column=4, value=format_rupiah_angka(row["Debit"])).alignment = Alignment(horizontal="right")
-            ws3.cell(row=r, column=5, value=format_rupiah_angka(row["Kredit"])).alignment = Alignment(horizontal="right")
-            ws3.cell(row=r, column=6, value=format_rupiah_angka(row["Saldo"])).alignment = Alignment(horizontal="right")
-
-            for col in range(1, 7):
-                ws3.cell(row=r, column=col).border = thin_border
-            r += 1
-        r += 2
-
-    col_widths_bb = [22, 18, 30, 20, 20, 20]
-    for i, width in enumerate(col_widths_bb, 1):
-        ws3.column_dimensions[chr(64 + i)].width = width
-
-    # Sheet 4: Neraca Saldo
-    ws4 = wb.create_sheet("Neraca Saldo")
-    ws4.merge_cells(start_row=1, start_column=1, end_row=1, end_column=4)
-    c = ws4.cell(row=1, column=1, value="Neraca Saldo")
-    c.font = font_bold
-    c.alignment = Alignment(horizontal="center", vertical="center")
-
-    headers = ["Akun", "Debit", "Kredit", "Saldo"]
-    for idx, val in enumerate(headers, start=1):
-        hcell = ws4.cell(row=2, column=idx, value=val)
-        hcell.font = font_white_bold
-        hcell.fill = header_fill
-        hcell.alignment = Alignment(horizontal="center", vertical="center")
-        hcell.border = thin_border
-
-    ns = neraca_saldo(df)
-    r = 3
-    for _, row in ns.reset_index().iterrows():
-        ws4.cell(row=r, column=1, value=row["Akun"]).alignment = Alignment(horizontal="left")
-        ws4.cell(row=r, column=2, value=format_rupiah_angka(row["Debit"])).alignment = Alignment(horizontal="right")
-        ws4.cell(row=r, column=3, value=format_rupiah_angka(row["Kredit"])).alignment = Alignment(horizontal="right")
-        ws4.cell(row=r, column=4, value=format_rupiah_angka(row["Saldo"])).alignment = Alignment(horizontal="right")
-
-        for col in range(1, 5):
-            ws4.cell(row=r, column=col).border = thin_border
-        r += 1
-
-    col_widths_ns = [22, 20, 20, 20]
-    for i, width in enumerate(col_widths_ns, 1):
-        ws4.column_dimensions[chr(64 + i)].width = width
-
-    # Sheet 5: Laporan Laba Rugi
-    ws5 = wb.create_sheet("Laporan Laba Rugi")
-    ws5.merge_cells(start_row=1, start_column=1, end_row=1, end_column=2)
-    c = ws5.cell(row=1, column=1, value="Laporan Laba Rugi")
-    c.font = font_bold
-    c.alignment = Alignment(horizontal="center", vertical="center")
-    c.fill = year_fill
-
-    headers = ["Keterangan", "Jumlah"]
-    for idx, val in enumerate(headers, start=1):
-        hcell = ws5.cell(row=2, column=idx, value=val)
-        hcell.font = font_white_bold
-        hcell.fill = header_fill
-        hcell.alignment = Alignment(horizontal="center", vertical="center")
-        hcell.border = thin_border
-
-    lr = laporan_laba_rugi(df)
-    labels = ["Total Pendapatan", "Total Beban", "Laba/Rugi"]
-    values = [lr["Total Pendapatan"], lr["Total Beban"], lr["Laba/Rugi"]]
-
-    r = 3
-    for label, val in zip(labels, values):
-        ws5.cell(row=r, column=1, value=label).alignment = Alignment(horizontal="left")
-        ws5.cell(row=r, column=1).border = thin_border
-
-        if label == "Laba/Rugi" and val < 0:
-            val_str = f"(Rp {abs(val):,.2f})"
-            val_str = val_str.replace(",", "X").replace(".", ",").replace("X", ".")
-        else:
-            val_str = format_rupiah_angka(val)
+BARIS_PREVIEW_IMPORT = 1000
 
-        c = ws5.cell(row=r, column=2, value=val_str)
-        c.alignment = Alignment(horizontal="right")
-        c.border = thin_border
+# ===========================
+# Pilihan periode laporan
+# ===========================
+def nama_periode(periode):
+    return "Semua Periode" if periode is None else f"{calendar.month_name[periode[1]]} {periode[0]}"
 
-        r += 1
+def pilih_periode(store, kunci):
+    # None = semua periode; selain itu (tahun, bulan) yang punya transaksi
+    return st.selectbox("📅 Periode", [None] + list(store.periode.daftar()), key=kunci, format_func=nama_periode)
 
-    ws5.column_dimensions['A'].width = 25
-    ws5.column_dimensions['B'].width = 20
+def batas_rentang(rentang):
+    # Rentang tanggal inklusif dari date_input -> [mulai, akhir): akhir = hari sesudah tanggal terakhir
+    mulai = pd.Timestamp(rentang[0]) if len(rentang) > 0 else None
+    akhir = pd.Timestamp(rentang[1]) + pd.Timedelta(days=1) if len(rentang) > 1 else None
+    return mulai, akhir
 
-    # Sheet 6: Data Import (format sederhana untuk import ulang)
-    ws6 = wb.create_sheet("Data Import")
-    ws6.merge_cells(start_row=1, start_column=1, end_row=1, end_column=5)
-    title_cell = ws6.cell(row=1, column=1, value="Data Import - Format untuk Import Ulang")
-    title_cell.font = Font(bold=True, size=12, italic=True)
-    title_cell.alignment = Alignment(horizontal="center", vertical="center")
-    title_cell.fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-    
-    headers = ["Tanggal", "Akun", "Keterangan", "Debit", "Kredit"]
-    for idx, val in enumerate(headers, start=1):
-        hcell = ws6.cell(row=2, column=idx, value=val)
-        hcell.font = font_white_bold
-        hcell.fill = header_fill
-        hcell.alignment = Alignment(horizontal="center", vertical="center")
-        hcell.border = thin_border
-    
-    r = 3
-    for _, row in df.iterrows():
-        ws6.cell(row=r, column=1, value=row["Tanggal"].strftime("%Y-%m-%d %H:%M:%S")).alignment = Alignment(horizontal="left")
-        ws6.cell(row=r, column=2, value=row["Akun"]).alignment = Alignment(horizontal="left")
-        ws6.cell(row=r, column=3, value=row["Keterangan"]).alignment = Alignment(horizontal="left")
-        ws6.cell(row=r, column=4, value=row["Debit"]).alignment = Alignment(horizontal="right")
-        ws6.cell(row=r, column=5, value=row["Kredit"]).alignment = Alignment(horizontal="right")
-        
-        for col in range(1, 6):
-            ws6.cell(row=r, column=col).border = thin_border
-        r += 1
-    
-    for i, width in enumerate(col_widths, 1):
-        ws6.column_dimensions[chr(64 + i)].width = width
-
-    wb.save(output)
-    output.seek(0)
-    return output.getvalue()
-    
 # ===========================
 # Menu Navigasi Streamlit
 # ===========================
+# Instrumentasi: env AKUNTANSI_PROFIL=1 atau buka aplikasi dengan ?profil=1
+if st.query_params.get("profil") == "1":
+    instrumentasi.aktifkan()
+
 st.sidebar.markdown("### 📋 Menu Navigasi")
-menu = st.sidebar.radio("", [
+daftar_menu = [
     "🏠 Dashboard",
     "📝 Input Transaksi",
     "📋 Lihat Transaksi",
@@ -450,9 +215,14 @@ menu = st.sidebar.radio("", [
     "⚖️ Neraca Saldo",
     "💰 Laporan Laba Rugi",
     "📈 Grafik",
+    "🔒 Tutup Buku",
     "📥 Import Excel",
     "📤 Export Excel",
-], label_visibility="collapsed")
+]
+if instrumentasi.aktif():
+    daftar_menu.append("⏱️ Performance")
+menu = st.sidebar.radio("", daftar_menu, label_visibility="collapsed")
+instrumentasi.mulai_rerun(menu)
 
 # Sidebar Statistik
 st.sidebar.markdown("---")
@@ -460,9 +230,7 @@ st.sidebar.markdown("### 📊 Statistik")
 total_transaksi = len(st.session_state.transaksi)
 st.sidebar.info(f"Total Transaksi: **{total_transaksi}**")
 if total_transaksi > 0:
-    df_temp = pd.DataFrame(st.session_state.transaksi)
-    total_debit = df_temp["Debit"].sum()
-    total_kredit = df_temp["Kredit"].sum()
+    total_debit, total_kredit = st.session_state.transaksi.total()
     st.sidebar.success(f"Total Debit: **{format_rupiah_angka(total_debit)}**")
     st.sidebar.warning(f"Total Kredit: **{format_rupiah_angka(total_kredit)}**")
 
@@ -475,8 +243,7 @@ if menu == "🏠 Dashboard":
     if total_transaksi == 0:
         st.info("👋 Mulai dengan menambahkan transaksi di menu Input Transaksi.")
     else:
-        df = pd.DataFrame(st.session_state.transaksi)
-        lr = laporan_laba_rugi(df)
+        lr = st.session_state.transaksi.agregat.laporan_laba_rugi()
 
         col1, col2, col3, col4 = st.columns(4)
         col1.metric("📊 Total Transaksi", total_transaksi)
@@ -490,11 +257,8 @@ if menu == "🏠 Dashboard":
 
         st.markdown("---")
         st.markdown("### 📋 Transaksi Terbaru")
-        df_show = df.tail(5).copy()
-        df_show["Tanggal"] = df_show["Tanggal"].apply(format_tanggal)
-        df_show["Debit"] = df_show["Debit"].apply(format_rupiah_angka)
-        df_show["Kredit"] = df_show["Kredit"].apply(format_rupiah_angka)
-        st.dataframe(df_show, use_container_width=True)
+        df_show = tabel_tampilan(st.session_state.transaksi.terbaru(5))
+        tampilkan_tabel(df_show, use_container_width=True)
 
 elif menu == "📝 Input Transaksi":
     st.markdown("<div class='subtitle'>📝 Input Transaksi Baru</div>", unsafe_allow_html=True)
@@ -506,86 +270,179 @@ elif menu == "📝 Input Transaksi":
             tgl_input = st.date_input("📅 Tanggal Transaksi", datetime.now(tz).date())
         with col_tahun:
             tahun_input = st.number_input("📆 Periode Tahun", min_value=2000, max_value=2100, value=datetime.now(tz).year, step=1)
-        akun = st.selectbox("🏦 Pilih Akun", [
-            "Kas", "Piutang", "Modal", "Pendapatan Jasa", "Pendapatan Lainnya", 
-            "Beban Gaji", "Beban Listrik", "Beban Sewa", "Beban Lainnya"])
         ket = st.text_input("📝 Keterangan", "")
-        debit = st.number_input("Debit (Rp)", min_value=0, step=10000, format="%d")
-        kredit = st.number_input("Kredit (Rp)", min_value=0, step=10000, format="%d")
-        submitted = st.form_submit_button("✅ Simpan Transaksi")
+        # Satu jurnal = beberapa baris akun; total Debit harus sama dengan total Kredit
+        baris = st.data_editor(
+            pd.DataFrame({"Akun": [None, None], "Debit": [0, 0], "Kredit": [0, 0]}),
+            column_config={
+                "Akun": st.column_config.SelectboxColumn("🏦 Akun", options=st.session_state.transaksi.bagan.akun_posting(),
+                                                            required=True),
+                "Debit": st.column_config.NumberColumn("Debit (Rp)", min_value=0, step=10000, format="%d"),
+                "Kredit": st.column_config.NumberColumn("Kredit (Rp)", min_value=0, step=10000, format="%d"),
+            },
+            num_rows="dynamic", hide_index=True, use_container_width=True, key="baris_jurnal")
+        submitted = st.form_submit_button("✅ Simpan Jurnal")
         if submitted:
-            if debit == 0 and kredit == 0:
-                st.error("❌ Debit atau Kredit harus diisi!")
+            baris = baris.assign(Debit=baris["Debit"].fillna(0).astype("int64"),
+                                 Kredit=baris["Kredit"].fillna(0).astype("int64"))
+            baris = baris[baris["Akun"].notna() & ((baris["Debit"] > 0) | (baris["Kredit"] > 0))]
+            total_debit, total_kredit = int(baris["Debit"].sum()), int(baris["Kredit"].sum())
+            if len(baris) < 2:
+                st.error("❌ Jurnal minimal dua baris akun dengan Debit atau Kredit!")
+            elif total_debit != total_kredit:
+                st.error(f"❌ Jurnal tidak seimbang: total Debit {format_rupiah_angka(total_debit)} ≠ "
+                         f"total Kredit {format_rupiah_angka(total_kredit)}")
             elif not ket.strip():
                 st.error("❌ Keterangan harus diisi!")
             else:
                 waktu_device = datetime.now(tz).time()
                 tgl_waktu = datetime.combine(tgl_input.replace(year=tahun_input), waktu_device)
-                tambah_transaksi(tgl_waktu, akun, ket, debit, kredit)
-                st.success("✅ Transaksi berhasil ditambahkan!")
-                st.balloons()
-                st.rerun()
+                try:
+                    tambah_jurnal(tgl_waktu, ket, baris.itertuples(index=False, name=None))
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                else:
+                    st.success("✅ Jurnal berhasil ditambahkan!")
+                    st.balloons()
+                    st.rerun()
 
 elif menu == "📋 Lihat Transaksi":
     st.markdown("<div class='subtitle'>📋 Daftar Semua Transaksi</div>", unsafe_allow_html=True)
     if len(st.session_state.transaksi) == 0:
         st.info("Belum ada transaksi.")
     else:
-        df = pd.DataFrame(st.session_state.transaksi)
-        filter_akun = st.multiselect("Filter Akun", df["Akun"].unique())
-        sort_by = st.selectbox("Urutkan berdasarkan", ["Tanggal", "Akun", "Debit", "Kredit"])
-        if filter_akun:
-            df = df[df["Akun"].isin(filter_akun)]
-        df = df.sort_values(sort_by)
-
-        df_display = df.copy()
-        df_display["Tanggal"] = df_display["Tanggal"].apply(format_tanggal)
-        df_display["Debit"] = df_display["Debit"].apply(format_rupiah_angka)
-        df_display["Kredit"] = df_display["Kredit"].apply(format_rupiah_angka)
-        st.dataframe(df_display, use_container_width=True)
-
-        idx_hapus = st.number_input("Nomor indeks hapus transaksi", min_value=0, max_value=len(st.session_state.transaksi)-1)
+        store = st.session_state.transaksi
+        col1, col2 = st.columns(2)
+        with col1:
+            filter_akun = st.multiselect("Filter Akun", store.daftar_akun())
+            rentang = st.date_input("Rentang Tanggal", value=())
+            kueri_teks = st.text_input("Cari Keterangan", "", help="Semua kata harus ada, tidak peka huruf besar/kecil. "
+                                       "Akhiri kata dengan * untuk awalan (bayar*), pakai tanda kutip untuk "
+                                       "frasa (\"beban listrik\").")
+        with col2:
+            nominal_min = st.number_input("Nominal minimum (Rp)", min_value=0, value=None, step=10000, format="%d")
+            nominal_maks = st.number_input("Nominal maksimum (Rp)", min_value=0, value=None, step=10000, format="%d")
+            col_urut, col_arah = st.columns([2, 1])
+            sort_by = col_urut.selectbox("Urutkan berdasarkan", ["Tanggal", "Akun", "Debit", "Kredit", "ID"])
+            turun = col_arah.checkbox("Menurun", value=False)
+
+        mulai, akhir = batas_rentang(rentang)
+        saring = dict(akun=filter_akun, mulai=mulai, akhir=akhir, nominal_min=nominal_min,
+                      nominal_maks=nominal_maks, teks=kueri_teks.strip() or None, urut=sort_by, turun=turun)
+
+        col_ukuran, col_halaman = st.columns(2)
+        ukuran_halaman = col_ukuran.selectbox("Baris per halaman", [25, 50, 100, 500], index=1)
+        halaman = int(col_halaman.number_input("Halaman", min_value=1, value=1, step=1))
+        jumlah, df = store.cari(**saring, offset=(halaman - 1) * ukuran_halaman, batas=ukuran_halaman)
+        jumlah_halaman = max((jumlah + ukuran_halaman - 1) // ukuran_halaman, 1)
+        if halaman > jumlah_halaman:
+            # Filter baru mempersempit hasil: tampilkan halaman terakhir
+            halaman = jumlah_halaman
+            jumlah, df = store.cari(**saring, offset=(halaman - 1) * ukuran_halaman, batas=ukuran_halaman)
+        offset = (halaman - 1) * ukuran_halaman
+
+        if jumlah == 0:
+            st.warning("Tidak ada transaksi yang cocok dengan filter.")
+        else:
+            st.caption(f"Halaman {halaman} dari {jumlah_halaman} — menampilkan {offset + 1}–{offset + len(df)} dari {jumlah} transaksi")
+            # Index tabel = ID transaksi yang tetap, dipakai juga untuk hapus
+            df_display = tabel_tampilan(df).rename_axis("ID")
+            tampilkan_tabel(df_display, use_container_width=True)
+
+        idx_hapus = st.number_input("Nomor indeks hapus transaksi (ID)", min_value=0, step=1)
         if st.button("🗑️ Hapus"):
-            hapus_transaksi(idx_hapus)
-            st.success("Transaksi berhasil dihapus")
-            st.rerun()
+            try:
+                nomor = hapus_transaksi(idx_hapus)
+            except KeyError:
+                st.error(f"❌ Transaksi dengan indeks {idx_hapus} tidak ditemukan")
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                st.success(f"Jurnal {nomor} berhasil dihapus" if nomor else "Transaksi berhasil dihapus")
+                st.rerun()
 
 elif menu == "📖 Buku Besar":
     st.markdown("<div class='subtitle'>📖 Buku Besar Per Akun</div>", unsafe_allow_html=True)
     if len(st.session_state.transaksi) == 0:
         st.info("Belum ada transaksi.")
     else:
-        df = pd.DataFrame(st.session_state.transaksi)
-        bb = buku_besar(df)
-        for idx, (akun, data) in enumerate(bb.items()):
-            with st.expander(f"📊 {akun}", expanded=(idx == 0)):
-                d = data.copy()
-                d["Tanggal"] = d["Tanggal"].apply(format_tanggal)
-                d["Debit"] = d["Debit"].apply(format_rupiah_angka)
-                d["Kredit"] = d["Kredit"].apply(format_rupiah_angka)
-                d["Saldo"] = d["Saldo"].apply(format_rupiah_angka)
-                st.dataframe(d, use_container_width=True, hide_index=True)
+        store = st.session_state.transaksi
+        periode = pilih_periode(store, "periode_buku_besar")
+        if periode is None:
+            # Ambil per akun saja, tidak perlu memuat seluruh buku
+            for idx, akun in enumerate(store.daftar_akun()):
+                with st.expander(f"📊 {akun}", expanded=(idx == 0)):
+                    d = tabel_tampilan(store.saldo.buku(akun), ("Debit", "Kredit", "Saldo"))
+                    tampilkan_tabel(d, use_container_width=True, hide_index=True)
+        else:
+            # Saldo awal dari snapshot tutup buku terakhir sebelum periode ini
+            bb, saldo_awal = store.tutup_buku.buku_besar(*batas_periode(*periode))
+            for idx, (akun, data) in enumerate(bb.items()):
+                with st.expander(f"📊 {akun}", expanded=(idx == 0)):
+                    st.caption(f"Saldo awal: {format_rupiah_angka(saldo_awal.get(akun, 0))}")
+                    d = tabel_tampilan(data, ("Debit", "Kredit", "Saldo"))
+                    tampilkan_tabel(d, use_container_width=True, hide_index=True)
 
 elif menu == "⚖️ Neraca Saldo":
     st.markdown("<div class='subtitle'>⚖️ Neraca Saldo</div>", unsafe_allow_html=True)
     if len(st.session_state.transaksi) == 0:
         st.info("Belum ada transaksi.")
     else:
-        df = pd.DataFrame(st.session_state.transaksi)
-        ns = neraca_saldo(df)
-        ns_display = ns.copy()
-        ns_display["Debit"] = ns_display["Debit"].apply(format_rupiah_angka)
-        ns_display["Kredit"] = ns_display["Kredit"].apply(format_rupiah_angka)
-        ns_display["Saldo"] = ns_display["Saldo"].apply(format_rupiah_angka)
-        st.dataframe(ns_display, use_container_width=True)
+        store = st.session_state.transaksi
+        dasar = st.radio("Dasar laporan", ["Periode", "Per Tanggal"], horizontal=True, key="dasar_neraca")
+        if dasar == "Per Tanggal":
+            tanggal = st.date_input("📅 Saldo per tanggal", datetime.now(pytz.timezone('Asia/Jakarta')).date(),
+                                    key="tanggal_neraca")
+        else:
+            periode = pilih_periode(store, "periode_neraca")
+        gulung = st.checkbox("🌳 Tampilkan akun induk (roll-up hierarki)", key="neraca_gulung")
+        if dasar == "Per Tanggal":
+            # Saldo sampai akhir hari itu dari kumulatif per akun (binary search), tanpa menyaring baris
+            st.caption(f"Saldo kumulatif per {tanggal:%d-%m-%Y}")
+            ns = store.agregat.neraca_saldo(gulung=gulung, akhir=batas_rentang((tanggal, tanggal))[1])
+        elif periode is None:
+            ns = store.agregat.neraca_saldo(gulung=gulung)
+        else:
+            st.caption(f"Saldo kumulatif per akhir {nama_periode(periode)}")
+            ns = store.tutup_buku.neraca_saldo(*periode, gulung=gulung)
+        ns_display = tabel_tampilan(ns, ("Debit", "Kredit", "Saldo"))
+        if gulung:
+            # Indentasi nama sesuai kedalaman hierarki
+            ns_display.index = pd.Index(["\u2003" * lv + nama for nama, lv in zip(ns.index, ns["Level"])], name="Akun")
+            ns = ns[ns["Level"] == 0]   # total cukup dari akun puncak agar tidak terhitung ganda
+        tampilkan_tabel(ns_display, use_container_width=True)
+        total_debit, total_kredit = int(ns["Debit"].sum()), int(ns["Kredit"].sum())
+        col1, col2 = st.columns(2)
+        col1.metric("Total Debit", format_rupiah_angka(total_debit))
+        col2.metric("Total Kredit", format_rupiah_angka(total_kredit))
+        if total_debit == total_kredit:
+            st.success("✅ Neraca saldo seimbang")
+        else:
+            st.warning(f"⚠️ Selisih Debit - Kredit {format_rupiah_angka(total_debit - total_kredit)}"
+                       f" (dari {store.baris_tanpa_jurnal():,} baris tanpa jurnal)")
+        tidak_seimbang = store.jurnal_tidak_seimbang()
+        if len(tidak_seimbang):
+            st.error(f"❌ {len(tidak_seimbang)} jurnal tidak seimbang")
+            tampilkan_tabel(tabel_tampilan(tidak_seimbang, ("Debit", "Kredit", "Selisih")), use_container_width=True)
+        with st.expander("📚 Bagan Akun"):
+            tampilkan_tabel(store.bagan.frame(), use_container_width=True, hide_index=True)
 
 elif menu == "💰 Laporan Laba Rugi":
     st.markdown("<div class='subtitle'>💰 Laporan Laba Rugi</div>", unsafe_allow_html=True)
     if len(st.session_state.transaksi) == 0:
         st.info("Belum ada transaksi.")
     else:
-        df = pd.DataFrame(st.session_state.transaksi)
-        lr = laporan_laba_rugi(df)
+        store = st.session_state.transaksi
+        dasar = st.radio("Dasar laporan", ["Periode", "Rentang Tanggal"], horizontal=True, key="dasar_laba_rugi")
+        if dasar == "Rentang Tanggal":
+            rentang = st.date_input("📅 Rentang Tanggal", value=(), key="rentang_laba_rugi")
+            mulai, akhir = batas_rentang(rentang)
+            # Rentang bebas dari selisih kumulatif per akun di kedua batas tanggal
+            lr = store.agregat.laporan_laba_rugi(mulai=mulai, akhir=akhir)
+        else:
+            periode = pilih_periode(store, "periode_laba_rugi")
+            # Laba rugi satu periode langsung dari sel agregat bulanan periode itu
+            lr = store.agregat.laporan_laba_rugi(*(periode or ()))
         col1, col2, col3 = st.columns(3)
         col1.markdown(f"<div style='background:#11998e; padding:25px; border-radius:12px; color:#fff; text-align:center;'>\
             <h3>💵 Total Pendapatan</h3><h2>{format_rupiah_angka(lr['Total Pendapatan'])}</h2></div>", unsafe_allow_html=True)
@@ -604,10 +461,13 @@ elif menu == "📈 Grafik":
     if len(st.session_state.transaksi) == 0:
         st.info("Belum ada data.")
     else:
-        df = pd.DataFrame(st.session_state.transaksi)
-        tab1, tab2, tab3 = st.tabs(["📊 Debit per Akun", "📊 Kredit per Akun", "📊 Perbandingan"])
+        import altair as alt
+        store = st.session_state.transaksi
+        # Hanya agregat yang dikirim ke browser, bukan baris transaksi; dimemo per versi buku
+        per_akun, tren = data_grafik(store)
+        tab1, tab2, tab3, tab4 = st.tabs(["📊 Debit per Akun", "📊 Kredit per Akun", "📊 Perbandingan", "📈 Tren Bulanan"])
         with tab1:
-            chart = alt.Chart(df).mark_bar().encode(
+            chart = alt.Chart(per_akun).mark_bar().encode(
                 x=alt.X("Akun:N", title="Akun"),
                 y=alt.Y("Debit:Q", title="Debit (Rp)"),
                 color=alt.Color("Akun:N", legend=None),
@@ -615,7 +475,7 @@ elif menu == "📈 Grafik":
             ).properties(title="Grafik Total Debit per Akun", height=400)
             st.altair_chart(chart, use_container_width=True)
         with tab2:
-            chart = alt.Chart(df).mark_bar().encode(
+            chart = alt.Chart(per_akun).mark_bar().encode(
                 x=alt.X("Akun:N", title="Akun"),
                 y=alt.Y("Kredit:Q", title="Kredit (Rp)"),
                 color=alt.Color("Akun:N", legend=None),
@@ -623,8 +483,7 @@ elif menu == "📈 Grafik":
             ).properties(title="Grafik Total Kredit per Akun", height=400)
             st.altair_chart(chart, use_container_width=True)
         with tab3:
-            df_grouped = df.groupby("Akun")[["Debit", "Kredit"]].sum().reset_index()
-            df_melt = df_grouped.melt(id_vars="Akun", value_vars=["Debit", "Kredit"], var_name="Tipe", value_name="Jumlah")
+            df_melt = per_akun.melt(id_vars="Akun", value_vars=["Debit", "Kredit"], var_name="Tipe", value_name="Jumlah")
             chart = alt.Chart(df_melt).mark_bar().encode(
                 x=alt.X("Akun:N", title="Akun"),
                 y=alt.Y("Jumlah:Q", title="Jumlah (Rp)"),
@@ -633,115 +492,217 @@ elif menu == "📈 Grafik":
                 tooltip=["Akun", "Tipe", "Jumlah"]
             ).properties(title="Perbandingan Debit vs Kredit per Akun", height=400)
             st.altair_chart(chart, use_container_width=True)
+        with tab4:
+            tren_melt = tren.melt(id_vars="Periode", value_vars=["Pendapatan", "Beban", "Laba/Rugi"],
+                                  var_name="Tipe", value_name="Jumlah")
+            chart = alt.Chart(tren_melt).mark_line(point=True).encode(
+                x=alt.X("yearmonth(Periode):T", title="Bulan"),
+                y=alt.Y("Jumlah:Q", title="Jumlah (Rp)"),
+                color=alt.Color("Tipe:N", scale=alt.Scale(domain=["Pendapatan", "Beban", "Laba/Rugi"])),
+                tooltip=[alt.Tooltip("yearmonth(Periode):T", title="Bulan"), "Tipe", "Jumlah"]
+            ).properties(title="Tren Pendapatan dan Beban per Bulan", height=400)
+            st.altair_chart(chart, use_container_width=True)
+
+elif menu == "🔒 Tutup Buku":
+    st.markdown("<div class='subtitle'>🔒 Tutup Buku Periode</div>", unsafe_allow_html=True)
+    store = st.session_state.transaksi
+    tutup_buku = store.tutup_buku
+    ditutup = tutup_buku.periode_tutup()
+    if ditutup:
+        st.info(f"🔒 Buku sudah ditutup sampai **{nama_periode(ditutup[-1])}**. Transaksi sampai periode ini tidak bisa ditambah atau dihapus.")
+    else:
+        st.info("Belum ada periode yang ditutup.")
+
+    bulan_berjalan = store.periode.bulan_berjalan()
+    kandidat = [p for p in store.periode.daftar() if (not ditutup or p > ditutup[-1]) and p < bulan_berjalan]
+    if kandidat:
+        periode_tutup = st.selectbox("Tutup buku sampai periode:", kandidat, index=len(kandidat) - 1, format_func=nama_periode)
+        st.warning("⚠️ Setelah ditutup, transaksi pada periode tersebut dan sebelumnya terkunci.")
+        if st.button("🔒 Tutup Buku"):
+            try:
+                tutup_buku.tutup(*periode_tutup)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                st.success(f"✅ Buku ditutup sampai {nama_periode(periode_tutup)}")
+                st.rerun()
+
+    if ditutup:
+        st.markdown(f"### 📸 Saldo Penutupan {nama_periode(ditutup[-1])}")
+        tampilkan_tabel(tabel_tampilan(tutup_buku.neraca_saldo(*ditutup[-1]), ("Debit", "Kredit", "Saldo")),
+                     use_container_width=True)
+        if st.button("🔍 Validasi Snapshot"):
+            hasil = tutup_buku.validasi()
+            salah = hasil[~hasil["Cocok"]]
+            if len(salah) == 0:
+                st.success(f"✅ Semua snapshot ({len(ditutup)} periode) cocok dengan hitung ulang penuh.")
+            else:
+                st.error(f"❌ {len(salah)} saldo snapshot tidak cocok dengan hitung ulang penuh.")
+                tampilkan_tabel(salah, use_container_width=True, hide_index=True)
 
 elif menu == "📥 Import Excel":
     st.markdown("<div class='subtitle'>📥 Import Transaksi dari File Excel</div>", unsafe_allow_html=True)
     
-    st.info("💡 Tips: Gunakan sheet 'Data Import' atau 'Jurnal Umum' dari file export untuk import data transaksi")
+    st.info("💡 Tips: Gunakan sheet 'Data Import' atau 'Jurnal Umum' dari file export untuk import data transaksi. File CSV/Parquet/Arrow dengan kolom yang sama (mis. hasil export Parquet/Arrow) juga didukung.")
     
-    uploaded_file = st.file_uploader("Upload file Excel (.xlsx)", type=["xlsx"])
+    uploaded_file = st.file_uploader("Upload file Excel (.xlsx), CSV, Parquet atau Arrow",
+                                     type=["xlsx", "csv", "parquet", "arrow", "feather"])
     if uploaded_file:
         try:
-            # Baca semua sheet yang tersedia
-            excel_file = pd.ExcelFile(uploaded_file)
-            all_sheets = excel_file.sheet_names
-            
-            # Filter hanya sheet yang valid untuk import
-            valid_sheets = []
-            expected_cols = ["Tanggal", "Akun", "Keterangan", "Debit", "Kredit"]
-            
-            for sheet in all_sheets:
-                try:
-                    df_test = pd.read_excel(uploaded_file, sheet_name=sheet, nrows=1)
-                    if all(col in df_test.columns for col in expected_cols):
-                        valid_sheets.append(sheet)
-                except:
-                    continue
-            
-            if len(valid_sheets) == 0:
-                st.error(f"❌ Tidak ada sheet yang valid untuk import!")
-                st.warning(f"📋 Sheet yang tersedia: {', '.join(all_sheets)}")
-                st.info(f"✅ Sheet harus memiliki kolom: {', '.join(expected_cols)}")
-            else:
-                # Prioritaskan "Data Import" jika ada
-                if "Data Import" in valid_sheets:
-                    default_idx = valid_sheets.index("Data Import")
-                else:
-                    default_idx = 0
-                
-                # Pilih sheet
-                if len(valid_sheets) > 1:
-                    selected_sheet = st.selectbox("📑 Pilih Sheet:", valid_sheets, index=default_idx)
+            jenis = jenis_file_import(uploaded_file.name)
+            selected_sheet, baris_header = None, 1
+            siap = True
+            if jenis == "excel":
+                # Cari sheet yang valid untuk import (header boleh di bawah judul)
+                all_sheets, valid_sheets = sheet_valid_excel(uploaded_file)
+                if len(valid_sheets) == 0:
+                    siap = False
+                    st.error(f"❌ Tidak ada sheet yang valid untuk import!")
+                    st.warning(f"📋 Sheet yang tersedia: {', '.join(all_sheets)}")
+                    st.info(f"✅ Sheet harus memiliki kolom: {', '.join(KOLOM_TRANSAKSI)}")
                 else:
-                    selected_sheet = valid_sheets[0]
-                    st.success(f"✅ Sheet terdeteksi: **{selected_sheet}**")
-                
-                df_import = pd.read_excel(uploaded_file, sheet_name=selected_sheet)
-                
-                # Fungsi untuk parse format Rupiah ke angka
-                def parse_rupiah(value):
-                    if pd.isna(value) or value == "" or value == "Rp -":
-                        return 0
-                    if isinstance(value, (int, float)):
-                        return int(value)
-                    # Hapus "Rp", spasi, dan titik (pemisah ribuan), ganti koma dengan titik
-                    value_str = str(value).replace("Rp", "").replace(" ", "").replace(".", "").replace(",", ".").strip()
-                    if value_str == "" or value_str == "-":
-                        return 0
-                    try:
-                        return int(float(value_str))
-                    except:
-                        return 0
-                
-                # Proses data
-                df_import["Tanggal"] = pd.to_datetime(df_import["Tanggal"], errors='coerce')
-                df_import = df_import.dropna(subset=["Tanggal"])
+                    nama_sheet = list(valid_sheets)
+                    # Prioritaskan "Data Import" jika ada
+                    if "Data Import" in nama_sheet:
+                        default_idx = nama_sheet.index("Data Import")
+                    else:
+                        default_idx = 0
+                    
+                    # Pilih sheet
+                    if len(nama_sheet) > 1:
+                        selected_sheet = st.selectbox("📑 Pilih Sheet:", nama_sheet, index=default_idx)
+                    else:
+                        selected_sheet = nama_sheet[0]
+                        st.success(f"✅ Sheet terdeteksi: **{selected_sheet}**")
+                    baris_header = valid_sheets[selected_sheet]
+            
+            if siap:
+                # Hasil baca disimpan per file & sheet agar rerun tidak mengurai ulang
+                kunci_import = (uploaded_file.file_id, selected_sheet)
+                cache = st.session_state.get("import_cache")
+                if cache is None or cache[0] != kunci_import:
+                    with st.spinner("Membaca file..."):
+                        uploaded_file.seek(0)
+                        df_baru = baca_import(uploaded_file, jenis, selected_sheet, baris_header)
+                    st.session_state.import_cache = (kunci_import, df_baru)
+                df_import = st.session_state.import_cache[1]
+                store = st.session_state.transaksi
                 
-                # Parse Debit dan Kredit (support format Rupiah atau angka biasa)
-                df_import["Debit"] = df_import["Debit"].apply(parse_rupiah)
-                df_import["Kredit"] = df_import["Kredit"].apply(parse_rupiah)
+                # Akun yang belum ada di bagan tidak didaftarkan otomatis: petakan ke akun yang ada,
+                # atau buat akun baru dengan kode dan tipe yang dipilih (didaftarkan saat import berhasil)
+                peta_akun, akun_baru, akun_lengkap = {}, [], True
+                tidak_dikenal = store.bagan.tidak_dikenal(df_import["Akun"])
+                if tidak_dikenal:
+                    st.warning(f"⚠️ {len(tidak_dikenal)} akun di file belum ada di bagan akun. Petakan ke akun yang ada, "
+                               "atau pilih **Buat akun baru** lalu isi kode dan tipenya.")
+                    buat_baru = "➕ Buat akun baru"
+                    kode_awal = store.bagan.kode_berikut()
+                    pemetaan = st.data_editor(
+                        pd.DataFrame({"Akun di file": tidak_dikenal, "Petakan ke": [None] * len(tidak_dikenal),
+                                      "Kode": range(kode_awal, kode_awal + len(tidak_dikenal)),
+                                      "Tipe": [None] * len(tidak_dikenal), "Kode Induk": [float("nan")] * len(tidak_dikenal)}),
+                        column_config={
+                            "Petakan ke": st.column_config.SelectboxColumn(
+                                "Petakan ke", options=[buat_baru] + store.bagan.akun_posting()),
+                            "Kode": st.column_config.NumberColumn("Kode (akun baru)", min_value=1, step=1, format="%d"),
+                            "Tipe": st.column_config.SelectboxColumn("Tipe (akun baru)", options=TIPE_AKUN),
+                            "Kode Induk": st.column_config.NumberColumn("Kode Induk (opsional)", min_value=1, step=1,
+                                                                        format="%d"),
+                        },
+                        disabled=["Akun di file"], hide_index=True, use_container_width=True,
+                        key=f"akun_import_{uploaded_file.file_id}_{selected_sheet}")
+                    for nama, tujuan, kode, tipe, induk in zip(*(pemetaan[k] for k in pemetaan.columns)):
+                        if tujuan == buat_baru and tipe is not None and not pd.isna(kode):
+                            akun_baru.append((int(kode), nama, tipe, None if pd.isna(induk) else int(induk)))
+                        elif tujuan is not None and tujuan != buat_baru:
+                            peta_akun[nama] = tujuan
+                        else:
+                            akun_lengkap = False
+                    if not akun_lengkap:
+                        st.info("💡 Setiap akun harus dipetakan atau dibuat (dengan tipe) sebelum import.")
+                    if peta_akun:
+                        df_import = df_import.assign(Akun=df_import["Akun"].replace(peta_akun))
                 
-                # Filter baris yang valid (ada Debit atau Kredit)
-                df_import = df_import[(df_import["Debit"] > 0) | (df_import["Kredit"] > 0)]
+                # Cek duplikat terhadap buku; dihitung ulang hanya jika buku atau pemetaan akun berubah
+                kunci_status = (kunci_import, id(store), store.version, tuple(sorted(peta_akun.items())))
+                cek = st.session_state.get("import_status")
+                if cek is None or cek[0] != kunci_status:
+                    st.session_state.import_status = (kunci_status, store.duplikat.klasifikasi(df_import))
+                status = st.session_state.import_status[1]
                 
                 if len(df_import) == 0:
                     st.warning("⚠️ Tidak ada data transaksi valid yang ditemukan di sheet ini.")
                 else:
+                    jumlah_baru = int((status == IndeksDuplikat.BARU).sum())
+                    jumlah_duplikat = int((status == IndeksDuplikat.DUPLIKAT).sum())
+                    jumlah_konflik = int((status == IndeksDuplikat.KONFLIK).sum())
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("🆕 Baru", jumlah_baru)
+                    col2.metric("🔁 Duplikat", jumlah_duplikat)
+                    col3.metric("⚠️ Konflik", jumlah_konflik)
+                    if jumlah_konflik > 0:
+                        st.warning("⚠️ Transaksi konflik memiliki Tanggal, Akun dan Keterangan yang sama dengan transaksi di buku, tetapi nominalnya berbeda.")
+                    lewati_duplikat = st.checkbox("Lewati transaksi duplikat", value=True)
+                    df_tambah = df_import[status != IndeksDuplikat.DUPLIKAT] if lewati_duplikat else df_import
+                    # Jurnal di file harus seimbang (baris tanpa nomor jurnal dihitung satu jurnal);
+                    # melewati duplikat juga bisa memotong sebagian jurnal
+                    tanpa_nomor = int((df_tambah["Jurnal"] == TANPA_JURNAL).sum())
+                    baris_lama = tanpa_nomor > 0 and st.checkbox(
+                        f"Simpan {tanpa_nomor} baris tanpa nomor jurnal sebagai baris lama (tanpa jurnal)", value=False,
+                        help="Untuk file dari versi sebelum ada jurnal (mis. export lama tanpa kolom Jurnal). "
+                             "Baris lama tidak diperiksa keseimbangannya dan dihapus per baris.")
+                    lokal = df_tambah["Jurnal"] if baris_lama else satukan_tanpa_nomor(df_tambah["Jurnal"])
+                    tidak_seimbang = jurnal_tidak_seimbang(lokal, df_tambah["Debit"], df_tambah["Kredit"])
+                    if len(tidak_seimbang):
+                        st.error(f"❌ {len(tidak_seimbang)} jurnal tidak seimbang; perbaiki file sebelum import")
+                        if tanpa_nomor and not baris_lama:
+                            st.info("💡 Semua baris tanpa nomor jurnal dihitung satu jurnal. Kelompokkan baris lewat "
+                                    "kolom Jurnal di file, atau centang opsi baris lama di atas.")
+                        tampilkan_tabel(tabel_tampilan(tidak_seimbang, ("Debit", "Kredit", "Selisih")),
+                                        use_container_width=True)
+                    
                     st.markdown(f"### 📋 Preview Data ({len(df_import)} transaksi)")
-                    preview = df_import.copy()
-                    preview["Tanggal"] = preview["Tanggal"].apply(format_tanggal)
-                    preview["Debit"] = preview["Debit"].apply(format_rupiah_angka)
-                    preview["Kredit"] = preview["Kredit"].apply(format_rupiah_angka)
-                    st.dataframe(preview, use_container_width=True)
+                    preview = tabel_tampilan(df_import.head(BARIS_PREVIEW_IMPORT))
+                    preview["Status"] = status[:len(preview)]
+                    tampilkan_tabel(preview, use_container_width=True)
+                    if len(df_import) > BARIS_PREVIEW_IMPORT:
+                        st.caption(f"Menampilkan {BARIS_PREVIEW_IMPORT} dari {len(df_import)} transaksi.")
                     
                     st.markdown("---")
                     col1, col2 = st.columns(2)
                     with col1:
-                        if st.button("✅ Tambahkan Semua Transaksi", use_container_width=True):
-                            for _, row in df_import.iterrows():
-                                tambah_transaksi(row["Tanggal"], row["Akun"], row["Keterangan"], row["Debit"], row["Kredit"])
-                            st.success(f"🎉 Berhasil menambahkan {len(df_import)} transaksi!")
-                            st.balloons()
-                            st.rerun()
+                        if st.button("✅ Tambahkan Semua Transaksi", use_container_width=True, disabled=len(df_tambah) == 0 or len(tidak_seimbang) > 0 or not akun_lengkap):
+                            try:
+                                tambah_transaksi_banyak(df_tambah, tanpa_jurnal=baris_lama, akun_baru=akun_baru)
+                            except ValueError as e:
+                                st.error(f"❌ {e}")
+                            else:
+                                st.session_state.pop("import_cache", None)
+                                st.session_state.pop("import_status", None)
+                                st.success(f"🎉 Berhasil menambahkan {len(df_tambah)} transaksi!")
+                                st.balloons()
+                                st.rerun()
                     with col2:
                         if st.button("❌ Batal", use_container_width=True):
+                            st.session_state.pop("import_cache", None)
+                            st.session_state.pop("import_status", None)
                             st.rerun()
                             
+        except ImportError as e:
+            st.error(f"❌ Membaca file Parquet/Arrow membutuhkan paket pyarrow: {e}")
         except Exception as e:
             st.error(f"❌ Error membaca file: {e}")
-            st.info("💡 Pastikan file Excel Anda memiliki format yang benar")
+            st.info("💡 Pastikan file Anda memiliki format yang benar")
 
 elif menu == "📤 Export Excel":
     st.markdown("<div class='subtitle'>📤 Export Laporan ke Excel</div>", unsafe_allow_html=True)
     if total_transaksi == 0:
         st.info("Belum ada transaksi untuk diexport.")
     else:
-        df = pd.DataFrame(st.session_state.transaksi)
-        df["Tanggal"] = pd.to_datetime(df["Tanggal"])
-        df["Tahun"] = df["Tanggal"].dt.year
-        df["Bulan"] = df["Tanggal"].dt.month
-        
-        tahun_tersedia = sorted(df["Tahun"].unique().tolist())
+        store = st.session_state.transaksi
+        # Pilihan periode dibaca dari indeks partisi, tanpa memuat baris transaksi
+        daftar_periode = store.periode.daftar()
+        tahun_tersedia = sorted({tahun for tahun, _ in daftar_periode})
         
         st.markdown("### 📅 Pilih Periode Export")
         col1, col2 = st.columns(2)
@@ -752,35 +713,91 @@ elif menu == "📤 Export Excel":
         with col2:
             if pilihan_export == "Per Tahun":
                 tahun_pilihan = st.selectbox("Pilih Tahun:", tahun_tersedia)
-                df_filtered = df[df["Tahun"] == tahun_pilihan]
+                jumlah_export = sum(j for (tahun, _), j in daftar_periode.items() if tahun == tahun_pilihan)
             elif pilihan_export == "Per Bulan":
                 tahun_pilihan = st.selectbox("Pilih Tahun:", tahun_tersedia)
-                df_tahun = df[df["Tahun"] == tahun_pilihan]
-                bulan_tersedia = sorted(df_tahun["Bulan"].unique().tolist())
+                bulan_tersedia = [bulan for tahun, bulan in daftar_periode if tahun == tahun_pilihan]
                 bulan_pilihan = st.selectbox("Pilih Bulan:", bulan_tersedia, format_func=lambda x: calendar.month_name[x])
-                df_filtered = df[(df["Tahun"] == tahun_pilihan) & (df["Bulan"] == bulan_pilihan)]
+                jumlah_export = daftar_periode.get((tahun_pilihan, bulan_pilihan), 0)
             else:
-                df_filtered = df
+                jumlah_export = total_transaksi
         
-        st.markdown(f"**Total transaksi yang akan diexport: {len(df_filtered)}**")
+        st.markdown(f"**Total transaksi yang akan diexport: {jumlah_export}**")
         
-        if len(df_filtered) == 0:
+        if jumlah_export == 0:
             st.warning("Tidak ada transaksi untuk periode yang dipilih.")
         else:
-            try:
-                excel_data = export_excel_multi(df_filtered)
-                filename_suffix = ""
-                if pilihan_export == "Per Tahun":
-                    filename_suffix = f"_tahun_{tahun_pilihan}"
-                elif pilihan_export == "Per Bulan":
-                    filename_suffix = f"_tahun_{tahun_pilihan}_bulan_{bulan_pilihan}"
-                
-                st.download_button("Download Laporan Akuntansi.xlsx", excel_data,
-                                    file_name=f"laporan_akuntansi{filename_suffix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-                st.success("File siap diunduh!")
-            except Exception as e:
-                st.error(f"Error saat generate file Excel: {e}")
+            if pilihan_export == "Semua Periode":
+                periode = {}
+                rentang = (None, None)
+            else:
+                periode = {"tahun": tahun_pilihan, "bulan": bulan_pilihan if pilihan_export == "Per Bulan" else None}
+                rentang = batas_periode(**periode)
+
+            format_export = st.radio("Format File:", list(FORMAT_EXPORT), horizontal=True,
+                                     format_func=lambda f: FORMAT_EXPORT[f][0])
+            if format_export != "excel":
+                st.caption("Parquet/Arrow berisi kolom sheet 'Data Import' (Tanggal, Akun, Keterangan, Debit, "
+                           "Kredit, Jurnal) dengan tipe asli; bisa diimport ulang lewat menu Import.")
+
+            def buat_export(progres, periode=periode, rentang=rentang, format_export=format_export):
+                # Baris dibaca di thread export: hanya partisi periode yang dipilih
+                df_export = store.periode.ambil(**periode) if periode else store.frame()
+                if format_export == "parquet":
+                    from akuntansi import export_parquet
+                    return export_parquet(df_export)
+                if format_export == "arrow":
+                    from akuntansi import export_arrow
+                    return export_arrow(df_export)
+                # openpyxl baru dimuat saat export pertama dijalankan
+                from akuntansi import export_excel_multi
+                return export_excel_multi(df_export, bb=store.saldo.buku_besar(*rentang),
+                                          ns=store.agregat.neraca_saldo(**periode),
+                                          lr=store.agregat.laporan_laba_rugi(**periode),
+                                          streaming=True, progres=progres)
+
+            # Hasil dipakai ulang selama filter periode, format dan isi buku tidak berubah
+            kunci = (id(store), store.version, tuple(sorted(periode.items())), format_export)
+            job = manajer_export().minta(kunci, buat_export)
+
+            filename_suffix = ""
+            if pilihan_export == "Per Tahun":
+                filename_suffix = f"_tahun_{tahun_pilihan}"
+            elif pilihan_export == "Per Bulan":
+                filename_suffix = f"_tahun_{tahun_pilihan}_bulan_{bulan_pilihan}"
+            panel_job_export(job, f"laporan_akuntansi{filename_suffix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                             format_export)
+
+elif menu == "⏱️ Performance":
+    st.markdown("<div class='subtitle'>⏱️ Performance</div>", unsafe_allow_html=True)
+    perekam = instrumentasi.perekam
+    semua_rentang = perekam.frame()
+    st.caption(f"{len(semua_rentang)} rentang terakhir (maks {instrumentasi.MAKS_RENTANG}), semua sesi dalam proses ini.")
+    memo = st.session_state.transaksi.memo
+    st.caption(f"Memo buku: {len(memo)}/{memo.maks} entri, {memo.kena} kena, {memo.meleset} dihitung.")
+    log = getattr(st.session_state.transaksi, "log", None)
+    if log is not None:
+        st.caption(f"Log tulis: segmen {log.segmen}, {log.bytes_sejak_snapshot / 1e6:.1f} MB sejak snapshot; "
+                   f"dipulihkan {log.statistik['baris']:,} baris dari {log.statistik['segmen']} segmen.")
+    if semua_rentang.empty:
+        st.info("Belum ada rentang tercatat. Buka halaman lain lalu kembali ke sini.")
+    else:
+        tab1, tab2, tab3 = st.tabs(["📊 Per Tahap", "🔁 Per Rerun", "🕒 Rentang Terbaru"])
+        with tab1:
+            tampilkan_tabel(perekam.ringkasan(), use_container_width=True)
+        with tab2:
+            tampilkan_tabel(perekam.per_rerun(), use_container_width=True, hide_index=True)
+        with tab3:
+            terbaru = semua_rentang.tail(200).iloc[::-1].assign(
+                waktu=lambda d: instrumentasi.waktu_lokal(d["waktu"]), ms=lambda d: d["detik"] * 1000)
+            tampilkan_tabel(terbaru.drop(columns="detik"), use_container_width=True, hide_index=True)
+        col1, col2 = st.columns(2)
+        col1.download_button("⬇️ Export JSON", perekam.json(), file_name="performance.json", mime="application/json")
+        if col2.button("🗑️ Bersihkan Rentang"):
+            perekam.bersihkan()
+            st.rerun()
+
+instrumentasi.selesai_rerun()
 
 # ===================
 # Footer
@@ -792,7 +809,3 @@ st.markdown("""
     <p>Kelola keuangan bisnis Anda dengan mudah dan efisien</p>
 </div>
 """, unsafe_allow_html=True)
-
-
-
-
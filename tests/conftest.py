@@ -0,0 +1,30 @@
+"""Fixture bersama: buku sintetis kecil dan store memori/SQLite."""
+import os
+import sys
+
+import pytest
+
+FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(FOLDER, ".."))
+sys.path.insert(0, os.path.join(FOLDER, "..", "benchmarks"))
+
+from buku_sintetis import buat_buku  # noqa: E402
+
+from akuntansi import SQLiteStore, TransaksiStore  # noqa: E402
+
+@pytest.fixture
+def buku():
+    # 300 jurnal dua baris, Jan 2022 - Des 2023
+    return buat_buku(600, seed=7, tahun_mulai=2022, jumlah_tahun=2)
+
+@pytest.fixture(params=["memori", "sqlite"])
+def buat_store(request, tmp_path):
+    """Pembuat store kosong; SQLite memakai file yang sama setiap dipanggil (untuk uji buka ulang)."""
+    path = str(tmp_path / "buku.db")
+    return TransaksiStore if request.param == "memori" else (lambda: SQLiteStore(path))
+
+@pytest.fixture
+def store(buat_store, buku):
+    s = buat_store()
+    s.tambah_banyak(buku)
+    return s
@@ -0,0 +1,75 @@
+"""Bagan akun: roll-up hierarki di neraca saldo dan akun yang belum ada di bagan."""
+import pandas as pd
+import pytest
+
+from akuntansi import AkunTidakDikenal, BaganAkun, SQLiteStore, buka_buku_log, neraca_saldo
+
+def _batch(akun, debit, kredit):
+    return pd.DataFrame({"Tanggal": pd.Timestamp("2024-03-01"), "Akun": akun, "Keterangan": "uji",
+                         "Debit": debit, "Kredit": kredit, "Jurnal": 1})
+
+def test_gulung_menjumlahkan_keturunan(store):
+    ns = store.agregat.neraca_saldo(gulung=True)
+    posting = neraca_saldo(store.frame(), store.bagan)
+    bagan = store.bagan.frame().set_index("Akun")
+    for induk, anak in [("Aset Lancar", ["Kas", "Piutang"]), ("Beban", ["Beban Gaji", "Beban Listrik", "Beban Sewa",
+                                                                         "Beban Lainnya"])]:
+        anak = [a for a in anak if a in posting.index]
+        assert ns.loc[induk, ["Debit", "Kredit", "Saldo"]].tolist() == \
+            posting.loc[anak, ["Debit", "Kredit", "Saldo"]].sum().tolist(), induk
+    assert ns.loc["Aset", "Saldo"] == ns.loc["Aset Lancar", "Saldo"]
+    assert (ns["Level"] == bagan.loc[ns.index, "Level"]).all()
+    # Tanpa gulung hanya akun posting yang tampil
+    assert set(store.agregat.neraca_saldo().index) == set(posting.index)
+
+def test_bagan_dari_frame_urutan_bebas():
+    bagan = BaganAkun.dari_frame(pd.DataFrame({"Kode": [1101, 1100, 1000], "Nama": ["Kas", "Aset Lancar", "Aset"],
+                                               "Tipe": ["aset"] * 3, "Induk": [1100, 1000, None]}))
+    assert bagan.frame()["Level"].tolist() == [0, 1, 2]
+    with pytest.raises(ValueError):
+        BaganAkun.dari_frame(pd.DataFrame({"Kode": [1], "Nama": ["X"], "Tipe": ["aset"], "Induk": [7]}))
+
+def test_akun_tidak_dikenal_ditolak(buat_store):
+    store = buat_store()
+    n = len(store.bagan)
+    with pytest.raises(AkunTidakDikenal) as info:
+        store.tambah_banyak(_batch(["Kas", "Bank BCA"], [1000, 0], [0, 1000]))
+    assert info.value.akun == ["Bank BCA"]
+    assert len(store.bagan) == n and len(store.frame()) == 0
+
+def test_akun_baru_didaftarkan_bersama_batch(buat_store):
+    store = buat_store()
+    n = len(store.bagan)
+    # Akun baru yang salah (induk beda tipe) menolak seluruh batch; bagan tidak berubah
+    with pytest.raises(ValueError):
+        store.tambah_banyak(_batch(["Bank BCA", "Modal"], [1000, 0], [0, 1000]),
+                            akun_baru=[(1103, "Bank BCA", "aset", 4000)])
+    with pytest.raises(ValueError):
+        store.tambah_banyak(_batch(["Bank BCA", "Modal"], [1000, 0], [0, 900]),
+                            akun_baru=[(1103, "Bank BCA", "aset", 1100)])
+    assert len(store.bagan) == n and "Bank BCA" not in store.bagan
+
+    store.tambah_banyak(_batch(["Bank BCA", "Modal"], [1000, 0], [0, 1000]), akun_baru=[(1103, "Bank BCA", "aset", 1100)])
+    assert store.agregat.neraca_saldo(gulung=True).loc["Aset Lancar", "Saldo"] == 1000
+    assert store.bagan.frame().set_index("Akun").loc["Bank BCA", "Induk"] == 1100
+
+    if isinstance(store, SQLiteStore):
+        ulang = SQLiteStore(store.path)
+        assert ulang.bagan.frame().equals(store.bagan.frame())
+        assert ulang.frame()["Akun"].tolist() == ["Bank BCA", "Modal"]
+
+def test_akun_baru_dipulihkan_dari_log(tmp_path):
+    store = buka_buku_log(str(tmp_path), jeda_fsync=0.05)
+    store.tambah_banyak(_batch(["Bank BCA", "Modal"], [1000, 0], [0, 1000]), akun_baru=[(1103, "Bank BCA", "aset", 1100)])
+    store.log.padatkan(tunggu=True)
+    store.tambah_banyak(_batch(["Pendapatan Sewa", "Kas"], [0, 500], [500, 0]),
+                        akun_baru=[(4103, "Pendapatan Sewa", "pendapatan", 4000)])
+    harapan = store.bagan.frame()
+    store.log.akhiri()
+
+    pulih = buka_buku_log(str(tmp_path), jeda_fsync=0.05)
+    try:
+        assert pulih.bagan.frame().equals(harapan)
+        assert pulih.agregat.laporan_laba_rugi()["Total Pendapatan"] == 500
+    finally:
+        pulih.log.akhiri()
@@ -0,0 +1,77 @@
+"""Buku bersama: penulis serentak dari banyak thread dan memo yang dihitung di luar kunci."""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from akuntansi import neraca_saldo
+
+PENULIS, JURNAL_PER_PENULIS = 4, 25
+
+def test_penulis_serentak(store):
+    awal = len(store.frame())
+    galat = []
+    henti = threading.Event()
+
+    def tulis(nomor):
+        try:
+            for i in range(JURNAL_PER_PENULIS):
+                tanggal = pd.Timestamp("2023-06-01") + pd.Timedelta(hours=nomor * 100 + i)
+                store.tambah_jurnal(tanggal, f"penulis {nomor}-{i}", [("Beban Gaji", 1000 + i, 0), ("Kas", 0, 1000 + i)])
+        except Exception as e:   # pragma: no cover - dilaporkan lewat assert di bawah
+            galat.append(e)
+
+    def baca():
+        try:
+            while not henti.is_set():
+                ns = store.agregat.neraca_saldo()
+                assert ns["Debit"].sum() == ns["Kredit"].sum()
+                store.cari(urut="Akun", batas=20)
+                store.saldo.buku_besar()
+        except Exception as e:   # pragma: no cover
+            galat.append(e)
+
+    pembaca = threading.Thread(target=baca)
+    pembaca.start()
+    penulis = [threading.Thread(target=tulis, args=(n,)) for n in range(PENULIS)]
+    for t in penulis:
+        t.start()
+    for t in penulis:
+        t.join()
+    henti.set()
+    pembaca.join()
+
+    assert galat == []
+    df = store.frame()
+    baru = df.iloc[awal:]
+    assert len(baru) == 2 * PENULIS * JURNAL_PER_PENULIS
+    # Setiap jurnal dapat nomor sendiri dan tetap utuh dua baris
+    assert (baru.groupby("Jurnal").size() == 2).all()
+    assert baru["Jurnal"].nunique() == PENULIS * JURNAL_PER_PENULIS
+    assert len(store.jurnal_tidak_seimbang()) == 0
+    hasil, acuan = store.agregat.neraca_saldo(), neraca_saldo(df, store.bagan)
+    assert hasil[["Debit", "Kredit", "Saldo"]].equals(acuan[["Debit", "Kredit", "Saldo"]])
+
+def test_memo_dihitung_di_luar_kunci(buat_store):
+    store = buat_store()
+    store.tambah_jurnal("2024-01-02", "Awal", [("Kas", 1000, 0), ("Modal", 0, 1000)])
+    mulai, tulis_selesai = threading.Event(), threading.Event()
+
+    def hitung():
+        mulai.set()
+        # Penulis harus bisa selesai selama hitung berjalan; bila memo memegang kunci, ini habis waktu
+        assert tulis_selesai.wait(10)
+        return "lama"
+
+    hasil = []
+    pembaca = threading.Thread(target=lambda: hasil.append(store.memo.ambil("uji", hitung)))
+    pembaca.start()
+    assert mulai.wait(10)
+    store.tambah_jurnal("2024-01-03", "Selama hitung", [("Kas", 500, 0), ("Modal", 0, 500)])
+    tulis_selesai.set()
+    pembaca.join()
+
+    assert hasil == ["lama"]
+    # Versi berubah selama dihitung: hasil lama tidak disimpan untuk versi baru
+    assert store.memo.ambil("uji", lambda: "baru") == "baru"
+    assert np.array_equal(store.agregat.neraca_saldo()["Saldo"].to_numpy(), [1500, 1500])
@@ -0,0 +1,40 @@
+"""CLI laporan batch: file hasil per entitas/periode dan kode keluar."""
+import os
+
+import pandas as pd
+import pytest
+
+from akuntansi import SQLiteStore
+from akuntansi.cli import main
+
+pytest.importorskip("pyarrow")
+
+def _jalankan(tmp_path, *argv):
+    keluar = tmp_path / "laporan"
+    kode = main([*map(str, argv), "--keluar", str(keluar), "--pekerja", "1"])
+    return kode, sorted(os.listdir(keluar))
+
+def test_buku_valid_kode_nol(tmp_path, buku):
+    buku.to_csv(tmp_path / "kantor_a.csv", index=False)
+    SQLiteStore(str(tmp_path / "kantor_b.db")).tambah_banyak(buku)
+    kode, file = _jalankan(tmp_path, tmp_path / "kantor_a.csv", tmp_path / "kantor_b.db",
+                           "--periode", "2022-03", "--periode", "2023")
+    assert kode == 0
+    assert file == ["kantor_a_2022-03.xlsx", "kantor_a_2023.xlsx", "kantor_b_2022-03.xlsx", "kantor_b_2023.xlsx"]
+    kode, file = _jalankan(tmp_path, tmp_path / "kantor_b.db", "--periode", "semua", "--format", "parquet")
+    assert kode == 0 and "kantor_b_semua.parquet" in file
+    assert len(pd.read_parquet(tmp_path / "laporan" / "kantor_b_semua.parquet")) == len(buku)
+
+def test_buku_gagal_kode_satu(tmp_path, buku):
+    # Tanpa kolom Jurnal dan tidak seimbang: ditolak kecuali dimuat sebagai baris lama
+    lama = buku.drop(columns="Jurnal").iloc[:-1]
+    lama.to_csv(tmp_path / "lama.csv", index=False)
+    kode, file = _jalankan(tmp_path, tmp_path / "lama.csv", "--periode", "2022")
+    assert kode == 1 and file == []
+    kode, file = _jalankan(tmp_path, tmp_path / "lama.csv", "--periode", "2022", "--baris-lama")
+    assert kode == 0 and file == ["lama_2022.xlsx"]
+
+    buku.assign(Akun=buku["Akun"].replace({"Kas": "Bank BCA"})).to_csv(tmp_path / "akun_asing.csv", index=False)
+    assert _jalankan(tmp_path, tmp_path / "akun_asing.csv", "--periode", "2022")[0] == 1
+    assert _jalankan(tmp_path, tmp_path / "tidak_ada.db", "--periode", "2022")[0] == 1
+    assert not os.path.exists(tmp_path / "tidak_ada.db")
@@ -0,0 +1,29 @@
+"""IndeksDuplikat: status Baru/Duplikat/Konflik baris calon import terhadap isi buku."""
+import pandas as pd
+
+def test_klasifikasi_baris_import(store, buku):
+    dup = store.duplikat
+    calon = pd.concat([
+        buku.iloc[:2],
+        # Tanggal dibandingkan per detik karena export hanya menyimpan sampai detik
+        buku.iloc[2:3].assign(Tanggal=buku["Tanggal"].iloc[2:3] + pd.Timedelta(milliseconds=400)),
+        # Tanggal, akun dan keterangan sama tetapi nominal beda
+        buku.iloc[3:4].assign(Debit=buku["Debit"].iloc[3:4] + 1, Kredit=buku["Kredit"].iloc[3:4] + 1),
+        buku.iloc[4:5].assign(Keterangan="Belum pernah ada"),
+    ])
+    assert dup.klasifikasi(calon).tolist() == [dup.DUPLIKAT, dup.DUPLIKAT, dup.DUPLIKAT, dup.KONFLIK, dup.BARU]
+
+def test_baris_kembar_dihitung_sesuai_salinan_di_buku(buat_store):
+    store = buat_store()
+    dup = store.duplikat
+    jurnal = [("Kas", 1000, 0), ("Modal", 0, 1000)]
+    store.tambah_jurnal("2024-01-02", "Setoran", jurnal)
+    baris = store.frame().iloc[:1][["Tanggal", "Akun", "Keterangan", "Debit", "Kredit"]]
+    assert dup.klasifikasi(pd.concat([baris] * 3)).tolist() == [dup.DUPLIKAT, dup.BARU, dup.BARU]
+
+    # Indeks ikut tambah dan hapus
+    store.tambah_jurnal("2024-01-02", "Setoran", jurnal)
+    assert dup.klasifikasi(pd.concat([baris] * 3)).tolist() == [dup.DUPLIKAT, dup.DUPLIKAT, dup.BARU]
+    for nomor in store.frame()["Jurnal"].unique():
+        store.hapus_jurnal(int(nomor))
+    assert dup.klasifikasi(baris).tolist() == [dup.BARU]
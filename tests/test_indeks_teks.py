@@ -0,0 +1,44 @@
+"""Indeks teks Keterangan: kata, awalan (bayar*) dan frasa ("beban listrik") di memori dan FTS5 SQLite."""
+import pytest
+
+KETERANGAN = ["Bayar listrik PLN Januari", "Pembayaran listrik", "Beban listrik kantor", "Listrik, beban bulan ini",
+              "BKT-0001 bayar sewa", "Bayarlah segera", "Gaji karyawan"]
+
+@pytest.fixture
+def store(buat_store):
+    s = buat_store()
+    for i, ket in enumerate(KETERANGAN):
+        s.tambah_jurnal(f"2024-01-{i + 1:02d}", ket, [("Beban Lainnya", 1000 * (i + 1), 0), ("Kas", 0, 1000 * (i + 1))])
+    return s
+
+def _keterangan(store, kueri):
+    jumlah, df = store.cari(teks=kueri, urut="ID", batas=100)
+    assert jumlah == len(df)
+    # Dua baris per jurnal, keterangan sama
+    return sorted(set(df["Keterangan"]))
+
+@pytest.mark.parametrize("kueri, harapan", [
+    ("listrik", ["Bayar listrik PLN Januari", "Beban listrik kantor", "Listrik, beban bulan ini", "Pembayaran listrik"]),
+    ("LISTRIK januari", ["Bayar listrik PLN Januari"]),
+    ("bayar*", ["BKT-0001 bayar sewa", "Bayar listrik PLN Januari", "Bayarlah segera"]),
+    ("bayar", ["BKT-0001 bayar sewa", "Bayar listrik PLN Januari"]),
+    ('"beban listrik"', ["Beban listrik kantor"]),
+    ('"listrik beban"', ["Listrik, beban bulan ini"]),
+    ('"beban list"*', ["Beban listrik kantor"]),
+    ("bkt-0001", ["BKT-0001 bayar sewa"]),
+    ("kar* gaji", ["Gaji karyawan"]),
+    ("sewa listrik", []),
+])
+def test_kueri_teks(store, kueri, harapan):
+    assert _keterangan(store, kueri) == harapan
+    ids = store.teks.cocok(kueri)
+    assert sorted(set(store.frame().loc[ids, "Keterangan"])) == harapan
+
+def test_teks_dengan_filter_lain_dan_hapus(store):
+    jumlah, df = store.cari(teks="listrik", akun=["Kas"], urut="ID")
+    assert jumlah == 4 and set(df["Akun"]) == {"Kas"}
+    store.hapus_jurnal(int(df["Jurnal"].iat[0]))
+    assert _keterangan(store, "listrik") == ["Beban listrik kantor", "Listrik, beban bulan ini", "Pembayaran listrik"]
+    store.tambah_jurnal("2024-02-01", "Listrik Februari", [("Beban Listrik", 500, 0), ("Kas", 0, 500)])
+    assert _keterangan(store, "listrik feb*") == ["Listrik Februari"]
+    assert store.teks.cocok("") is None
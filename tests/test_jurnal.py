@@ -0,0 +1,60 @@
+"""Validasi keseimbangan jurnal di tambah_jurnal dan tambah_banyak, dan import baris lama tanpa jurnal."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from akuntansi import JurnalTidakSeimbang, TANPA_JURNAL, jurnal_tidak_seimbang, satukan_tanpa_nomor
+
+def _batch(debit, kredit, jurnal=None):
+    df = pd.DataFrame({"Tanggal": pd.Timestamp("2024-02-01 09:00"), "Akun": ["Kas", "Pendapatan Jasa", "Piutang"][:len(debit)],
+                       "Keterangan": "uji", "Debit": debit, "Kredit": kredit})
+    return df if jurnal is None else df.assign(Jurnal=jurnal)
+
+def test_tambah_jurnal_tidak_seimbang_ditolak(buat_store):
+    store = buat_store()
+    with pytest.raises(JurnalTidakSeimbang) as info:
+        store.tambah_jurnal("2024-01-05", "Salah ketik", [("Kas", 100_000, 0), ("Modal", 0, 10_000)])
+    assert info.value.rincian["Selisih"].abs().tolist() == [90_000]
+    assert len(store.frame()) == 0
+    store.tambah_jurnal("2024-01-05", "Benar", [("Kas", 100_000, 0), ("Modal", 0, 60_000), ("Piutang", 0, 40_000)])
+    assert store.frame()["Jurnal"].nunique() == 1
+
+def test_batch_tanpa_kolom_jurnal_diperiksa_sebagai_satu_jurnal(buat_store):
+    store = buat_store()
+    # Per baris tidak seimbang, tetapi seluruh batch seimbang: diterima sebagai satu jurnal
+    store.tambah_banyak(_batch([300_000, 0, 0], [0, 200_000, 100_000]))
+    jurnal = store.frame()["Jurnal"]
+    assert jurnal.nunique() == 1 and int(jurnal.iat[0]) != TANPA_JURNAL
+
+def test_file_lama_diimport_sebagai_baris_lama(buat_store):
+    store = buat_store()
+    # Export versi lama: tanpa kolom Jurnal, satu baris per transaksi, tidak seimbang per batch
+    lama = pd.DataFrame({"Tanggal": pd.to_datetime(["2024-01-02", "2024-01-03"]), "Akun": ["Kas", "Beban Gaji"],
+                         "Keterangan": ["Setoran", "Gaji"], "Debit": [1000, 0], "Kredit": [0, 500]})
+    store.tambah_banyak(lama, tanpa_jurnal=True)
+    df = store.frame()
+    assert df["Jurnal"].tolist() == [TANPA_JURNAL, TANPA_JURNAL]
+    assert store.baris_tanpa_jurnal() == 2 and len(store.jurnal_tidak_seimbang()) == 0
+    store.hapus(int(df.index[1]))
+    assert len(store.frame()) == 1
+
+    # Jurnal bernomor di batch yang sama tetap diperiksa
+    with pytest.raises(JurnalTidakSeimbang):
+        store.tambah_banyak(_batch([1000, 0, 700], [0, 900, 0], jurnal=[1, 1, 0]), tanpa_jurnal=True)
+    store.tambah_banyak(_batch([1000, 0, 700], [0, 1000, 0], jurnal=[1, 1, 0]), tanpa_jurnal=True)
+    assert store.frame()["Jurnal"].tolist()[1:] == [1, 1, TANPA_JURNAL]
+
+def test_nomor_lokal_batch_dipetakan_ke_nomor_baru(buat_store):
+    store = buat_store()
+    store.tambah_banyak(_batch([1000, 0], [0, 1000], jurnal=[1, 1]))
+    # Nomor 1 sudah dipakai batch pertama; baris tanpa nomor jadi jurnal sendiri
+    store.tambah_banyak(_batch([2000, 0, 500], [0, 2000, 500], jurnal=[1, 1, 0]))
+    assert store.frame()["Jurnal"].tolist() == [1, 1, 2, 2, 3]
+    with pytest.raises(JurnalTidakSeimbang):
+        store.tambah_banyak(_batch([1000, 0], [0, 1000], jurnal=[1, 2]))
+
+def test_satukan_tanpa_nomor():
+    assert satukan_tanpa_nomor(np.array([0, 3, 0, 1])).tolist() == [4, 3, 4, 1]
+    assert satukan_tanpa_nomor(np.zeros(2, dtype=np.int64)).tolist() == [1, 1]
+    salah = jurnal_tidak_seimbang(np.array([1, 1, 2, 2, 3]), np.array([10, 0, 5, 0, 0]), np.array([0, 10, 0, 4, 0]))
+    assert salah.index.tolist() == [2, 3]
@@ -0,0 +1,32 @@
+"""Export/import Parquet dan Arrow: baca ulang sama dengan buku asal."""
+import io
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from akuntansi import TransaksiStore, baca_import, baca_kolumnar, export_arrow, export_parquet  # noqa: E402
+
+KOLOM = ["Tanggal", "Akun", "Keterangan", "Debit", "Kredit"]
+
+@pytest.mark.parametrize("jenis, tulis", [("parquet", export_parquet), ("arrow", export_arrow)])
+def test_pulang_pergi_sama_dengan_frame(store, tmp_path, jenis, tulis):
+    df = store.frame()
+    harapan = df.sort_values("Tanggal", kind="stable").reset_index(drop=True)
+    path = tmp_path / f"buku.{jenis}"
+    tulis(df, tujuan=str(path))
+    for sumber in (str(path), tulis(df)):
+        hasil = baca_kolumnar(sumber, jenis)
+        pd.testing.assert_frame_equal(hasil[KOLOM].astype({"Akun": object}), harapan[KOLOM].astype({"Akun": object}))
+        assert hasil["Jurnal"].tolist() == harapan["Jurnal"].tolist()
+
+def test_import_parquet_ke_store_baru(store):
+    df = store.frame()
+    data = export_parquet(df)
+    impor = baca_import(io.BytesIO(data), "parquet", ukuran_potongan=128)
+    baru = TransaksiStore()
+    baru.tambah_banyak(impor)
+    assert len(baru.frame()) == len(df)
+    assert baru.agregat.neraca_saldo().equals(store.agregat.neraca_saldo())
+    assert baru.frame()["Jurnal"].nunique() == df["Jurnal"].nunique()
@@ -0,0 +1,76 @@
+"""LogBuku: pemulihan buku memori dari segmen log dan snapshot setelah crash."""
+import os
+import struct
+
+import pandas as pd
+import pytest
+
+from akuntansi import buka_buku_log
+from akuntansi.log_buku import TAMBAH
+
+def _buka(folder):
+    return buka_buku_log(str(folder), jeda_fsync=0.05)
+
+def _segmen_terakhir(folder):
+    return os.path.join(folder, max(f for f in os.listdir(folder) if f.startswith("log-")))
+
+def _isi_buku(folder, buku):
+    store = _buka(folder)
+    store.tambah_banyak(buku)
+    store.hapus_jurnal(int(store.frame()["Jurnal"].iat[10]))
+    store.tutup_buku.tutup(2022, 6)
+    store.tambah_jurnal("2023-01-02", "Sesudah tutup", [("Kas", 7000, 0), ("Modal", 0, 7000)])
+    return store
+
+def test_pulihkan_setelah_ekor_segmen_terpotong(tmp_path, buku):
+    store = _isi_buku(tmp_path, buku)
+    harapan = store.frame()
+    jurnal_berikut = int(harapan["Jurnal"].max()) + 1
+    store.log.akhiri()
+
+    # Proses mati di tengah menulis rekaman: kepala utuh, isi baru sebagian
+    path = _segmen_terakhir(tmp_path)
+    ukuran = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(struct.pack("<cII", TAMBAH, 1000, 0) + b"\x01" * 40)
+
+    pulih = _buka(tmp_path)
+    try:
+        pd.testing.assert_frame_equal(pulih.frame(), harapan)
+        assert os.path.getsize(path) == ukuran
+        assert pulih.tutup_buku.periode_tutup() == [(2022, 6)]
+        with pytest.raises(ValueError):
+            pulih.tambah_jurnal("2022-03-01", "Mundur", [("Kas", 1000, 0), ("Modal", 0, 1000)])
+        pulih.tambah_jurnal("2023-01-03", "Lanjut", [("Kas", 1000, 0), ("Modal", 0, 1000)])
+        assert int(pulih.frame()["Jurnal"].max()) == jurnal_berikut
+    finally:
+        pulih.log.akhiri()
+
+def test_pulihkan_dari_snapshot_dan_segmen_sesudahnya(tmp_path, buku):
+    store = _isi_buku(tmp_path, buku.iloc[:400])
+    store.log.padatkan(tunggu=True)
+    store.tambah_banyak(buku.iloc[400:])
+    store.hapus_jurnal(int(store.frame()["Jurnal"].iat[-1]))
+    harapan = store.frame()
+    store.log.akhiri()
+    assert len([f for f in os.listdir(tmp_path) if f.startswith("snapshot-")]) == 1
+
+    pulih = _buka(tmp_path)
+    try:
+        pd.testing.assert_frame_equal(pulih.frame(), harapan)
+        assert pulih.tutup_buku.validasi()["Cocok"].all()
+    finally:
+        pulih.log.akhiri()
+
+def test_snapshot_rusak_tanpa_cadangan_ditolak(tmp_path, buku):
+    store = _isi_buku(tmp_path, buku.iloc[:100])
+    store.log.padatkan(tunggu=True)
+    store.log.akhiri()
+    snapshot = os.path.join(tmp_path, next(f for f in os.listdir(tmp_path) if f.startswith("snapshot-")))
+    with open(snapshot, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        akhir = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([akhir[0] ^ 0xFF]))
+    with pytest.raises(ValueError, match="rusak"):
+        _buka(tmp_path)
@@ -0,0 +1,52 @@
+"""Store memori/SQLite: ID, nomor jurnal, hapus dan frame yang sudah dibagikan."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from akuntansi import TransaksiStore
+
+def test_frame_sama_dengan_buku(store, buku):
+    df = store.frame()
+    assert len(store) == len(df) == len(buku)
+    assert df.index.is_monotonic_increasing and df.index.is_unique
+    assert df["Tanggal"].dtype == "datetime64[ns]" and df["Debit"].dtype == df["Kredit"].dtype == np.int64
+    assert df["Akun"].astype(object).tolist() == buku["Akun"].tolist()
+    assert df["Debit"].tolist() == buku["Debit"].tolist()
+    # Nomor jurnal lokal batch diganti nomor buku, satu nomor per jurnal asal
+    assert df["Jurnal"].nunique() == buku["Jurnal"].nunique()
+    assert store.terbaru(5).index.tolist() == df.index[-5:].tolist()
+
+def test_hapus_jurnal_dan_baris_lama(buat_store):
+    store = buat_store()
+    store.tambah_jurnal("2024-01-02", "Setoran", [("Kas", 1000, 0), ("Modal", 0, 1000)])
+    lama = pd.DataFrame({"Tanggal": pd.Timestamp("2024-01-03"), "Akun": ["Kas"], "Keterangan": "lama",
+                         "Debit": [50], "Kredit": [0]})
+    (id_lama,) = store.tambah_banyak(lama, tanpa_jurnal=True)
+    df = store.frame()
+    id_jurnal = int(df.index[0])
+
+    # Baris jurnal hanya bisa dihapus bersama jurnalnya
+    with pytest.raises(ValueError):
+        store.hapus(id_jurnal)
+    with pytest.raises(KeyError):
+        store.hapus_jurnal(0)
+    store.hapus(id_lama)
+    store.hapus_jurnal(store.nomor_jurnal(id_jurnal))
+    assert len(store) == 0 and len(store.frame()) == 0
+    with pytest.raises(KeyError):
+        store.hapus(id_lama)
+
+    # ID tidak dipakai ulang setelah dihapus
+    (id_baru, _) = store.tambah_jurnal("2024-01-04", "Lagi", [("Kas", 10, 0), ("Modal", 0, 10)])
+    assert id_baru > id_lama
+    # Frame lama yang sudah dibagikan tidak ikut berubah
+    assert len(df) == 3 and df.loc[id_lama, "Keterangan"] == "lama"
+
+def test_tambah_melewati_kapasitas(buku):
+    store = TransaksiStore(kapasitas=4)
+    awal = store.tambah_banyak(buku.iloc[:4])
+    sebelum = store.frame()
+    store.tambah_banyak(buku.iloc[4:])
+    assert sebelum.index.tolist() == awal.tolist()
+    assert sebelum["Debit"].tolist() == buku["Debit"].iloc[:4].tolist()
+    assert store.frame()["Keterangan"].tolist() == buku["Keterangan"].tolist()
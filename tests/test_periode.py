@@ -0,0 +1,39 @@
+"""PartisiPeriode: baris per (tahun, bulan) dan partisi beku setelah tutup buku."""
+import numpy as np
+import pandas as pd
+
+def periksa_periode(store):
+    df = store.frame()
+    tahun, bulan = df["Tanggal"].dt.year.to_numpy(), df["Tanggal"].dt.month.to_numpy()
+    jumlah = pd.Series(1, index=pd.MultiIndex.from_arrays([tahun, bulan])).groupby(level=[0, 1]).sum()
+    assert store.periode.daftar() == {(int(t), int(b)): int(n) for (t, b), n in jumlah.items()}
+    for t, b in [(2022, 1), (2022, 6), (2023, 12)]:
+        assert store.periode.ambil(t, b).index.tolist() == df.index[(tahun == t) & (bulan == b)].tolist()
+    # Setahun: urut bulan lalu ID
+    setahun = df[tahun == 2023]
+    urut = np.lexsort((setahun.index.to_numpy(), setahun["Tanggal"].dt.month.to_numpy()))
+    assert store.periode.ambil(2023).index.tolist() == setahun.index[urut].tolist()
+
+def test_periode_sama_dengan_frame(store, buku):
+    periksa_periode(store)
+    store.tambah_banyak(buku.iloc[:40].assign(Tanggal=buku["Tanggal"].iloc[:40] + pd.Timedelta(days=300)))
+    for nomor in store.frame()["Jurnal"].unique()[::9]:
+        store.hapus_jurnal(int(nomor))
+    periksa_periode(store)
+
+def test_periode_beku_hanya_setelah_tutup_buku(store):
+    store.periode.ambil(2022)
+    assert not store.periode._beku
+
+    store.tutup_buku.tutup(2022, 6)
+    store.periode.ambil(2022)
+    assert sorted(store.periode._beku) == [(2022, b) for b in range(1, 7)]
+
+    # Salinan dari partisi beku boleh diubah tanpa merusak partisi
+    salinan = store.periode.ambil(2022, 3)
+    salinan["Debit"] = 0
+    df = store.frame()
+    maret = df[(df["Tanggal"] >= "2022-03-01") & (df["Tanggal"] < "2022-04-01")]
+    assert store.periode.ambil(2022, 3)["Debit"].tolist() == maret["Debit"].tolist()
+    store.tambah_jurnal("2022-07-01", "Sesudah tutup", [("Kas", 1000, 0), ("Modal", 0, 1000)])
+    periksa_periode(store)
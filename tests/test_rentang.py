@@ -0,0 +1,44 @@
+"""IndeksRentang: neraca saldo dan laba rugi rentang [mulai, akhir) sama dengan hitung ulang penuh."""
+import numpy as np
+import pandas as pd
+
+from akuntansi import laporan_laba_rugi, neraca_saldo
+
+RENTANG = [(None, None), ("2022-03-15", "2023-02-01"), ("2023-06-01 12:00", None), (None, "2022-01-20")]
+
+def _neraca(ns):
+    return dict(zip(ns.index.astype(object), ns[["Debit", "Kredit", "Saldo"]].to_numpy(dtype=np.int64).tolist()))
+
+def periksa_rentang(store):
+    df = store.frame()
+    for mulai, akhir in RENTANG:
+        cocok = np.ones(len(df), dtype=bool)
+        if mulai is not None:
+            cocok &= (df["Tanggal"] >= pd.Timestamp(mulai)).to_numpy()
+        if akhir is not None:
+            cocok &= (df["Tanggal"] < pd.Timestamp(akhir)).to_numpy()
+        bagian = df[cocok]
+        assert _neraca(store.agregat.neraca_saldo(mulai=mulai, akhir=akhir)) == \
+            _neraca(neraca_saldo(bagian, store.bagan)), (mulai, akhir)
+        assert store.agregat.laporan_laba_rugi(mulai=mulai, akhir=akhir) == \
+            laporan_laba_rugi(bagian, store.bagan), (mulai, akhir)
+
+def test_rentang_sama_dengan_hitung_ulang(store):
+    periksa_rentang(store)
+    # Batas akhir eksklusif: transaksi tepat di `akhir` tidak ikut
+    df = store.frame()
+    tepat = df["Tanggal"].iat[100]
+    assert _neraca(store.agregat.neraca_saldo(akhir=tepat)) == \
+        _neraca(neraca_saldo(df[df["Tanggal"] < tepat], store.bagan))
+    assert _neraca(store.agregat.neraca_saldo(mulai=tepat)) == \
+        _neraca(neraca_saldo(df[df["Tanggal"] >= tepat], store.bagan))
+
+def test_tambah_hapus_mundur_tetap_konsisten(store, buku):
+    periksa_rentang(store)
+    store.tambah_jurnal("2021-12-31 23:59:59", "Setoran awal", [("Kas", 5_000_000, 0), ("Modal", 0, 5_000_000)])
+    mundur = buku.iloc[:40].assign(Tanggal=buku["Tanggal"].iloc[:40] - pd.Timedelta(days=200))
+    store.tambah_banyak(mundur)
+    periksa_rentang(store)
+    for nomor in store.frame()["Jurnal"].unique()[::7]:
+        store.hapus_jurnal(int(nomor))
+    periksa_rentang(store)
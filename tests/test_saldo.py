@@ -0,0 +1,55 @@
+"""MesinSaldo: buku besar inkremental sama dengan hitung ulang penuh dari store.frame()."""
+import pandas as pd
+
+from akuntansi import buku_besar
+
+def periksa_buku_besar(store, mulai=None, akhir=None):
+    # Per akun urut (Tanggal, ID) dengan saldo berjalan; akun urut transaksi pertamanya
+    df = store.frame().sort_values("Tanggal", kind="stable")
+    if mulai is not None:
+        df = df[df["Tanggal"] >= pd.Timestamp(mulai)]
+    if akhir is not None:
+        df = df[df["Tanggal"] < pd.Timestamp(akhir)]
+    acuan = buku_besar(df, store.bagan)
+    hasil = store.saldo.buku_besar(mulai, akhir)
+    assert list(hasil) == list(acuan)
+    for akun, d in acuan.items():
+        assert hasil[akun].index.tolist() == d.index.tolist(), akun
+        assert hasil[akun]["Saldo"].tolist() == d["Saldo"].tolist(), akun
+
+def test_buku_besar_sama_dengan_hitung_ulang(store):
+    periksa_buku_besar(store)
+    periksa_buku_besar(store, "2022-03-15", "2023-02-01")
+    akun = store.daftar_akun()[0]
+    assert store.saldo.saldo_akhir(akun) == store.saldo.buku(akun)["Saldo"].iat[-1]
+
+def test_saldo_di_sisi_normal_akun(buat_store):
+    store = buat_store()
+    store.tambah_jurnal("2024-01-02", "Setoran modal", [("Kas", 1000, 0), ("Modal", 0, 1000)])
+    store.tambah_jurnal("2024-01-03", "Jasa", [("Kas", 400, 0), ("Pendapatan Jasa", 0, 400)])
+    store.tutup_buku.tutup(2024, 1)
+    store.tambah_jurnal("2024-02-01", "Jasa", [("Kas", 100, 0), ("Pendapatan Jasa", 0, 100)])
+    # Buku besar, buku besar bersaldo awal dan neraca saldo memakai tanda yang sama
+    ns = store.agregat.neraca_saldo()["Saldo"]
+    assert (ns["Kas"], ns["Modal"], ns["Pendapatan Jasa"]) == (1500, 1000, 500)
+    bb = store.saldo.buku_besar()
+    assert [bb[a]["Saldo"].iat[-1] for a in ("Kas", "Modal", "Pendapatan Jasa")] == [1500, 1000, 500]
+    assert store.saldo.saldo_akhir("Modal") == 1000
+    assert buku_besar(store.frame(), store.bagan)["Pendapatan Jasa"]["Saldo"].tolist() == [400, 500]
+    bb, awal = store.tutup_buku.buku_besar("2024-02-01", "2024-03-01")
+    assert awal["Pendapatan Jasa"] == 400 and bb["Pendapatan Jasa"]["Saldo"].tolist() == [500]
+
+def test_tambah_hapus_mundur_tetap_konsisten(store, buku):
+    # Bangun buku semua akun dulu supaya perubahan berikut diterapkan secara inkremental
+    periksa_buku_besar(store)
+    store.tambah_jurnal("2021-12-31 23:59:59", "Setoran awal", [("Kas", 5_000_000, 0), ("Modal", 0, 5_000_000)])
+    store.tambah_jurnal("2022-06-15 08:30", "Koreksi ATK", [("Beban Lainnya", 125_000, 0), ("Kas", 0, 125_000)])
+    mundur = buku.iloc[:40].assign(Tanggal=buku["Tanggal"].iloc[:40] - pd.Timedelta(days=200))
+    store.tambah_banyak(mundur)
+    periksa_buku_besar(store)
+
+    for nomor in store.frame()["Jurnal"].unique()[::7]:
+        store.hapus_jurnal(int(nomor))
+    periksa_buku_besar(store)
+    store.tambah_banyak(buku.iloc[100:140])
+    periksa_buku_besar(store)
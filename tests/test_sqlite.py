@@ -0,0 +1,57 @@
+"""SQLiteStore: file yang sama dibuka ulang atau ditulis koneksi/proses lain."""
+import pandas as pd
+
+from akuntansi import SQLiteStore, neraca_saldo
+
+def test_tulisan_koneksi_lain_terlihat(tmp_path, buku):
+    path = str(tmp_path / "buku.db")
+    a, b = SQLiteStore(path), SQLiteStore(path)
+    a.tambah_banyak(buku.iloc[:200])
+    # b sudah memuat turunan (memo, pendengar, frame) sebelum a menulis lagi
+    assert len(b) == 200
+    lama = b.agregat.neraca_saldo()
+    b.saldo.buku_besar()
+    b.duplikat.klasifikasi(buku.iloc[:1])
+
+    a.tambah_banyak(buku.iloc[200:], akun_baru=[(1103, "Bank BCA", "aset", 1100)])
+    a.tambah_jurnal("2024-01-02", "Setor bank", [("Bank BCA", 700, 0), ("Kas", 0, 700)])
+    a.hapus_jurnal(int(a.frame()["Jurnal"].iat[0]))
+    harapan = a.frame()
+
+    assert len(b) == len(harapan)
+    pd.testing.assert_frame_equal(b.frame().astype({"Akun": object}), harapan.astype({"Akun": object}))
+    assert "Bank BCA" in b.bagan
+    ns = b.agregat.neraca_saldo()
+    assert not ns.equals(lama)
+    assert ns[["Debit", "Kredit", "Saldo"]].equals(neraca_saldo(harapan, a.bagan)[["Debit", "Kredit", "Saldo"]])
+    assert b.saldo.saldo_akhir("Bank BCA") == 700
+    assert b.saldo.buku_besar()["Bank BCA"]["Saldo"].tolist() == [700]
+    assert b.duplikat.klasifikasi(buku.iloc[300:301]).tolist() == [b.duplikat.DUPLIKAT]
+
+    # Tulisan b memakai nomor jurnal berikutnya dan terlihat lagi oleh a
+    b.tutup_buku.tutup(2023, 12)
+    b.tambah_jurnal("2024-01-03", "Dari b", [("Kas", 50, 0), ("Modal", 0, 50)])
+    assert a.tutup_buku.periode_tutup() == [(2023, 12)]
+    assert a.frame()["Jurnal"].iat[-1] == int(harapan["Jurnal"].max()) + 1
+    assert a.agregat.neraca_saldo().equals(b.agregat.neraca_saldo())
+
+def test_buka_ulang(tmp_path, buku):
+    path = str(tmp_path / "buku.db")
+    store = SQLiteStore(path)
+    store.tambah_banyak(buku)
+    terakhir = int(store.frame()["Jurnal"].max())
+    store.hapus_jurnal(terakhir)
+    store.tutup_buku.tutup(2022, 12)
+
+    ulang = SQLiteStore(path)
+    pd.testing.assert_frame_equal(ulang.frame(), store.frame())
+    assert ulang.agregat.neraca_saldo().equals(store.agregat.neraca_saldo())
+    assert ulang.tutup_buku.periode_tutup() == [(2022, 12)]
+
+    # Nomor jurnal yang dihapus tidak dipakai lagi, juga setelah buka ulang
+    ulang.tambah_jurnal("2023-12-31", "Penutup", [("Kas", 1000, 0), ("Modal", 0, 1000)])
+    assert int(ulang.frame()["Jurnal"].max()) == terakhir + 1
+    ulang.hapus_jurnal(terakhir + 1)
+    lagi = SQLiteStore(path)
+    lagi.tambah_jurnal("2023-12-31", "Penutup", [("Kas", 1000, 0), ("Modal", 0, 1000)])
+    assert int(lagi.frame()["Jurnal"].max()) == terakhir + 2
@@ -0,0 +1,37 @@
+"""TutupBuku: periode tertutup dikunci dan laporan dari snapshot sama dengan hitung ulang penuh."""
+import pandas as pd
+import pytest
+
+from akuntansi import buku_besar, neraca_saldo
+
+def test_tutup_mengunci_periode(store):
+    store.tutup_buku.tutup(2022, 6)
+    with pytest.raises(ValueError):
+        store.tutup_buku.tutup(2022, 3)
+    with pytest.raises(ValueError):
+        store.tambah_jurnal("2022-06-30 23:59", "Mundur", [("Kas", 1000, 0), ("Modal", 0, 1000)])
+    lama = store.frame()
+    with pytest.raises(ValueError):
+        store.hapus_jurnal(int(lama["Jurnal"].iat[0]))
+    assert len(store.frame()) == len(lama)
+    store.tambah_jurnal("2022-07-01", "Sesudah tutup", [("Kas", 1000, 0), ("Modal", 0, 1000)])
+    assert store.tutup_buku.periode_tutup() == [(2022, 6)]
+
+def test_laporan_dari_snapshot_sama_dengan_hitung_ulang(store):
+    store.tutup_buku.tutup(2022, 6)
+    store.tutup_buku.tutup(2022, 12)
+    store.tambah_jurnal("2023-01-05", "Sesudah tutup", [("Beban Sewa", 2500, 0), ("Kas", 0, 2500)])
+    assert store.tutup_buku.validasi()["Cocok"].all()
+
+    df = store.frame()
+    for tahun, bulan in [(2022, 12), (2023, 3), (2023, None)]:
+        akhir = pd.Timestamp(tahun + (bulan or 12) // 12, (bulan or 12) % 12 + 1, 1)
+        acuan = neraca_saldo(df[df["Tanggal"] < akhir], store.bagan)
+        hasil = store.tutup_buku.neraca_saldo(tahun, bulan)
+        assert hasil[["Debit", "Kredit", "Saldo"]].equals(acuan[["Debit", "Kredit", "Saldo"]]), (tahun, bulan)
+
+    bb, _ = store.tutup_buku.buku_besar("2023-02-10", "2023-05-01")
+    acuan = buku_besar(df[df["Tanggal"] < "2023-05-01"].sort_values("Tanggal", kind="stable"), store.bagan)
+    for akun, d in bb.items():
+        saldo = acuan[akun]
+        assert d["Saldo"].tolist() == saldo.loc[saldo["Tanggal"] >= "2023-02-10", "Saldo"].tolist(), akun